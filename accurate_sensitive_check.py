@@ -2,200 +2,705 @@
 # -*- coding: utf-8 -*-
 """
 精准检查颜色名称中的敏感词汇（排除误报）
+
+关键词分级与例外规则维护在 sensitive_rules.json 中。
 """
 
+import argparse
 import csv
+import hashlib
+import json
+import marshal
+import os
 import re
-from typing import List, Tuple
-
-# 1. 严重敏感词（必须删除）
-CRITICAL_KEYWORDS = {
-    # 种族歧视词（真正的歧视词汇）
-    'nigger', 'nigga', 'negro', 'coon', 'spook',
-    'chink', 'chinaman', 'gook', 'slant',
-    'jap', 'nip', 'zipperhead',
-    'kike', 'hymie', 'yid',
-    'wetback', 'beaner', 'spic', 'greaser',
-    'towelhead', 'raghead', 'sandnigger',
-    # 性相关粗俗词汇
-    'fuck', 'fucking', 'fucker', 'motherfucker',
-    'shit', 'shitty', 'bullshit',
-    'pussy', 'cunt', 'cock', 'penis', 'vagina',
-    'tits', 'boobs', 'ass', 'asshole',
-    'porn', 'porno', 'pornography', 'xxx',
-    'rape', 'molest',
-    'whore', 'prostitute',
-    # 侮辱性词汇
-    'bastard', 'bitch', 'dickhead',
-    'retard', 'retarded',
-}
+import sys
+import tempfile
+from collections import deque
+from itertools import groupby
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
-# 2. 高度敏感词（强烈建议删除）
-HIGH_SENSITIVE_KEYWORDS = {
-    # 政治人物
-    'hitler', 'nazi', 'trump tan',  # Trump Tan 是指特朗普的肤色
-    'che guevara',
-    # 毒品（真正的毒品，不是pot/weed这种多义词）
-    'cocaine', 'heroin', 'meth', 'methamphetamine',
-    'opium', 'morphine', 'fentanyl',
-    'ecstasy', 'mdma', 'lsd',
-    # 暴力倾向明显的
-    'blood of my enemies', 'blood god', 'blood pact',
-    'murder', 'genocide', 'massacre',
-    # 恐怖主义
-    'terrorist', 'terrorism', 'jihad',
-}
+_ROOT = os.path.dirname(os.path.abspath(__file__))
 
-# 3. 中度敏感词（需要审查，但很多是合理的文化引用）
-MODERATE_KEYWORDS = {
-    # 暴力相关（但很多是合理的）
-    'blood', 'death', 'dead', 'kill',
-    # 宗教相关（但很多是文化引用）
-    'devil', 'demon', 'satan', 'hell', 'evil',
-    # 身体相关
-    'nude', 'naked', 'nipple', 'breast',
-    # 武器
-    'weapon', 'bomb', 'gun', 'bullet',
-}
+# 规则文件（各等级关键词、合理例外、豁免关键词）
+RULES_FILE = os.path.join(_ROOT, 'sensitive_rules.json')
+
+# 缓存目录（不能放在 Project_Color/ 下，否则会被打包进应用）
+CACHE_DIR = os.path.join(_ROOT, '.scan_cache')
+
+# 编译后的规则产物（匹配器状态），按规则文件哈希失效
+RULES_ARTIFACT = os.path.join(CACHE_DIR, 'sensitive_rules.marshal')
+
+# 扫描逻辑版本号（匹配规则的实现方式变化时递增，使旧缓存与编译产物失效）
+SCANNER_VERSION = 4
+
+# 敏感等级
+TIER_CRITICAL = 'critical'
+TIER_HIGH = 'high'
+TIER_MODERATE = 'moderate'
+
+# 弯引号统一为直引号，保证 "Dragon’s Blood" 与 "dragon's blood" 一致
+_NORMALIZE_TABLE = str.maketrans({'\u2019': "'", '\u2018': "'", '\u02bc': "'"})
+_TOKEN_RE = re.compile(r'\w+')
+
+def normalize_name(name: str) -> str:
+    """规范化名称：小写 + 统一引号"""
+    return name.lower().translate(_NORMALIZE_TABLE)
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    """将规范化后的名称切分为单词（与正则 \\b 边界一致）"""
+    return tuple(_TOKEN_RE.findall(text))
+
+class ContextIndex:
+    """
+    例外短语索引（n-gram 哈希集合）
+
+    每个例外短语按单词切分后存为元组，查询时只需枚举名称中
+    长度不超过最长短语的 n-gram，成本与例外列表大小无关。
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self._phrases = {tokenize(normalize_name(p)) for p in phrases}
+        self._phrases.discard(())
+        self._max_len = max((len(p) for p in self._phrases), default=0)
+        self._first_tokens = {p[0] for p in self._phrases}
+
+    def dump(self) -> tuple:
+        """导出为可序列化的状态（用于编译产物）"""
+        return self._phrases, self._max_len, self._first_tokens
+
+    @classmethod
+    def load(cls, state: tuple) -> 'ContextIndex':
+        index = cls.__new__(cls)
+        index._phrases, index._max_len, index._first_tokens = state
+        return index
+
+    def contains_any(self, tokens: Tuple[str, ...]) -> bool:
+        """名称的单词序列中是否包含任一例外短语"""
+        phrases = self._phrases
+        count = len(tokens)
+        for i, token in enumerate(tokens):
+            if token not in self._first_tokens:
+                continue
+            for n in range(1, min(self._max_len, count - i) + 1):
+                if tokens[i:i + n] in phrases:
+                    return True
+        return False
+
+# 反混淆：leetspeak 字符表（仅作用于含字母的单词，纯数字如 "Dead 99" 保持不变）
+_LEET_TABLE = str.maketrans({
+    '0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '7': 't',
+    '@': 'a', '$': 's', '!': 'i', '|': 'l',
+})
+_LEET_TOKEN_RE = re.compile(r'[\w@$!|]*[^\W\d_][\w@$!|]*')
+# 反混淆：单词内部插入的标点（"sh.it" / "b*tch"）；连字符多用于正常复合词，不在此列
+_INNER_PUNCT_RE = re.compile(r'(?<=\w)[.*~^]+(?=\w)')
+# 反混淆：逐字母隔开的写法（"f u c k"），至少三个单字母；与上面一样不含连字符与下划线
+_SPACED_RE = re.compile(r'(?<!\w)(?:\w[ .*~^]+){2,}\w(?!\w)')
+_SPACED_SEP_RE = re.compile(r'[ .*~^]+')
+# 快速判断：绝大多数名称不含任何可还原的写法，直接跳过三趟替换
+_FOLD_TRIGGER_RE = re.compile(r'[\d@$!|.*~^]|' + _SPACED_RE.pattern)
+# 压缩连续重复字符（"fuuuck" → "fuck"）
+_SQUEEZE_RE = re.compile(r'(.)\1+', re.S)
+
+def _leet_token(match) -> str:
+    return match.group().translate(_LEET_TABLE)
+
+def _join_spaced(match) -> str:
+    return _SPACED_SEP_RE.sub('', match.group())
+
+def fold_obfuscation(text: str) -> str:
+    """
+    反混淆（输入应已规范化）：还原 leetspeak、去掉单词内部标点、合并逐字母隔开的写法
+
+    结果只用于匹配，与原文一起扫描，不会取代原文。
+    """
+    if not _FOLD_TRIGGER_RE.search(text):
+        return text
+    text = _LEET_TOKEN_RE.sub(_leet_token, text)
+    text = _SPACED_RE.sub(_join_spaced, text)
+    return _INNER_PUNCT_RE.sub('', text)
+
+def squeeze(text: str) -> Tuple[str, Tuple[int, ...]]:
+    """压缩连续重复字符，返回 (压缩结果, 每个字符原本的重复次数)"""
+    chars = []
+    runs = []
+    for ch, group in groupby(text):
+        chars.append(ch)
+        runs.append(sum(1 for _ in group))
+    return ''.join(chars), tuple(runs)
+
+def _is_word_char(ch: str) -> bool:
+    """与正则 \\w 一致的单词字符判断"""
+    return ch.isalnum() or ch == '_'
+
+class KeywordMatcher:
+    """
+    多关键词单遍匹配器（Aho-Corasick 自动机）
+
+    所有等级的关键词只构建一次，每个名称只扫描一遍，
+    即可得到全部命中的 (等级, 关键词)。规则数量增加几乎不影响单行成本。
+
+    每个关键词同时登记原文与压缩重复字符后的变体：原文在名称本身上匹配，
+    变体在反混淆后的规范形式上匹配，两者拼接后仍只扫描一遍。
+    """
+
+    def __init__(self, tiers: Dict[str, Iterable[str]]):
+        # 每个状态：转移表、失败指针、
+        # 输出 [(等级, 关键词, 是否整词匹配, 是否检查例外, 模式长度, 变体重复次数或 None)]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[tuple]] = [[]]
+
+        for tier, keywords in tiers.items():
+            for keyword in sorted(keywords):
+                # 高度敏感词中的多词短语按子串匹配，且不走例外检查（与原逻辑一致）
+                is_phrase = tier == TIER_HIGH and ' ' in keyword
+                whole_word = not is_phrase
+                check_context = tier != TIER_CRITICAL and not is_phrase
+                self._add(keyword, (tier, keyword, whole_word, check_context, len(keyword), None))
+                squeezed, runs = squeeze(keyword)
+                self._add(squeezed, (tier, keyword, whole_word, check_context, len(squeezed), runs))
+
+        self._build()
+
+    def _add(self, pattern: str, entry: tuple):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(entry)
+
+    def _build(self):
+        """广度优先构建失败指针，并合并输出"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def dump(self) -> tuple:
+        """导出为可序列化的状态（用于编译产物）"""
+        return self._goto, self._fail, self._out
+
+    @classmethod
+    def load(cls, state: tuple) -> 'KeywordMatcher':
+        matcher = cls.__new__(cls)
+        matcher._goto, matcher._fail, matcher._out = state
+        return matcher
+
+    def find_all(self, text: str, folded: Optional[str] = None) -> List[Tuple[str, str, bool]]:
+        """
+        扫描一遍文本（应已规范化），返回所有命中
+
+        给出 folded（fold_obfuscation 的结果）时，把它压缩重复字符后接在原文之后
+        一起扫描。原文部分只认原始关键词；规范形式部分只认压缩变体，且要求每个字符
+        的实际重复次数不少于关键词本身（"as" 不会被当成 "ass"）。
+
+        Returns:
+            [(等级, 关键词, 是否需要检查例外上下文)]，按出现位置排序
+        """
+        split = len(text)
+        runs = None
+        if folded is not None:
+            squeezed = _SQUEEZE_RE.sub(r'\1', folded)
+            if squeezed != text:
+                text = f"{text}\0{squeezed}"
+
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        hits = []
+        state = 0
+        length = len(text)
 
-# 完全合理的例外（不应标记）
-ACCEPTABLE_CONTEXTS = {
-    # 自然/植物/动物
-    'blood orange', 'blood moon', "dragon's blood", 'dragon blood',
-    'blue blood', 'royal blood',  # 贵族
-    'dead sea', 'dead nettle', 'death valley', 'death cap',  # 地名/植物
-    'crack willow',  # 植物
-    'garden weed', 'jewel weed', 'gulf weed', 'ocean weed',  # 植物
-    # 艺术/文化引用
-    'blue nude',  # 马蒂斯名画
-    'moby dick',  # 文学作品
-    'death by chocolate',  # 甜品
-    'blue screen of death',  # 技术术语
-    'bullet hell',  # 游戏类型
-    # 食物/物品
-    'cherry bomb', 'ice bomb', 'blush bomb',  # 鞭炮/甜品/化妆品
-    "devil's flower mantis", "devil's ivy",  # 昆虫/植物
-    # 历史/地理
-    'empire',  # 帝国（常见于颜色命名，如Empire State）
-    'imperial',  # 帝王的
-    'army',  # 军队（Army Green是常见颜色）
-    'soldier',  # 士兵
-    # 其他合理词汇
-    'heaven', 'paradise', 'angel',  # 常见文化意象
-    'god',  # 在很多语境中是合理的（如"God-Given"天赐的）
-    'cross',  # 十字（也是几何形状）
-    'buddha',  # 佛（文化引用）
-    'karma',  # 因果（文化概念）
-    'spell',  # 咒语（也指"拼写"）
-    'curse',  # 诅咒（也是常见表达）
-    'ghost', 'vampire', 'zombie',  # 流行文化
-    'monster', 'beast', 'creature',  # 常见比喻
-    'dark', 'darkness', 'shadow',  # 颜色深浅
-    'master',  # 大师/主人（常见词）
-    'slave',  # 在某些历史语境中
-    'propaganda',  # 宣传（中性词）
-    'revolution',  # 革命（可以是工业革命等）
-    'riot',  # 暴动（也可指"色彩缤纷"）
-    'rebellion',  # 反叛（也是文化概念）
-    'desire', 'lust',  # 欲望（也可以是对生活的渴望）
-    'bang',  # 爆炸（也是Big Bang宇宙大爆炸）
-    'strip',  # 条纹
-    'hump',  # 驼峰
-    'hooker',  # Hooker's Green是著名的颜色名（以植物学家命名）
-    'pot',  # 罐子（flower pot等）
-    'addiction',  # 上瘾（Coffee Addiction咖啡成瘾是常见表达）
-    'atomic',  # 原子的（Atomic Tangerine等是常见颜色）
-    'nuclear',  # 核的
-    'shoot',  # 射击（也指"嫩芽"bamboo shoot）
-    'assault',  # 攻击（也是颜色名）
-    'assassin',  # 刺客（历史/游戏引用）
-    'terror', 'horror',  # 恐怖（流行文化）
-    'crazy', 'lunatic',  # 疯狂的（常见比喻）
-    'mental',  # 精神的（Mental Note等）
-    'plague',  # 瘟疫（也是历史词汇）
-    'casino',  # 赌场（地点名称）
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            for tier, keyword, whole_word, check_context, size, variant in out[state]:
+                start = i - size + 1
+                if (variant is None) != (i < split):
+                    continue
+                if whole_word:
+                    if start > 0 and _is_word_char(text[start - 1]):
+                        continue
+                    if i + 1 < length and _is_word_char(text[i + 1]):
+                        continue
+                if variant is not None:
+                    if runs is None:
+                        runs = squeeze(folded)[1]
+                    offset = start - split - 1
+                    if any(runs[offset + k] < need for k, need in enumerate(variant)):
+                        continue
+                hits.append((tier, keyword, check_context))
+
+        return hits
+
+def compile_rules(rules_file: str = RULES_FILE, artifact: Optional[str] = RULES_ARTIFACT) -> Dict:
+    """
+    读取规则文件并得到编译好的匹配器
+
+    编译产物带有规则文件哈希、扫描逻辑版本和 Python 版本，全部一致时
+    一次读取即可恢复匹配器，无需重新构建自动机；否则重新编译并写回。
+    """
+    with open(rules_file, 'rb') as f:
+        raw = f.read()
+    stamp = (hashlib.sha256(raw).hexdigest(), SCANNER_VERSION, tuple(sys.version_info[:2]))
+
+    if artifact:
+        try:
+            with open(artifact, 'rb') as f:
+                compiled = marshal.loads(f.read())
+            if compiled['stamp'] == stamp:
+                return compiled
+        except (OSError, ValueError, EOFError, TypeError, KeyError):
+            pass
+
+    data = json.loads(raw)
+    rules = {
+        key: sorted({word for group in data[key].values() for word in group})
+        for key in (TIER_CRITICAL, TIER_HIGH, TIER_MODERATE, 'acceptable', 'exempt')
+    }
+    matcher = KeywordMatcher({
+        TIER_CRITICAL: rules[TIER_CRITICAL],
+        TIER_HIGH: rules[TIER_HIGH],
+        TIER_MODERATE: rules[TIER_MODERATE],
+    })
+    compiled = {
+        'stamp': stamp,
+        'rules': rules,
+        'matcher': matcher.dump(),
+        'context_index': ContextIndex(rules['acceptable']).dump(),
+    }
+
+    if artifact:
+        try:
+            os.makedirs(os.path.dirname(artifact), exist_ok=True)
+            tmp_path = f"{artifact}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(marshal.dumps(compiled))
+            os.replace(tmp_path, artifact)
+        except OSError:
+            pass  # 只读环境下直接使用内存中的结果
+
+    return compiled
+
+# 编译好的规则（首次扫描时由 _load_rules 读取或生成编译产物；导入模块不读写任何缓存文件）
+_RULES: Optional[Dict] = None
+
+# 按等级划分的关键词集合，首次访问时由 __getattr__ 从规则中取出：
+#   CRITICAL_KEYWORDS        严重敏感词（必须删除）
+#   HIGH_SENSITIVE_KEYWORDS  高度敏感词（强烈建议删除）
+#   MODERATE_KEYWORDS        中度敏感词（需要审查，但很多是合理的文化引用）
+#   ACCEPTABLE_CONTEXTS      完全合理的例外（不应标记）
+#   EXEMPT_KEYWORDS          关键词本身即可豁免的情况（不依赖上下文）
+_KEYWORD_SETS = {
+    'CRITICAL_KEYWORDS': TIER_CRITICAL,
+    'HIGH_SENSITIVE_KEYWORDS': TIER_HIGH,
+    'MODERATE_KEYWORDS': TIER_MODERATE,
+    'ACCEPTABLE_CONTEXTS': 'acceptable',
+    'EXEMPT_KEYWORDS': 'exempt',
 }
 
+def _load_rules() -> Dict:
+    """编译规则并恢复匹配器（每个进程只做一次）"""
+    global _RULES
+    if _RULES is None:
+        compiled = compile_rules()
+        rules = compiled['rules']
+        _RULES = {
+            'fingerprint': compiled['stamp'][0],
+            'rules': rules,
+            'matcher': KeywordMatcher.load(compiled['matcher']),
+            'context_index': ContextIndex.load(compiled['context_index']),
+            'exempt': set(rules['exempt']) | set(rules['acceptable']),
+        }
+    return _RULES
+
+def __getattr__(name: str):
+    if name in _KEYWORD_SETS:
+        return set(_load_rules()['rules'][_KEYWORD_SETS[name]])
+    if name == 'RULES_FINGERPRINT':
+        return _load_rules()['fingerprint']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def is_acceptable(name: str, keyword: str) -> bool:
     """检查是否在可接受的上下文中"""
-    name_lower = name.lower()
-    
-    # 检查完整短语匹配
-    for context in ACCEPTABLE_CONTEXTS:
-        if context in name_lower:
-            return True
-    
-    # 特殊规则
-    # "Hooker's Green" 是以植物学家William Hooker命名的颜色
-    if 'hooker' in keyword and "hooker's green" in name_lower:
-        return True
-    
-    # "Pot" 在 "flower pot", "pot of gold" 等语境中完全合理
-    if keyword == 'pot' and any(x in name_lower for x in ['flower pot', 'pot of', 'pot black', 'clay pot', 'copper pot']):
-        return True
-    
-    # "Weed" 在植物学语境中是"杂草"
-    if keyword == 'weed' and any(x in name_lower for x in ['weed', 'seaweed']):
-        return True
-    
-    # "Empire" 在历史/地理语境中合理
-    if keyword == 'empire':
+    rules = _load_rules()
+    if keyword in rules['exempt']:
         return True
-    
-    # "Army" 在颜色命名中常见
-    if keyword == 'army':
-        return True
-    
-    # 其他在ACCEPTABLE_CONTEXTS中的词汇
-    if keyword in ACCEPTABLE_CONTEXTS:
-        return True
-    
-    return False
+    return rules['context_index'].contains_any(tokenize(normalize_name(name)))
+
+def scan_name(name: str) -> Dict[str, List[str]]:
+    """单遍扫描名称，返回各等级命中的关键词（已排除合理例外）"""
+    rules = _RULES or _load_rules()
+    context_index, exempt = rules['context_index'], rules['exempt']
+    found = {TIER_CRITICAL: [], TIER_HIGH: [], TIER_MODERATE: []}
+    text = normalize_name(name)
+    folded = fold_obfuscation(text)
+    in_context = None  # 首次需要时才切分并查询例外索引
+
+    for tier, keyword, check_context in rules['matcher'].find_all(text, folded):
+        if check_context:
+            if keyword in exempt:
+                continue
+            if in_context is None:
+                in_context = (context_index.contains_any(tokenize(text))
+                              or (folded != text and context_index.contains_any(tokenize(folded))))
+            if in_context:
+                continue
+        if keyword not in found[tier]:
+            found[tier].append(keyword)
+
+    return found
 
 def check_critical(name: str) -> Tuple[bool, List[str]]:
     """检查严重敏感词"""
-    name_lower = name.lower()
-    found = []
-    
-    for keyword in CRITICAL_KEYWORDS:
-        pattern = r'\b' + re.escape(keyword) + r'\b'
-        if re.search(pattern, name_lower):
-            found.append(keyword)
-    
+    found = scan_name(name)[TIER_CRITICAL]
     return len(found) > 0, found
 
 def check_high_sensitive(name: str) -> Tuple[bool, List[str]]:
     """检查高度敏感词"""
-    name_lower = name.lower()
-    found = []
-    
-    for keyword in HIGH_SENSITIVE_KEYWORDS:
-        if ' ' in keyword:  # 多词短语
-            if keyword in name_lower:
-                found.append(keyword)
-        else:
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            if re.search(pattern, name_lower):
-                if not is_acceptable(name, keyword):
-                    found.append(keyword)
-    
+    found = scan_name(name)[TIER_HIGH]
     return len(found) > 0, found
 
 def check_moderate(name: str) -> Tuple[bool, List[str]]:
     """检查中度敏感词"""
-    name_lower = name.lower()
-    found = []
-    
-    for keyword in MODERATE_KEYWORDS:
-        pattern = r'\b' + re.escape(keyword) + r'\b'
-        if re.search(pattern, name_lower):
-            if not is_acceptable(name, keyword):
-                found.append(keyword)
-    
+    found = scan_name(name)[TIER_MODERATE]
     return len(found) > 0, found
 
-def main():
-    csv_file = 'Project_Color/Resources/colornames.csv'
+def ruleset_fingerprint() -> str:
+    """当前规则的指纹（规则文件哈希 + 扫描逻辑版本）"""
+    fingerprint = _load_rules()['fingerprint']
+    return hashlib.sha256(f"{fingerprint}:{SCANNER_VERSION}".encode('utf-8')).hexdigest()
+
+def name_hash(name: str) -> str:
+    """名称的短哈希（缓存键）"""
+    return hashlib.blake2b(name.encode('utf-8'), digest_size=8).hexdigest()
+
+class ScanCache:
+    """
+    增量扫描缓存：名称哈希 → 扫描结论
+
+    缓存文件带有规则指纹，规则变化时整体失效并全量重扫；
+    保存时只保留本次出现过的名称，已删除的行不会无限累积。
+    """
+
+    def __init__(self, path: str, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, Dict[str, List[str]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = False
+        self._seen = set()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"⚠️  缓存文件无法读取，将全量扫描: {e}")
+            return
+
+        if data.get('ruleset') != self.fingerprint:
+            self.invalidated = True
+            return
+        self.entries = data.get('entries', {})
+
+    def update(self, hit_keys: List[str], new_entries: Dict[str, Dict[str, List[str]]]):
+        """合并一个分块的缓存命中与新扫描结果"""
+        self.hits += len(hit_keys)
+        self.misses += len(new_entries)
+        self._seen.update(hit_keys)
+        self._seen.update(new_entries)
+        self.entries.update(new_entries)
+
+    def scan(self, name: str) -> Dict[str, List[str]]:
+        """进程内逐条查询：命中则直接返回缓存结论，否则扫描并记入缓存"""
+        key = name_hash(name)
+        verdict = self.entries.get(key)
+        if verdict is None:
+            found = scan_name(name)
+            self.update([], {key: {tier: words for tier, words in found.items() if words}})
+            return found
+        self.update([key], {})
+        return {tier: verdict.get(tier, []) for tier in TIERS}
+
+    def save(self):
+        """原子写入缓存文件"""
+        entries = {key: self.entries[key] for key in self._seen}
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'ruleset': self.fingerprint, 'entries': entries},
+                      f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+# 工作进程内可见的缓存条目（串行时直接赋值，并行时由进程池初始化）
+_CACHE_ENTRIES: Optional[Dict[str, Dict[str, List[str]]]] = None
+
+def _init_worker(entries: Optional[Dict[str, Dict[str, List[str]]]]):
+    global _CACHE_ENTRIES
+    _CACHE_ENTRIES = entries
+
+# 单个分块的目标字节数（串行模式同样按块读取，内存只与块大小相关）
+CHUNK_SIZE = 4 * 1024 * 1024
+
+def split_chunks(csv_file: str, jobs: int = 1) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """
+    将 CSV 按字节范围切分为若干块，边界对齐到行尾
+
+    注意：要求字段内不包含换行（colornames.csv 满足）。
+
+    Returns:
+        (表头字段, [(起始偏移, 结束偏移)])
+    """
+    with open(csv_file, 'rb') as f:
+        header = f.readline()
+        data_start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+
+        count = -(-(size - data_start) // CHUNK_SIZE)
+        if jobs > 1:
+            count = max(count, jobs * 4)
+        count = max(count, 1)
+        step = (size - data_start) / count
+
+        bounds = [data_start]
+        for i in range(1, count):
+            target = data_start + int(step * i)
+            if target <= bounds[-1]:
+                continue
+            f.seek(target - 1)
+            f.readline()  # 跳到下一行开头
+            offset = f.tell()
+            if bounds[-1] < offset < size:
+                bounds.append(offset)
+        bounds.append(size)
+
+    fieldnames = next(csv.reader([header.decode('utf-8-sig')]))
+    return fieldnames, list(zip(bounds[:-1], bounds[1:]))
+
+def _scan_chunk(task: Tuple[str, List[str], int, int]) -> Tuple[int, list, List[str], dict]:
+    """
+    扫描一个字节范围（在工作进程中执行，复用模块级匹配器）
+
+    Returns:
+        (行数, [(块内行号, 名称, 色值, 各等级命中)], 命中缓存的键, 新扫描的缓存条目)
+    """
+    csv_file, fieldnames, start, end = task
+    with open(csv_file, 'rb') as f:
+        f.seek(start)
+        lines = f.read(end - start).decode('utf-8').splitlines()
+
+    cache = _CACHE_ENTRIES
+    hit_keys = []
+    new_entries = {}
+    findings = []
+    row_count = 0
+    for row_count, row in enumerate(csv.DictReader(lines, fieldnames=fieldnames), 1):
+        name = row['name']
+        if cache is None:
+            found = scan_name(name)
+        else:
+            key = name_hash(name)
+            verdict = cache.get(key)
+            if verdict is None:
+                verdict = new_entries.get(key)
+            if verdict is None:
+                found = scan_name(name)
+                verdict = {tier: words for tier, words in found.items() if words}
+                new_entries[key] = verdict
+            else:
+                hit_keys.append(key)
+            found = {tier: verdict.get(tier, []) for tier in (TIER_CRITICAL, TIER_HIGH, TIER_MODERATE)}
+
+        if found[TIER_CRITICAL] or found[TIER_HIGH] or found[TIER_MODERATE]:
+            findings.append((row_count, name, row['hex'], found))
+
+    return row_count, findings, hit_keys, new_entries
+
+def scan_csv(csv_file: str, jobs: int = 1, cache: Optional[ScanCache] = None) -> Iterator[Tuple[int, list]]:
+    """
+    按块扫描 CSV，按原始行顺序逐块产出结果
+
+    jobs > 1 时各块在进程池中并行扫描，产出顺序与串行完全一致。
+    传入 cache 时只扫描缓存中没有的名称，并把新结论合并回 cache。
+
+    Yields:
+        (该块行数, [(全局行号, 名称, 色值, 各等级命中)])
+    """
+    fieldnames, chunks = split_chunks(csv_file, jobs)
+    tasks = [(csv_file, fieldnames, start, end) for start, end in chunks]
+    entries = cache.entries if cache is not None else None
+
+    if jobs > 1:
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(entries,))
+        results = pool.map(_scan_chunk, tasks)
+    else:
+        pool = None
+        _init_worker(entries)
+        results = map(_scan_chunk, tasks)
+
+    try:
+        offset = 0
+        for row_count, findings, hit_keys, new_entries in results:
+            if cache is not None:
+                cache.update(hit_keys, new_entries)
+            yield row_count, [(offset + i, name, hex_color, found)
+                              for i, name, hex_color, found in findings]
+            offset += row_count
+    finally:
+        if pool is None:
+            _init_worker(None)
+        else:
+            pool.shutdown(cancel_futures=True)
+
+# 按严重程度排列的等级
+TIERS = (TIER_CRITICAL, TIER_HIGH, TIER_MODERATE)
+
+# 扫描发现流的字段
+FINDING_FIELDS = ['row', 'tier', 'name', 'hex', 'keywords']
+
+def iter_findings(results: Iterable[Tuple[int, list]], stats: Dict[str, int]) -> Iterator[Dict]:
+    """
+    把 scan_csv 的分块结果展开为逐条发现（每行每个命中等级一条）
+
+    stats 中累计 'total' 与各等级计数，整个过程只保留常数级状态。
+    """
+    for row_count, findings in results:
+        stats['total'] += row_count
+        for row_number, name, hex_color, found in findings:
+            yield from row_findings(row_number, name, hex_color, found, stats)
+
+def row_findings(row_number: int, name: str, hex_color: str, found: Dict[str, List[str]],
+                 stats: Dict[str, int]) -> Iterator[Dict]:
+    """把单行的各等级命中展开为发现（每个命中等级一条），并累计 stats 中的等级计数"""
+    for tier in TIERS:
+        if found[tier]:
+            stats[tier] += 1
+            yield {
+                'row': row_number,
+                'tier': tier,
+                'name': name,
+                'hex': hex_color,
+                'keywords': found[tier],
+            }
+
+class FindingWriter:
+    """逐条写出扫描发现（JSONL 或 CSV），行缓冲，下游可边扫边读"""
+
+    def __init__(self, path: str, fmt: str = 'jsonl'):
+        self.fmt = fmt
+        self._file = open(path, 'w', encoding='utf-8', newline='' if fmt == 'csv' else None, buffering=1)
+        self._writer = None
+        if fmt == 'csv':
+            self._writer = csv.writer(self._file, lineterminator='\n')
+            self._writer.writerow(FINDING_FIELDS)
+
+    def write(self, finding: Dict):
+        if self._writer is not None:
+            self._writer.writerow([finding['row'], finding['tier'], finding['name'],
+                                   finding['hex'], ';'.join(finding['keywords'])])
+        else:
+            self._file.write(json.dumps(finding, ensure_ascii=False) + '\n')
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def read_findings(path: str, fmt: str = 'jsonl', tier: Optional[str] = None) -> Iterator[Dict]:
+    """从发现流文件中逐条读回（可按等级过滤）"""
+    with open(path, 'r', encoding='utf-8', newline='' if fmt == 'csv' else None) as f:
+        if fmt == 'csv':
+            for row in csv.DictReader(f):
+                finding = {
+                    'row': int(row['row']),
+                    'tier': row['tier'],
+                    'name': row['name'],
+                    'hex': row['hex'],
+                    'keywords': row['keywords'].split(';') if row['keywords'] else [],
+                }
+                if tier is None or finding['tier'] == tier:
+                    yield finding
+        else:
+            for line in f:
+                finding = json.loads(line)
+                if tier is None or finding['tier'] == tier:
+                    yield finding
+
+def write_report(report_file: str, findings_path: str, fmt: str, stats: Dict[str, int]):
+    """由发现流渲染人工审阅报告"""
+    sections = [
+        (TIER_CRITICAL, "严重敏感词（必须删除）"),
+        (TIER_HIGH, "高度敏感词（强烈建议删除）"),
+        (TIER_MODERATE, "中度敏感词（建议审查）"),
+    ]
+    with open(report_file, 'w', encoding='utf-8') as f:
+        f.write("=" * 80 + "\n")
+        f.write("颜色名称数据库精准敏感词审查报告\n")
+        f.write("=" * 80 + "\n\n")
+        
+        f.write(f"总颜色数量: {stats['total']:,}\n")
+        f.write(f"严重敏感词: {stats[TIER_CRITICAL]}\n")
+        f.write(f"高度敏感词: {stats[TIER_HIGH]}\n")
+        f.write(f"中度敏感词: {stats[TIER_MODERATE]}\n\n")
+        
+        for tier, title in sections:
+            if not stats[tier]:
+                continue
+            f.write(f"{title}\n")
+            f.write("=" * 80 + "\n")
+            for i, item in enumerate(read_findings(findings_path, fmt, tier), 1):
+                f.write(f"{i}. {item['name']} ({item['hex']}) - {', '.join(item['keywords'])}\n")
+            if tier != TIER_MODERATE:
+                f.write("\n")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='精准检查颜色名称中的敏感词汇')
+    parser.add_argument('csv_file', nargs='?', default='Project_Color/Resources/colornames.csv',
+                        help='颜色名称 CSV 文件')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='并行扫描的进程数（默认 1，即串行）')
+    parser.add_argument('--cache', metavar='PATH',
+                        help='增量扫描缓存文件（默认 .scan_cache/<CSV 文件名>.json）')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='不使用缓存，全量扫描')
+    parser.add_argument('-o', '--output', metavar='PATH',
+                        help='边扫描边写出发现流（每条含行号、等级、名称、色值、关键词）')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl',
+                        help='发现流格式（默认 jsonl）')
+    parser.add_argument('--report', default='accurate_sensitive_report.txt',
+                        help='人工审阅报告路径')
+    args = parser.parse_args(argv)
+    csv_file = args.csv_file
+    fmt = args.format
     
     print("=" * 80)
     print("颜色名称数据库精准敏感词审查")
@@ -203,69 +708,72 @@ def main():
     print("=" * 80)
     print()
     
-    critical_items = []
-    high_items = []
-    moderate_items = []
-    total_count = 0
+    cache = None
+    if not args.no_cache:
+        cache_path = args.cache or os.path.join(CACHE_DIR, os.path.basename(csv_file) + '.json')
+        cache = ScanCache(cache_path, ruleset_fingerprint())
+        if cache.invalidated:
+            print("♻️  规则已变化，缓存失效，将全量扫描")
+            print()
+    
+    # 未指定 --output 时写到临时文件，报告由它渲染后删除
+    findings_path = args.output
+    if findings_path is None:
+        fd, findings_path = tempfile.mkstemp(suffix=f'.findings.{fmt}')
+        os.close(fd)
+    stats = {'total': 0, TIER_CRITICAL: 0, TIER_HIGH: 0, TIER_MODERATE: 0}
     
     try:
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            
-            for row in reader:
-                total_count += 1
-                name = row['name']
-                hex_color = row['hex']
-                
-                # 检查严重敏感词
-                has_critical, critical_words = check_critical(name)
-                if has_critical:
-                    critical_items.append({
-                        'name': name,
-                        'hex': hex_color,
-                        'keywords': critical_words
-                    })
-                
-                # 检查高度敏感词
-                has_high, high_words = check_high_sensitive(name)
-                if has_high:
-                    high_items.append({
-                        'name': name,
-                        'hex': hex_color,
-                        'keywords': high_words
-                    })
-                
-                # 检查中度敏感词
-                has_moderate, moderate_words = check_moderate(name)
-                if has_moderate:
-                    moderate_items.append({
-                        'name': name,
-                        'hex': hex_color,
-                        'keywords': moderate_words
-                    })
+        try:
+            with FindingWriter(findings_path, fmt) as writer:
+                for finding in iter_findings(scan_csv(csv_file, args.jobs, cache), stats):
+                    writer.write(finding)
+        except FileNotFoundError:
+            print(f"❌ 错误：找不到文件 {csv_file}")
+            return
+        except Exception as e:
+            print(f"❌ 错误：{e}")
+            return
+        
+        if cache is not None:
+            cache.save()
+        
+        render_summary(findings_path, fmt, stats, cache)
+        write_report(args.report, findings_path, fmt, stats)
+        print(f"📄 完整报告已保存到: {args.report}")
+        if args.output:
+            print(f"📄 发现流已保存到: {args.output}")
+        print()
+    finally:
+        if args.output is None:
+            os.remove(findings_path)
     
-    except FileNotFoundError:
-        print(f"❌ 错误：找不到文件 {csv_file}")
-        return
-    except Exception as e:
-        print(f"❌ 错误：{e}")
-        return
+    render_assessment(stats)
+
+def render_summary(findings_path: str, fmt: str, stats: Dict[str, int], cache: Optional[ScanCache] = None):
+    """在终端输出统计与各等级详情（由发现流渲染）"""
+    total_count = stats['total']
+    critical_count = stats[TIER_CRITICAL]
+    high_count = stats[TIER_HIGH]
+    moderate_count = stats[TIER_MODERATE]
     
     # 输出统计
     print(f"📊 统计信息")
     print(f"   总颜色数量: {total_count:,}")
-    print(f"   严重敏感词: {len(critical_items)} ({len(critical_items)/total_count*100:.3f}%)")
-    print(f"   高度敏感词: {len(high_items)} ({len(high_items)/total_count*100:.3f}%)")
-    print(f"   中度敏感词: {len(moderate_items)} ({len(moderate_items)/total_count*100:.3f}%)")
+    print(f"   严重敏感词: {critical_count} ({critical_count/total_count*100:.3f}%)")
+    print(f"   高度敏感词: {high_count} ({high_count/total_count*100:.3f}%)")
+    print(f"   中度敏感词: {moderate_count} ({moderate_count/total_count*100:.3f}%)")
+    if cache is not None:
+        print(f"   缓存命中: {cache.hits:,}  未命中(已扫描): {cache.misses:,}")
     print()
     
     # 输出详情
-    if critical_items:
+    if critical_count:
         print("=" * 80)
         print("🔴 严重敏感词（必须删除）")
         print("=" * 80)
         print()
-        for i, item in enumerate(critical_items, 1):
+        for i, item in enumerate(read_findings(findings_path, fmt, TIER_CRITICAL), 1):
             print(f"{i}. {item['name']} ({item['hex']})")
             print(f"   敏感词: {', '.join(item['keywords'])}")
             print()
@@ -273,12 +781,12 @@ def main():
         print("✅ 未发现严重敏感词")
         print()
     
-    if high_items:
+    if high_count:
         print("=" * 80)
         print("🟠 高度敏感词（强烈建议删除）")
         print("=" * 80)
         print()
-        for i, item in enumerate(high_items, 1):
+        for i, item in enumerate(read_findings(findings_path, fmt, TIER_HIGH), 1):
             print(f"{i}. {item['name']} ({item['hex']})")
             print(f"   敏感词: {', '.join(item['keywords'])}")
             print()
@@ -286,54 +794,28 @@ def main():
         print("✅ 未发现高度敏感词")
         print()
     
-    if moderate_items:
+    if moderate_count:
         print("=" * 80)
         print("🟡 中度敏感词（建议根据应用场景审查）")
-        print(f"   共 {len(moderate_items)} 个")
+        print(f"   共 {moderate_count} 个")
         print("=" * 80)
         print()
-        for i, item in enumerate(moderate_items[:20], 1):
+        for i, item in enumerate(read_findings(findings_path, fmt, TIER_MODERATE), 1):
+            if i > 20:
+                break
             print(f"{i}. {item['name']} ({item['hex']})")
             print(f"   关键词: {', '.join(item['keywords'])}")
             print()
-        if len(moderate_items) > 20:
-            print(f"... 还有 {len(moderate_items) - 20} 个")
+        if moderate_count > 20:
+            print(f"... 还有 {moderate_count - 20} 个")
             print()
-    
-    # 保存报告
-    report_file = 'accurate_sensitive_report.txt'
-    with open(report_file, 'w', encoding='utf-8') as f:
-        f.write("=" * 80 + "\n")
-        f.write("颜色名称数据库精准敏感词审查报告\n")
-        f.write("=" * 80 + "\n\n")
-        
-        f.write(f"总颜色数量: {total_count:,}\n")
-        f.write(f"严重敏感词: {len(critical_items)}\n")
-        f.write(f"高度敏感词: {len(high_items)}\n")
-        f.write(f"中度敏感词: {len(moderate_items)}\n\n")
-        
-        if critical_items:
-            f.write("严重敏感词（必须删除）\n")
-            f.write("=" * 80 + "\n")
-            for i, item in enumerate(critical_items, 1):
-                f.write(f"{i}. {item['name']} ({item['hex']}) - {', '.join(item['keywords'])}\n")
-            f.write("\n")
-        
-        if high_items:
-            f.write("高度敏感词（强烈建议删除）\n")
-            f.write("=" * 80 + "\n")
-            for i, item in enumerate(high_items, 1):
-                f.write(f"{i}. {item['name']} ({item['hex']}) - {', '.join(item['keywords'])}\n")
-            f.write("\n")
-        
-        if moderate_items:
-            f.write("中度敏感词（建议审查）\n")
-            f.write("=" * 80 + "\n")
-            for i, item in enumerate(moderate_items, 1):
-                f.write(f"{i}. {item['name']} ({item['hex']}) - {', '.join(item['keywords'])}\n")
-    
-    print(f"📄 完整报告已保存到: {report_file}")
-    print()
+
+def render_assessment(stats: Dict[str, int]):
+    """输出最终评估"""
+    total_count = stats['total']
+    critical_count = stats[TIER_CRITICAL]
+    high_count = stats[TIER_HIGH]
+    moderate_count = stats[TIER_MODERATE]
     
     # 最终评估
     print("=" * 80)
@@ -341,18 +823,18 @@ def main():
     print("=" * 80)
     print()
     
-    total_issues = len(critical_items) + len(high_items) + len(moderate_items)
+    total_issues = critical_count + high_count + moderate_count
     clean_percentage = 100 - (total_issues / total_count * 100)
     
     print(f"✅ 完全没问题: {clean_percentage:.2f}%")
-    print(f"🔴 严重问题: {len(critical_items)} 个（{len(critical_items)/total_count*100:.3f}%）")
-    print(f"🟠 高度敏感: {len(high_items)} 个（{len(high_items)/total_count*100:.3f}%）")
-    print(f"🟡 中度敏感: {len(moderate_items)} 个（{len(moderate_items)/total_count*100:.3f}%）")
+    print(f"🔴 严重问题: {critical_count} 个（{critical_count/total_count*100:.3f}%）")
+    print(f"🟠 高度敏感: {high_count} 个（{high_count/total_count*100:.3f}%）")
+    print(f"🟡 中度敏感: {moderate_count} 个（{moderate_count/total_count*100:.3f}%）")
     print()
     
-    if len(critical_items) == 0 and len(high_items) == 0:
+    if critical_count == 0 and high_count == 0:
         print("🎉 数据库质量优秀！未发现严重敏感词汇。")
-    elif len(critical_items) + len(high_items) < 20:
+    elif critical_count + high_count < 20:
         print("👍 数据库质量良好，只需删除少量不当词汇。")
     else:
         print("⚠️  数据库需要清理，建议删除敏感词汇。")
@@ -1,169 +1,195 @@
 #!/usr/bin/env python3
 """
 脚本：将 InfoPlist.strings 本地化文件添加到 Xcode 项目
+
+project.pbxproj 只解析一次（pbxproj.XcodeProject），在对象图上修改后一次写回。
+
+--batch 模式找出目录下全部 *.lproj/*.strings，按文件名归并为变体组，所有语言的
+文件引用、变体组、Resources 构建条目与 knownRegions 都在内存中一次建好、一次写回，
+添加 20 种语言与添加 1 种的开销相同。
+
+用法: python3 add_infoplist_strings.py                      # en / zh-Hans 的 InfoPlist.strings
+      python3 add_infoplist_strings.py --batch              # Project_Color 下全部 .strings
+      python3 add_infoplist_strings.py --batch Project_Color/Resources --dry-run
 """
 
+import argparse
+import os
 import sys
-import uuid
+import time
+from typing import Dict, List, Optional, Tuple
+
+from pbxproj import PROJECT_FILE, XcodeProject
+from sync_xcode_tree import ensure_group, synchronized_root
+
+# 语言 → 本地化文件路径
+LOCALES = {
+    'en': 'en.lproj/InfoPlist.strings',
+    'zh-Hans': 'zh-Hans.lproj/InfoPlist.strings',
+}
 
-def generate_uuid():
-    """生成24位唯一ID（Xcode格式）"""
-    return uuid.uuid4().hex[:24].upper()
+# --batch 默认扫描的目录
+BATCH_ROOT = 'Project_Color'
+
+def add_variant(project: XcodeProject, parent: Optional[str], name: str,
+                locales: Dict[str, str]) -> Tuple[str, List[str]]:
+    """
+    创建（或复用）变体组及其各语言的文件引用，并加入第一个 target 的 Resources 阶段
+
+    Args:
+        parent: 变体组所在的组（None 表示不挂到任何组下）
+        name: 变体组名称（如 InfoPlist.strings）
+        locales: 语言 → 相对 parent 的路径
+
+    Returns:
+        (变体组 UUID, 各语言文件引用 UUID)
+    """
+    variant_group = project.add_variant_group(parent, name)
+    file_refs = [project.add_file(variant_group, path, name=locale, file_type='text.plist.strings')
+                 for locale, path in locales.items()]
+    resources_phase = project.build_phase(project.target(), 'PBXResourcesBuildPhase')
+    project.add_build_file(resources_phase, variant_group)
+    return variant_group, file_refs
 
 def add_infoplist_strings_to_xcode(pbxproj_path):
     """将 InfoPlist.strings 文件添加到 Xcode 项目"""
-    
+
     try:
-        with open(pbxproj_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        project = XcodeProject.load(pbxproj_path)
     except Exception as e:
         print(f"❌ 无法读取 {pbxproj_path}: {e}")
         return False
-    
-    # 生成唯一 ID
-    variant_group_id = generate_uuid()
-    en_file_ref_id = generate_uuid()
-    zh_file_ref_id = generate_uuid()
-    en_build_file_id = generate_uuid()
-    zh_build_file_id = generate_uuid()
-    
-    print("🔧 生成的 ID:")
-    print(f"   Variant Group: {variant_group_id}")
-    print(f"   EN File Ref:   {en_file_ref_id}")
-    print(f"   ZH File Ref:   {zh_file_ref_id}")
-    
-    # 1. 添加 PBXBuildFile 部分
-    build_file_section = "/* Begin PBXBuildFile section */"
-    build_file_entries = f"""\t\t{en_build_file_id} /* InfoPlist.strings in Resources */ = {{isa = PBXBuildFile; fileRef = {variant_group_id} /* InfoPlist.strings */; }};
-"""
-    
-    if build_file_section in content:
-        content = content.replace(
-            build_file_section,
-            build_file_section + "\n" + build_file_entries
-        )
-        print("✅ 添加 PBXBuildFile 条目")
-    else:
-        print("⚠️  未找到 PBXBuildFile section")
-    
-    # 2. 添加 PBXFileReference 部分
-    file_ref_section = "/* Begin PBXFileReference section */"
-    file_ref_entries = f"""\t\t{en_file_ref_id} /* en */ = {{isa = PBXFileReference; lastKnownFileType = text.plist.strings; name = en; path = en.lproj/InfoPlist.strings; sourceTree = "<group>"; }};
-\t\t{zh_file_ref_id} /* zh-Hans */ = {{isa = PBXFileReference; lastKnownFileType = text.plist.strings; name = "zh-Hans"; path = "zh-Hans.lproj/InfoPlist.strings"; sourceTree = "<group>"; }};
-"""
-    
-    if file_ref_section in content:
-        content = content.replace(
-            file_ref_section,
-            file_ref_section + "\n" + file_ref_entries
-        )
-        print("✅ 添加 PBXFileReference 条目")
-    else:
-        print("⚠️  未找到 PBXFileReference section")
-    
-    # 3. 添加 PBXVariantGroup 部分
-    variant_group_section = "/* Begin PBXVariantGroup section */"
-    if variant_group_section not in content:
-        # 如果没有 PBXVariantGroup section，需要创建
-        resource_build_phase_end = "/* End PBXResourcesBuildPhase section */"
-        variant_group_content = f"""/* End PBXResourcesBuildPhase section */
-
-/* Begin PBXVariantGroup section */
-\t\t{variant_group_id} /* InfoPlist.strings */ = {{
-\t\t\tisa = PBXVariantGroup;
-\t\t\tchildren = (
-\t\t\t\t{en_file_ref_id} /* en */,
-\t\t\t\t{zh_file_ref_id} /* zh-Hans */,
-\t\t\t);
-\t\t\tname = InfoPlist.strings;
-\t\t\tsourceTree = "<group>";
-\t\t}};
-/* End PBXVariantGroup section */
-"""
-        content = content.replace(resource_build_phase_end, variant_group_content)
-        print("✅ 创建并添加 PBXVariantGroup section")
-    else:
-        variant_group_entry = f"""\t\t{variant_group_id} /* InfoPlist.strings */ = {{
-\t\t\tisa = PBXVariantGroup;
-\t\t\tchildren = (
-\t\t\t\t{en_file_ref_id} /* en */,
-\t\t\t\t{zh_file_ref_id} /* zh-Hans */,
-\t\t\t);
-\t\t\tname = InfoPlist.strings;
-\t\t\tsourceTree = "<group>";
-\t\t}};
-"""
-        content = content.replace(
-            variant_group_section,
-            variant_group_section + "\n" + variant_group_entry
-        )
-        print("✅ 添加 PBXVariantGroup 条目")
-    
-    # 4. 在 Project_Color 组中添加引用
-    # 查找 Project_Color 的 children 数组
-    import re
-    project_color_pattern = r'(/\* Project_Color \*/\s*=\s*\{[^}]*children\s*=\s*\([^)]*)'
-    match = re.search(project_color_pattern, content, re.DOTALL)
-    
-    if match:
-        children_section = match.group(1)
-        new_children_section = children_section + f"\n\t\t\t\t{variant_group_id} /* InfoPlist.strings */,"
-        content = content.replace(children_section, new_children_section)
-        print("✅ 添加到 Project_Color 组")
+
+    synchronized = synchronized_root(project, BATCH_ROOT)
+    if synchronized is not None:
+        # 同步文件夹内的 .lproj 由 Xcode 自动归并为变体组并打包，与 --batch 一样只需登记 knownRegions
+        print(f"ℹ️  InfoPlist.strings 位于同步文件夹 {synchronized} 内，由 Xcode 自动收录")
     else:
-        print("⚠️  未找到 Project_Color 组的 children 部分")
-    
-    # 5. 在 Resources Build Phase 中添加
-    resources_pattern = r'(/\* Resources \*/\s*=\s*\{[^}]*files\s*=\s*\([^)]*)'
-    match = re.search(resources_pattern, content, re.DOTALL)
-    
-    if match:
-        files_section = match.group(1)
-        new_files_section = files_section + f"\n\t\t\t\t{en_build_file_id} /* InfoPlist.strings in Resources */,"
-        content = content.replace(files_section, new_files_section)
+        # 1. 添加 PBXVariantGroup 与各语言的 PBXFileReference，并加入 Project_Color 组
+        # （ID 由路径确定，重复运行得到同一批对象，不会重复添加）
+        project_groups = project.find_groups('Project_Color')
+        try:
+            variant_group_id, file_refs = add_variant(
+                project, project_groups[0] if project_groups else None, 'InfoPlist.strings', LOCALES)
+        except KeyError:
+            print("⚠️  未找到 Resources Build Phase")
+            return False
+        print("✅ 添加 PBXVariantGroup 与 PBXFileReference 条目")
         print("✅ 添加到 Resources Build Phase")
-    else:
-        print("⚠️  未找到 Resources Build Phase")
-    
-    # 6. 添加本地化语言（如果还没有）
-    # 查找 knownRegions
-    regions_pattern = r'(knownRegions\s*=\s*\([^)]*)'
-    match = re.search(regions_pattern, content)
-    
-    if match:
-        regions_section = match.group(1)
-        if 'en,' not in regions_section:
-            new_regions = regions_section + "\n\t\t\t\ten,"
-            content = content.replace(regions_section, new_regions)
-            print("✅ 添加 en 到 knownRegions")
-        if '"zh-Hans"' not in regions_section and 'zh-Hans' not in regions_section:
-            new_regions = regions_section + '\n\t\t\t\t"zh-Hans",'
-            content = content.replace(regions_section, new_regions)
-            print("✅ 添加 zh-Hans 到 knownRegions")
-    
+        if project_groups:
+            print("✅ 添加到 Project_Color 组")
+        else:
+            print("⚠️  未找到 Project_Color 组")
+
+        print("🔧 ID:")
+        print(f"   Variant Group: {variant_group_id}")
+        for locale, file_ref in zip(LOCALES, file_refs):
+            print(f"   {locale} File Ref: {file_ref}")
+
+    # 2. 添加本地化语言（如果还没有）
+    for locale in LOCALES:
+        if project.add_known_region(locale):
+            print(f"✅ 添加 {locale} 到 knownRegions")
+
     # 保存修改
     try:
-        with open(pbxproj_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        print(f"\n✅ 成功更新 {pbxproj_path}")
+        if project.save():
+            print(f"\n✅ 成功更新 {pbxproj_path}")
+        else:
+            print(f"\nℹ️  {pbxproj_path} 没有变化，未写入")
         return True
     except Exception as e:
         print(f"❌ 无法写入 {pbxproj_path}: {e}")
         return False
 
-def main():
-    pbxproj_path = "Project_Color.xcodeproj/project.pbxproj"
-    
+def discover_strings(root: str) -> Dict[Tuple[str, str], Dict[str, str]]:
+    """
+    查找 root 下全部 *.lproj/*.strings
+
+    Returns:
+        {(.lproj 所在目录, 文件名): {语言: 相对该目录的路径}}，语言按名称排序
+    """
+    found: Dict[Tuple[str, str], Dict[str, str]] = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+        if not dirpath.endswith('.lproj'):
+            continue
+        parent, lproj = os.path.split(dirpath)
+        locale = lproj[:-len('.lproj')]
+        for name in filenames:
+            if name.endswith('.strings'):
+                found.setdefault((parent, name), {})[locale] = f"{lproj}/{name}"
+    return {key: dict(sorted(locales.items())) for key, locales in sorted(found.items())}
+
+def add_strings_batch(pbxproj_path: str, root: str = BATCH_ROOT, dry_run: bool = False) -> bool:
+    """把 root 下全部本地化 .strings 一次加入工程"""
+    t0 = time.perf_counter()
+    project = XcodeProject.load(pbxproj_path)
+    found = discover_strings(root)
+    if not found:
+        print(f"ℹ️  {root} 下没有 *.lproj/*.strings")
+        return True
+
+    index = project.path_index()
+    created: List[str] = []
+    regions = set()
+    for (directory, name), locales in found.items():
+        regions.update(locales)
+        rel_dir = os.path.relpath(os.path.abspath(directory), project.project_dir)
+        synchronized = synchronized_root(project, rel_dir)
+        label = f"{os.path.join(rel_dir, name)}（{len(locales)} 种语言: {', '.join(locales)}）"
+        if synchronized is not None:
+            # 同步文件夹内的 .lproj 由 Xcode 自动归并为变体组，只需登记 knownRegions
+            print(f"   ℹ️ {label} 位于同步文件夹 {synchronized} 内，由 Xcode 自动收录")
+            continue
+        group = ensure_group(project, index, rel_dir, created)
+        add_variant(project, group, name, locales)
+        print(f"   ✅ {label}")
+
+    for region in sorted(regions):
+        if project.add_known_region(region):
+            print(f"   ✅ 添加 {region} 到 knownRegions")
+    for path in created:
+        print(f"   📁 新建组: {path}")
+    elapsed = time.perf_counter() - t0
+    print(f"⏱️  {len(found)} 个 .strings 变体组，{len(regions)} 种语言，耗时 {elapsed * 1000:.1f} ms")
+
+    if dry_run:
+        print("ℹ️  --dry-run：未写入项目文件")
+        return True
+    if project.save():
+        print(f"\n✅ 成功更新 {pbxproj_path}")
+    else:
+        print(f"\nℹ️  {pbxproj_path} 没有变化，未写入")
+    return True
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='将本地化 .strings 文件添加到 Xcode 项目')
+    parser.add_argument('--batch', nargs='?', const=BATCH_ROOT, default=None, metavar='DIR',
+                        help=f'批量添加目录下全部 *.lproj/*.strings（默认 {BATCH_ROOT}）')
+    parser.add_argument('--project', default=PROJECT_FILE, help='project.pbxproj 路径')
+    parser.add_argument('--dry-run', action='store_true', help='只列出将要添加的条目（仅 --batch）')
+    args = parser.parse_args(argv)
+    pbxproj_path = args.project
+
     print("=" * 60)
-    print("📦 添加 InfoPlist.strings 到 Xcode 项目")
+    if args.batch:
+        print(f"📦 批量添加 {args.batch} 下的本地化 .strings 到 Xcode 项目")
+    else:
+        print("📦 添加 InfoPlist.strings 到 Xcode 项目")
     print("=" * 60)
-    
-    if add_infoplist_strings_to_xcode(pbxproj_path):
+
+    if args.batch:
+        success = add_strings_batch(pbxproj_path, args.batch, args.dry_run)
+    else:
+        success = add_infoplist_strings_to_xcode(pbxproj_path)
+
+    if success:
         print("\n✅ 完成！请在 Xcode 中重新加载项目。")
         print("\n📝 后续步骤：")
         print("   1. 关闭 Xcode")
         print("   2. 重新打开项目")
-        print("   3. 验证 InfoPlist.strings 文件已添加")
+        print("   3. 验证 .strings 文件已添加")
         print("   4. 检查本地化设置")
         return 0
     else:
@@ -172,5 +198,3 @@ def main():
 
 if __name__ == "__main__":
     sys.exit(main())
-
-
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Xcode 项目完整性审计：project.pbxproj 与文件系统交叉检查
+
+旧的正则式添加脚本可能留下悬空的文件引用、未加入工程的 Swift 文件和重复的构建条目。
+这里只解析一次 project.pbxproj（pbxproj.XcodeProject），建立文件引用、组、构建阶段与
+变体组的索引，再只遍历一次源码目录，比对后报告三类问题：
+
+    missing     工程引用了不存在的对象或磁盘上不存在的文件
+    orphaned    没有任何对象引用的文件引用 / 构建条目 / 组，以及未加入工程的源码文件
+    duplicated  同一数组中重复的条目、同一构建阶段中指向同一文件的多个构建条目、
+                指向同一路径的多个文件引用
+
+--fix 在内存中批量修复可以安全自动处理的问题，最后只写回一次。在本项目上耗时为
+毫秒级，可以作为每次提交前的检查；发现问题时退出码为 1。
+
+用法: python3 audit_xcode_project.py
+      python3 audit_xcode_project.py --fix
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from pbxproj import PROJECT_FILE, XcodeProject
+from sync_xcode_tree import (IGNORED_NAMES, SOURCE_EXTENSIONS, sync_tree, synchronized_root,
+                             synchronized_roots)
+
+# 数组形式的对象引用字段
+LIST_REFERENCE_FIELDS = {
+    'children', 'files', 'buildPhases', 'targets', 'dependencies', 'buildConfigurations',
+    'exceptions', 'fileSystemSynchronizedGroups', 'packageProductDependencies', 'packageReferences',
+}
+
+# 单值的对象引用字段
+REFERENCE_FIELDS = {
+    'fileRef', 'target', 'targetProxy', 'buildConfigurationList', 'mainGroup', 'productRefGroup',
+    'productReference', 'currentVersion', 'containerPortal', 'buildPhase',
+}
+
+# 没有被引用时视为孤立的对象类型
+COLLECTABLE_ISA = {'PBXFileReference', 'PBXBuildFile', 'PBXGroup', 'PBXVariantGroup'}
+
+class Issue(NamedTuple):
+    """一个审计问题；修复方式由后面几个字段决定（都为空表示只能手动处理）"""
+    kind: str                       # missing / orphaned / duplicated
+    message: str
+    delete: Optional[str] = None    # 删除该对象（连同所有引用）
+    owner: Optional[str] = None     # 从 owner 的 field 中去掉 value
+    field: Optional[str] = None
+    value: Optional[str] = None
+    add: Optional[str] = None       # 把该目录下未加入工程的文件补进工程
+
+def _walk_disk(project: XcodeProject, roots: List[str]) -> Set[str]:
+    """一次遍历各顶层目录，返回其中全部文件与目录的相对路径"""
+    found: Set[str] = set()
+    for root in roots:
+        top = os.path.join(project.project_dir, root)
+        for dirpath, dirnames, filenames in os.walk(top):
+            rel_dir = os.path.relpath(dirpath, project.project_dir)
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            found.update(os.path.join(rel_dir, name) for name in dirnames)
+            found.update(os.path.join(rel_dir, name) for name in filenames
+                         if name not in IGNORED_NAMES)
+    return found
+
+def audit(project: XcodeProject) -> List[Issue]:
+    """对已解析的工程做全部检查"""
+    objects = project.objects
+    issues: List[Issue] = []
+
+    # ---- 索引：路径、父子关系、引用计数 ----
+    paths: Dict[str, Optional[str]] = {}
+    top_level: List[str] = []
+    for key, path, parent in project.walk():
+        paths[key] = path
+        if parent == project.main_group and path:
+            top_level.append(key)
+    roots = sorted({paths[key].split(os.sep)[0] for key in top_level})
+    on_disk = _walk_disk(project, roots)
+
+    def exists(path: str) -> bool:
+        if path.split(os.sep)[0] in roots:
+            return path in on_disk or path in roots
+        return os.path.exists(os.path.join(project.project_dir, path))
+
+    # 引用计数；被单值字段（currentVersion、productReference 等）引用的对象不能自动删除
+    references: Dict[str, int] = {}
+    pinned: Set[str] = set()
+    for key, obj in objects.items():
+        for field, value in obj.items():
+            values = value if isinstance(value, list) else [value]
+            for item in values:
+                if isinstance(item, str) and item in objects and item != key:
+                    references[item] = references.get(item, 0) + 1
+            if field in REFERENCE_FIELDS and not (obj['isa'] == 'PBXBuildFile' and field == 'fileRef'):
+                pinned.add(value)
+
+    # ---- missing：悬空引用、磁盘上不存在的文件 ----
+    for key, obj in objects.items():
+        name = project.display_name(key) or key
+        for field, value in obj.items():
+            if field in LIST_REFERENCE_FIELDS and isinstance(value, list):
+                for item in value:
+                    if item not in objects:
+                        issues.append(Issue('missing', f"{name}.{field} 引用了不存在的对象 {item}",
+                                            owner=key, field=field, value=item))
+            elif field in REFERENCE_FIELDS and isinstance(value, str) and value not in objects:
+                fixable = obj['isa'] == 'PBXBuildFile' and field == 'fileRef'
+                issues.append(Issue('missing', f"{name}.{field} 引用了不存在的对象 {value}",
+                                    delete=key if fixable else None))
+
+    for key, obj in objects.items():
+        if obj['isa'] != 'PBXFileReference' or paths.get(key) is None:
+            continue
+        if not exists(paths[key]):
+            issues.append(Issue('missing', f"文件不存在: {paths[key]}",
+                                delete=None if key in pinned else key))
+
+    for key, obj in objects.items():
+        root = paths.get(key)
+        if obj['isa'] != 'PBXFileSystemSynchronizedRootGroup' or root is None:
+            continue
+        for exception in obj.get('exceptions', []):
+            for entry in objects.get(exception, {}).get('membershipExceptions', []):
+                if not exists(os.path.join(root, entry)):
+                    issues.append(Issue('missing', f"同步文件夹例外项不存在: {root}/{entry}",
+                                        owner=exception, field='membershipExceptions', value=entry))
+        for entry in obj.get('explicitFileTypes', {}):
+            if not exists(os.path.join(root, entry)):
+                issues.append(Issue('missing', f"explicitFileTypes 中的文件不存在: {root}/{entry}",
+                                    owner=key, field='explicitFileTypes', value=entry))
+
+    # ---- orphaned：无人引用的对象、未加入工程的源码 ----
+    for key, obj in objects.items():
+        if obj['isa'] in COLLECTABLE_ISA and not references.get(key):
+            issues.append(Issue('orphaned', f"没有被引用的 {obj['isa']}: {project.display_name(key) or key}",
+                                delete=key))
+
+    indexed = {path for path in paths.values() if path is not None}
+    # 同步文件夹（包括嵌套在普通组里的）中的文件由 Xcode 自动收录
+    synchronized = synchronized_roots(project)
+    for path in sorted(on_disk - indexed):
+        root = path.split(os.sep)[0]
+        if os.path.splitext(path)[1] not in SOURCE_EXTENSIONS:
+            continue
+        if synchronized_root(project, path, synchronized) is not None:
+            continue
+        if any(part.startswith('.') or part.endswith('.lproj') for part in path.split(os.sep)):
+            continue
+        issues.append(Issue('orphaned', f"未加入工程的源码文件: {path}", add=root))
+
+    # ---- duplicated：数组内重复、同一阶段重复构建、同一路径多个引用 ----
+    for key, obj in objects.items():
+        for field, value in obj.items():
+            if field in LIST_REFERENCE_FIELDS and isinstance(value, list) and len(set(value)) < len(value):
+                seen: Set[str] = set()
+                for item in value:
+                    if item in seen:
+                        issues.append(Issue('duplicated',
+                                            f"{project.display_name(key) or key}.{field} 中重复出现 "
+                                            f"{project.comments.get(item, item)}",
+                                            owner=key, field=field, value=item))
+                    seen.add(item)
+
+        if obj['isa'].endswith('BuildPhase'):
+            first: Dict[str, str] = {}
+            for build_file in dict.fromkeys(obj.get('files', [])):
+                file_ref = objects.get(build_file, {}).get('fileRef')
+                if file_ref is None:
+                    continue
+                if file_ref in first:
+                    issues.append(Issue('duplicated', f"{project.comments.get(build_file, build_file)} "
+                                                      f"重复构建（{first[file_ref]}）", delete=build_file))
+                else:
+                    first[file_ref] = build_file
+
+    by_path: Dict[str, str] = {}
+    for key, obj in objects.items():
+        path = paths.get(key)
+        if obj['isa'] != 'PBXFileReference' or path is None:
+            continue
+        if path in by_path:
+            issues.append(Issue('duplicated', f"多个文件引用指向 {path}: {by_path[path]}, {key}（需手动合并）"))
+        else:
+            by_path[path] = key
+    return issues
+
+def apply_fixes(project: XcodeProject, issues: List[Issue], target: Optional[str] = None) -> int:
+    """在内存中批量修复可自动处理的问题；返回修复的问题数"""
+    fixed = 0
+    doomed: Set[str] = set()
+    additions: Set[str] = set()
+    for issue in issues:
+        if issue.delete:
+            doomed.add(issue.delete)
+        elif issue.owner and issue.owner in project.objects:
+            container = project.objects[issue.owner].get(issue.field)
+            if isinstance(container, dict):
+                container.pop(issue.value, None)
+            elif isinstance(container, list) and issue.kind == 'duplicated':
+                # 保留第一次出现
+                project.objects[issue.owner][issue.field] = list(dict.fromkeys(container))
+            elif isinstance(container, list) and issue.value in container:
+                container.remove(issue.value)
+        elif issue.add:
+            additions.add(issue.add)
+        else:
+            continue
+        fixed += 1
+
+    # 删除文件引用时一并删除指向它的构建条目
+    doomed |= {key for key, obj in project.objects.items()
+               if obj['isa'] == 'PBXBuildFile' and obj.get('fileRef') in doomed}
+    project.remove_objects(doomed)
+    for root in sorted(additions):
+        sync_tree(project, os.path.join(project.project_dir, root), target)
+    return fixed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Xcode 项目完整性审计')
+    parser.add_argument('--project', default=PROJECT_FILE, help='project.pbxproj 路径')
+    parser.add_argument('--fix', action='store_true', help='批量修复可自动处理的问题并写回一次')
+    parser.add_argument('--target', default=None, help='补加源码时使用的 target（默认第一个 target）')
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    project = XcodeProject.load(args.project)
+    issues = audit(project)
+    elapsed = time.perf_counter() - t0
+
+    print(f"🔍 审计 {args.project}（{len(project.objects):,} 个对象，{elapsed * 1000:.1f} ms）")
+    if not issues:
+        print("✅ 没有发现问题")
+        return 0
+
+    for kind, label in (('missing', '❌ 缺失'), ('orphaned', '⚠️ 孤立'), ('duplicated', '⚠️ 重复')):
+        found = [issue for issue in issues if issue.kind == kind]
+        if found:
+            print(f"\n{label}（{len(found)}）:")
+            for issue in found:
+                print(f"   {issue.message}")
+
+    if not args.fix:
+        print(f"\n共 {len(issues)} 个问题；运行 --fix 可自动修复其中的大部分")
+        return 1
+
+    fixed = apply_fixes(project, issues, args.target)
+    if project.save(backup=f"{args.project}.backup"):
+        print(f"\n🔧 已修复 {fixed} 个问题并写回 {args.project}（备份: {args.project}.backup）")
+    remaining = audit(project)
+    if remaining:
+        print(f"⚠️ 仍有 {len(remaining)} 个问题需要手动处理")
+        return 1
+    print("✅ 修复后没有问题")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
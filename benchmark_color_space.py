@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+color_space 的一致性核对与吞吐量基准
+
+核对：与 ColorSpaceConverter.swift 的 float32 移植及 Sharma 参考数据的比对在
+tests/test_color_space.py 中，随 pytest 一起运行；--check 只是调用它的快捷方式。
+
+基准：对一幅随机图像整体转换，按每秒百万像素（MP/s）报告各转换的吞吐量。
+
+用法:
+    python3 benchmark_color_space.py                  # 核对 + 基准
+    python3 benchmark_color_space.py --check          # 只核对
+    python3 benchmark_color_space.py --megapixels 4   # 基准图像大小
+"""
+
+import argparse
+import os
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from color_space import (
+    ciede2000,
+    hsl_to_rgb,
+    hsv_to_rgb,
+    lab_to_lch,
+    lab_to_rgb,
+    lch_to_lab,
+    rgb8_to_lab,
+    rgb_to_cmyk,
+    rgb_to_hsl,
+    rgb_to_hsv,
+)
+
+# 一致性核对（pytest 用例）
+CHECK_TESTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tests', 'test_color_space.py')
+
+def check() -> bool:
+    """运行 tests/test_color_space.py 中的核对用例"""
+    import pytest
+
+    return pytest.main(['-q', CHECK_TESTS]) == 0
+
+# ---------------------------------------------------------------------------
+# 基准
+# ---------------------------------------------------------------------------
+
+def benchmark(megapixels: float = 1.0, repeat: int = 3, seed: int = 42) -> Dict[str, float]:
+    """各转换对整幅图像的吞吐量（MP/s，取多次中最快的一次）"""
+    rng = np.random.default_rng(seed)
+    pixels = int(megapixels * 1_000_000)
+    image8 = rng.integers(0, 256, size=(pixels, 3), dtype=np.uint8)
+    image = image8 / 255.0
+    lab = rgb8_to_lab(image8)
+    lch = lab_to_lch(lab)
+    hsl = rgb_to_hsl(image)
+    hsv = rgb_to_hsv(image)
+    shifted = np.roll(lab, 1, axis=0)
+
+    cases: List[Tuple[str, Callable[[], np.ndarray]]] = [
+        ('rgb8 → Lab', lambda: rgb8_to_lab(image8)),
+        ('Lab → RGB', lambda: lab_to_rgb(lab)),
+        ('Lab → LCh', lambda: lab_to_lch(lab)),
+        ('LCh → Lab', lambda: lch_to_lab(lch)),
+        ('RGB → HSL', lambda: rgb_to_hsl(image)),
+        ('HSL → RGB', lambda: hsl_to_rgb(hsl)),
+        ('RGB → HSV', lambda: rgb_to_hsv(image)),
+        ('HSV → RGB', lambda: hsv_to_rgb(hsv)),
+        ('RGB → CMYK', lambda: rgb_to_cmyk(image)),
+        ('CIEDE2000（逐像素对）', lambda: ciede2000(lab, shifted)),
+    ]
+
+    print(f"⏱️  基准图像: {pixels:,} 像素，每项取 {repeat} 次中最快的一次")
+    results = {}
+    for label, fn in cases:
+        best = float('inf')
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - t0)
+        results[label] = pixels / best / 1_000_000
+        print(f"   {label:<24} {best * 1000:8.1f} ms   {results[label]:7.2f} MP/s")
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='color_space 一致性核对与吞吐量基准')
+    parser.add_argument('--check', action='store_true', help='只核对，不跑基准')
+    parser.add_argument('--megapixels', type=float, default=1.0, help='基准图像大小（百万像素）')
+    parser.add_argument('--repeat', type=int, default=3, help='每项重复次数')
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print("颜色空间转换：一致性核对与吞吐量基准")
+    print("=" * 80)
+    print()
+
+    ok = check()
+    print()
+    if not ok:
+        print("❌ 核对未通过")
+        raise SystemExit(1)
+    print("✅ 核对通过")
+
+    if not args.check:
+        print()
+        benchmark(args.megapixels, args.repeat)
+
+if __name__ == '__main__':
+    main()
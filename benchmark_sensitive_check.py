@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+敏感词扫描器性能基准
+
+生成 30k / 300k / 3M 行的合成颜色名称语料（关键词密度取自 colornames.csv 实测值），
+分阶段计时，把吞吐量与峰值内存写入 JSON，并与已保存的基线比较以发现性能回退。
+
+用法:
+    python3 benchmark_sensitive_check.py                     # 运行并与基线比较
+    python3 benchmark_sensitive_check.py --sizes 30000       # 只跑 30k
+    python3 benchmark_sensitive_check.py --update-baseline   # 把本次结果存为基线
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from typing import Dict, List
+
+from accurate_sensitive_check import (
+    ACCEPTABLE_CONTEXTS,
+    CRITICAL_KEYWORDS,
+    HIGH_SENSITIVE_KEYWORDS,
+    MODERATE_KEYWORDS,
+    TIER_CRITICAL,
+    TIER_HIGH,
+    TIER_MODERATE,
+    TIERS,
+    ContextIndex,
+    FindingWriter,
+    KeywordMatcher,
+    compile_rules,
+    fold_obfuscation,
+    iter_findings,
+    normalize_name,
+    render_summary,
+    scan_csv,
+    tokenize,
+    write_report,
+)
+
+# 语料与结果目录（与扫描器的缓存目录一样固定在仓库根目录下，不随当前目录变化）
+BENCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.benchmark')
+
+DEFAULT_SIZES = [30_000, 300_000, 3_000_000]
+
+# 语料格式版本（生成逻辑变化时递增，旧语料自动重建）
+CORPUS_VERSION = 1
+
+# 每行命中各类词汇的概率（colornames.csv 实测：严重 0.003%，高度 0.037%，
+# 中度 0.33%，含例外短语 1.8%）
+DENSITIES = {
+    TIER_CRITICAL: 0.00003,
+    TIER_HIGH: 0.0004,
+    TIER_MODERATE: 0.0035,
+    'acceptable': 0.018,
+}
+
+# 合成名称的基础词汇（固定列表，保证不同时间生成的语料一致）
+BASE_WORDS = [
+    'amber', 'ash', 'autumn', 'azure', 'berry', 'blush', 'bronze', 'burnt',
+    'canyon', 'cedar', 'cherry', 'cloud', 'coral', 'cosmic', 'cream', 'dawn',
+    'deep', 'desert', 'dusk', 'dusty', 'electric', 'ember', 'faded', 'fern',
+    'fig', 'forest', 'frost', 'garden', 'ginger', 'glacier', 'golden', 'granite',
+    'harbor', 'hazy', 'honey', 'iris', 'ivory', 'jade', 'lagoon', 'lavender',
+    'lemon', 'lilac', 'maple', 'meadow', 'midnight', 'mint', 'misty', 'moss',
+    'ocean', 'olive', 'orchid', 'pale', 'peach', 'pearl', 'pine', 'plum',
+    'rose', 'rust', 'sage', 'sand', 'sky', 'slate', 'smoky', 'storm',
+    'sunset', 'teal', 'velvet', 'violet', 'walnut', 'willow', 'winter', 'zinc',
+]
+
+# 分阶段计时的阶段名
+PHASES = [
+    'csv_load',
+    'normalize',
+    'fold',
+    'rules_load',
+    'matcher_build',
+    'tier_' + TIER_CRITICAL,
+    'tier_' + TIER_HIGH,
+    'tier_' + TIER_MODERATE,
+    'match_all',
+    'whitelist',
+    'scan_total',
+    'report',
+]
+
+# 低于该秒数的阶段差异视为噪声，不判定回退
+NOISE_FLOOR = 0.05
+
+def corpus_path(rows: int, seed: int) -> str:
+    return os.path.join(BENCH_DIR, f'corpus_v{CORPUS_VERSION}_{rows}_{seed}.csv')
+
+def generate_corpus(path: str, rows: int, seed: int):
+    """生成合成语料（按固定种子，结果可复现）"""
+    rng = random.Random(seed * 1_000_003 + rows)
+    pools = [
+        (DENSITIES[TIER_CRITICAL], sorted(CRITICAL_KEYWORDS)),
+        (DENSITIES[TIER_HIGH], sorted(HIGH_SENSITIVE_KEYWORDS)),
+        (DENSITIES[TIER_MODERATE], sorted(MODERATE_KEYWORDS)),
+        (DENSITIES['acceptable'], sorted(ACCEPTABLE_CONTEXTS)),
+    ]
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['name', 'hex', 'good name'])
+        for _ in range(rows):
+            words = [rng.choice(BASE_WORDS) for _ in range(rng.choice((1, 2, 2, 3)))]
+            r = rng.random()
+            for density, pool in pools:
+                if r < density:
+                    words.insert(rng.randrange(len(words) + 1), rng.choice(pool))
+                    break
+                r -= density
+            writer.writerow([
+                ' '.join(words).title(),
+                f'#{rng.randrange(1 << 24):06x}',
+                'x' if rng.random() < 0.1 else '',
+            ])
+    os.replace(tmp_path, path)
+
+def peak_rss_mb() -> float:
+    """当前进程的峰值常驻内存（MB）"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 返回字节，Linux 返回 KB
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def run_benchmark(path: str, batch_size: int = 100_000) -> Dict:
+    """在独立进程中对一份语料分阶段计时"""
+    perf = time.perf_counter
+    phases = dict.fromkeys(PHASES, 0.0)
+    hits = dict.fromkeys(TIERS, 0)
+    rows = 0
+
+    # 启动成本：从编译产物恢复规则（正常运行时的路径）
+    t0 = perf()
+    compile_rules()
+    phases['rules_load'] = perf() - t0
+
+    t0 = perf()
+    matcher = KeywordMatcher({
+        TIER_CRITICAL: CRITICAL_KEYWORDS,
+        TIER_HIGH: HIGH_SENSITIVE_KEYWORDS,
+        TIER_MODERATE: MODERATE_KEYWORDS,
+    })
+    context_index = ContextIndex(ACCEPTABLE_CONTEXTS)
+    phases['matcher_build'] = perf() - t0
+
+    tier_matchers = {
+        TIER_CRITICAL: KeywordMatcher({TIER_CRITICAL: CRITICAL_KEYWORDS}),
+        TIER_HIGH: KeywordMatcher({TIER_HIGH: HIGH_SENSITIVE_KEYWORDS}),
+        TIER_MODERATE: KeywordMatcher({TIER_MODERATE: MODERATE_KEYWORDS}),
+    }
+
+    # 分阶段：按批读取，逐阶段处理同一批数据
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        while True:
+            t0 = perf()
+            batch = [row['name'] for row in islice(reader, batch_size)]
+            phases['csv_load'] += perf() - t0
+            if not batch:
+                break
+            rows += len(batch)
+
+            t0 = perf()
+            texts = [normalize_name(name) for name in batch]
+            phases['normalize'] += perf() - t0
+
+            t0 = perf()
+            folded = [fold_obfuscation(text) for text in texts]
+            phases['fold'] += perf() - t0
+
+            for tier, tier_matcher in tier_matchers.items():
+                find_all = tier_matcher.find_all
+                t0 = perf()
+                for text in texts:
+                    find_all(text)
+                phases['tier_' + tier] += perf() - t0
+
+            find_all = matcher.find_all
+            t0 = perf()
+            matched = []
+            for text, folded_text in zip(texts, folded):
+                found = find_all(text, folded_text)
+                if found:
+                    matched.append((text, found))
+            phases['match_all'] += perf() - t0
+
+            t0 = perf()
+            for text, found in matched:
+                if any(check_context for _, _, check_context in found):
+                    context_index.contains_any(tokenize(text))
+                for tier in {tier for tier, _, _ in found}:
+                    hits[tier] += 1
+            phases['whitelist'] += perf() - t0
+
+    # 端到端：真实扫描路径（分块读取 + 发现流写出）
+    findings_path = f"{path}.findings.jsonl"
+    report_path = f"{path}.report.txt"
+    stats = {'total': 0, TIER_CRITICAL: 0, TIER_HIGH: 0, TIER_MODERATE: 0}
+    t0 = perf()
+    with FindingWriter(findings_path) as writer:
+        for finding in iter_findings(scan_csv(path), stats):
+            writer.write(finding)
+    phases['scan_total'] = perf() - t0
+
+    t0 = perf()
+    with contextlib.redirect_stdout(io.StringIO()):
+        render_summary(findings_path, 'jsonl', stats)
+    write_report(report_path, findings_path, 'jsonl', stats)
+    phases['report'] = perf() - t0
+
+    os.remove(findings_path)
+    os.remove(report_path)
+
+    return {
+        'rows': rows,
+        'phases': {name: round(seconds, 4) for name, seconds in phases.items()},
+        'rows_per_sec': round(rows / phases['scan_total']) if phases['scan_total'] else 0,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'hits': hits,
+        'findings': {tier: stats[tier] for tier in TIERS},
+    }
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """与基线比较，返回回退描述列表"""
+    regressions = []
+    for size, current in results['results'].items():
+        base = baseline.get('results', {}).get(size)
+        if base is None:
+            continue
+
+        if current['rows_per_sec'] < base['rows_per_sec'] * (1 - threshold):
+            regressions.append(
+                f"{size} 行: 吞吐量 {base['rows_per_sec']:,} → {current['rows_per_sec']:,} 行/秒")
+
+        if current['peak_rss_mb'] > base['peak_rss_mb'] * (1 + threshold):
+            regressions.append(
+                f"{size} 行: 峰值内存 {base['peak_rss_mb']} → {current['peak_rss_mb']} MB")
+
+        for phase, seconds in current['phases'].items():
+            before = base['phases'].get(phase)
+            if before is None:
+                continue
+            if seconds > before * (1 + threshold) and seconds - before > NOISE_FLOOR:
+                regressions.append(f"{size} 行: 阶段 {phase} {before:.3f}s → {seconds:.3f}s")
+
+    return regressions
+
+def print_result(size: int, result: Dict):
+    print(f"📊 {size:,} 行")
+    for phase in PHASES:
+        print(f"   {phase:<16s} {result['phases'][phase]:>9.3f} s")
+    print(f"   吞吐量: {result['rows_per_sec']:,} 行/秒")
+    print(f"   峰值内存: {result['peak_rss_mb']} MB")
+    print(f"   命中: " + ', '.join(f"{tier} {result['findings'][tier]}" for tier in TIERS))
+    print()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='敏感词扫描器性能基准')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='语料行数（默认 30000 300000 3000000）')
+    parser.add_argument('--seed', type=int, default=42, help='语料随机种子')
+    parser.add_argument('--output', default=os.path.join(BENCH_DIR, 'results.json'),
+                        help='结果 JSON 路径')
+    parser.add_argument('--baseline', default=os.path.join(BENCH_DIR, 'baseline.json'),
+                        help='基线 JSON 路径')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='把本次结果保存为新的基线')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='判定回退的相对阈值（默认 0.15，即 15%%）')
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print("敏感词扫描器性能基准")
+    print("=" * 80)
+    print()
+
+    results = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'seed': args.seed,
+        'results': {},
+    }
+
+    for size in args.sizes:
+        path = corpus_path(size, args.seed)
+        if not os.path.exists(path):
+            print(f"📝 生成 {size:,} 行语料: {path}")
+            generate_corpus(path, size, args.seed)
+
+        # 每个规模在全新进程中运行，峰值内存互不影响
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            result = pool.submit(run_benchmark, path).result()
+        results['results'][str(size)] = result
+        print_result(size, result)
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"📄 结果已保存到: {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"📌 已更新基线: {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"⚠️  未找到基线 {args.baseline}，可用 --update-baseline 创建")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    print()
+    if regressions:
+        print(f"❌ 发现 {len(regressions)} 项性能回退（阈值 {args.threshold:.0%}）:")
+        for item in regressions:
+            print(f"   - {item}")
+        return 1
+
+    print(f"✅ 与基线（{baseline.get('timestamp', '?')}）相比无性能回退")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+预计算 RGB 查找表：常数时间的颜色命名
+
+调色板固定不变，因此可以离线为每个量化后的 sRGB 单元算好最近的颜色名称。
+把 8 位 RGB 每个通道均分为 levels 段（如 64 或 128），对每个单元的中心颜色
+用 color_naming 的网格索引求 CIEDE2000 最近色，结果存为可内存映射的三维表。
+
+文件布局（小端，各段 16 字节对齐）：
+    头部      魔数、版本、分段数、调色板颜色数、下标字节数、单元最大量化色差、
+              各段偏移、源 CSV 的 SHA-256
+    index     uint16/uint32[levels, levels, levels]   最近色在调色板中的下标
+    boundary  uint8[levels, levels, levels]           1 = 单元角点的最近色与中心不全相同（边界单元）
+
+量化误差：单元角点到单元中心的 CIEDE2000 色差的最大值记入头部；构建时还会
+抽样比较查表与精确查询的结果。边界单元可在查表时用精确查询细化。
+
+用法：
+    python3 build_color_lut.py                  # 仅在调色板变化时重建（64³）
+    python3 build_color_lut.py --levels 128     # 128³ 单元
+    python3 build_color_lut.py --check          # 只检查是否过期（过期时退出码为 1）
+"""
+
+import argparse
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+import numpy as np
+
+from build_palette import CSV_FILE, PALETTE_FILE, file_sha256, load_palette
+from color_naming import NameEngine
+from color_space import ciede2000, rgb8_to_lab
+
+# 查找表只供批处理使用，放在仓库根目录的 build/ 下（Project_Color/ 是同步文件夹，放在里面会被打包进应用）
+LUT_FILE = 'build/colornames.lut'
+
+MAGIC = b'CNRGBLUT'
+
+FORMAT_VERSION = 1
+
+DEFAULT_LEVELS = 64
+
+# 魔数, 版本, 分段数, 调色板颜色数, 下标字节数, 单元最大量化色差, index/boundary 段偏移, 源 CSV 的 SHA-256
+HEADER = struct.Struct('<8sIIIId2Q32s')
+
+HEADER_SIZE = 128
+
+ALIGNMENT = 16
+
+# 构建后抽样评估的默认颜色数
+DEFAULT_SAMPLES = 5000
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+class ColorLUT:
+    """
+    内存映射的 RGB 查找表（只读）
+
+    index / boundary 是直接指向映射文件的 (levels, levels, levels) 视图，按 [r, g, b] 取值。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        if len(self._buffer) < HEADER_SIZE:
+            raise ValueError(f"不是查找表文件（长度不足）: {path}")
+
+        (magic, version, levels, palette_count, itemsize, cell_radius,
+         index_offset, boundary_offset, source_sha256) = HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise ValueError(f"不是查找表文件: {path}")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"查找表格式版本不匹配: {version}（需要 {FORMAT_VERSION}）")
+        cells = levels ** 3
+        if boundary_offset + cells > len(self._buffer):
+            raise ValueError(f"查找表文件不完整: {path}")
+
+        self.levels = levels
+        self.palette_count = palette_count
+        self.cell_radius = cell_radius
+        self.source_sha256 = source_sha256
+        dtype = np.uint16 if itemsize == 2 else np.uint32
+        shape = (levels, levels, levels)
+        self.index = self._buffer[index_offset:index_offset + cells * itemsize].view(dtype).reshape(shape)
+        self.boundary = self._buffer[boundary_offset:boundary_offset + cells].view(np.bool_).reshape(shape)
+        self._shift = 8 - int(np.log2(levels))
+
+    def cells(self, rgb: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """8 位 RGB (N, 3) → 单元坐标 (r, g, b)"""
+        rgb = np.asarray(rgb, dtype=np.uint8).reshape(-1, 3) >> self._shift
+        return rgb[:, 0], rgb[:, 1], rgb[:, 2]
+
+    def lookup(self, rgb: np.ndarray, engine: Optional[NameEngine] = None) -> np.ndarray:
+        """
+        批量查表：8 位 RGB (N, 3) → 调色板下标 (N,)
+
+        传入 engine 时，落在边界单元的颜色改用精确查询。
+        """
+        rgb = np.asarray(rgb, dtype=np.uint8).reshape(-1, 3)
+        cell = self.cells(rgb)
+        index = self.index[cell].astype(np.int64)
+        if engine is not None:
+            near_boundary = self.boundary[cell]
+            if near_boundary.any():
+                index[near_boundary] = engine.nearest(rgb8_to_lab(rgb[near_boundary]))[0]
+        return index
+
+    def is_fresh(self, csv_file: str) -> bool:
+        """是否由 csv_file 的当前内容生成"""
+        return file_sha256(csv_file) == self.source_sha256
+
+# 工作进程中的命名引擎（每个进程构建一次）
+_engine: Optional[NameEngine] = None
+
+def _init_worker(palette_file: str):
+    global _engine
+    _engine = NameEngine.from_palette(load_palette(palette_file, csv_file=None))
+
+def _lattice(r: np.ndarray, g: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.stack(np.meshgrid(r, g, b, indexing='ij'), axis=-1).reshape(-1, 3)
+
+def _build_slab(args: Tuple[int, int, int]) -> Tuple[int, np.ndarray, np.ndarray, float]:
+    """
+    计算 r 段 [start, stop) 的单元
+
+    单元中心求最近色；单元角点（相邻单元共用，位于两段 8 位取值的正中间）也求最近色，
+    8 个角点与中心结果不全相同的单元标为边界单元。角点到中心的最大色差即量化误差。
+
+    Returns:
+        (start, 最近色下标, 边界标记, 最大量化色差)
+    """
+    start, stop, levels = args
+    step = 256 // levels
+    center = np.arange(levels) * step + (step - 1) / 2.0
+    corner = np.clip(np.arange(levels + 1) * step - 0.5, 0.0, 255.0)
+
+    center_lab = rgb8_to_lab(_lattice(center[start:stop], center, center))
+    corner_lab = rgb8_to_lab(_lattice(corner[start:stop + 1], corner, corner))
+    index, _ = _engine.nearest(center_lab)
+    corner_index, _ = _engine.nearest(corner_lab)
+
+    shape = (stop - start, levels, levels)
+    index = index.reshape(shape)
+    center_lab = center_lab.reshape(shape + (3,))
+    corner_index = corner_index.reshape((stop - start + 1, levels + 1, levels + 1))
+    corner_lab = corner_lab.reshape((stop - start + 1, levels + 1, levels + 1, 3))
+
+    boundary = np.zeros(shape, dtype=bool)
+    radius = 0.0
+    for dr in (0, 1):
+        for dg in (0, 1):
+            for db in (0, 1):
+                rows = slice(dr, dr + stop - start)
+                cols = slice(dg, dg + levels)
+                depth = slice(db, db + levels)
+                boundary |= corner_index[rows, cols, depth] != index
+                radius = max(radius, float(ciede2000(center_lab, corner_lab[rows, cols, depth]).max()))
+    return start, index, boundary, radius
+
+def build_lut(palette_file: str = PALETTE_FILE, lut_file: str = LUT_FILE,
+              levels: int = DEFAULT_LEVELS, jobs: Optional[int] = None) -> ColorLUT:
+    """
+    在进程池中生成查找表（原子写入）
+
+    Args:
+        palette_file: build_palette 生成的二进制调色板
+        lut_file: 输出路径
+        levels: 每个通道的分段数（256 的约数）
+        jobs: 工作进程数（默认 CPU 核数）
+
+    Returns:
+        映射后的 ColorLUT
+    """
+    if levels < 1 or 256 % levels:
+        raise ValueError(f"分段数必须是 256 的约数: {levels}")
+    palette = load_palette(palette_file, csv_file=None)
+    jobs = jobs or os.cpu_count() or 1
+
+    # 每个进程分到若干个 r 段，任务数多于进程数以均衡负载
+    slab = max(1, levels // (jobs * 4))
+    tasks = [(start, min(start + slab, levels), levels) for start in range(0, levels, slab)]
+    itemsize = 2 if len(palette) <= np.iinfo(np.uint16).max + 1 else 4
+    index = np.empty((levels, levels, levels), dtype=f'<u{itemsize}')
+    boundary = np.empty((levels, levels, levels), dtype=np.uint8)
+    cell_radius = 0.0
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(palette_file,)) as pool:
+        for start, values, flags, radius in pool.map(_build_slab, tasks):
+            index[start:start + len(values)] = values
+            boundary[start:start + len(values)] = flags
+            cell_radius = max(cell_radius, radius)
+
+    index_offset = HEADER_SIZE
+    boundary_offset = _align(index_offset + index.nbytes)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, levels, len(palette), itemsize, cell_radius,
+                         index_offset, boundary_offset, palette.source_sha256)
+
+    os.makedirs(os.path.dirname(lut_file) or os.curdir, exist_ok=True)
+    tmp_path = f"{lut_file}.tmp"
+    with open(tmp_path, 'wb') as f:
+        for offset, payload in [(0, header), (index_offset, index.tobytes()),
+                                (boundary_offset, boundary.tobytes())]:
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(payload)
+    os.replace(tmp_path, lut_file)
+    return ColorLUT(lut_file)
+
+def evaluate(lut: ColorLUT, engine: NameEngine, samples: int, seed: int = 42) -> dict:
+    """
+    抽样比较查表与精确查询
+
+    Returns:
+        {'mismatch': 查表结果不同的比例, 'max_excess': 查表结果比精确最近色多出的最大色差,
+         'refined_mismatch': 边界细化后结果不同的比例, 'boundary': 落在边界单元的比例}
+    """
+    rng = np.random.default_rng(seed)
+    rgb = rng.integers(0, 256, size=(samples, 3)).astype(np.uint8)
+    lab = rgb8_to_lab(rgb)
+    exact, exact_delta = engine.nearest(lab)
+    looked_up = lut.lookup(rgb)
+    refined = lut.lookup(rgb, engine)
+    excess = ciede2000(lab, engine.lab[looked_up]) - exact_delta
+    return {
+        'mismatch': float(np.mean(looked_up != exact)),
+        'max_excess': float(excess.max()),
+        'refined_mismatch': float(np.mean(refined != exact)),
+        'boundary': float(np.mean(lut.boundary[lut.cells(rgb)])),
+    }
+
+def is_up_to_date(csv_file: str = CSV_FILE, lut_file: str = LUT_FILE,
+                  levels: int = DEFAULT_LEVELS) -> bool:
+    """查找表是否存在、格式版本与分段数一致且与 CSV 内容一致"""
+    try:
+        lut = ColorLUT(lut_file)
+    except (OSError, ValueError):
+        return False
+    return lut.levels == levels and lut.is_fresh(csv_file)
+
+def load_lut(lut_file: str = LUT_FILE, csv_file: Optional[str] = CSV_FILE) -> ColorLUT:
+    """
+    映射查找表
+
+    指定 csv_file 时校验哈希，查找表过期则抛出 ValueError；传 None 跳过校验。
+    """
+    lut = ColorLUT(lut_file)
+    if csv_file is not None and not lut.is_fresh(csv_file):
+        raise ValueError(f"查找表已过期（{csv_file} 已变化），请重新运行 build_color_lut.py")
+    return lut
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='预计算 RGB → 颜色名称查找表')
+    parser.add_argument('--levels', type=int, default=DEFAULT_LEVELS,
+                        help=f'每个通道的分段数（默认 {DEFAULT_LEVELS}，须为 256 的约数）')
+    parser.add_argument('--jobs', type=int, default=None, help='工作进程数（默认 CPU 核数）')
+    parser.add_argument('--palette', default=PALETTE_FILE, help='二进制调色板路径')
+    parser.add_argument('--csv', default=CSV_FILE, help='颜色名称 CSV（用于判断是否过期）')
+    parser.add_argument('-o', '--output', default=LUT_FILE, help='查找表输出路径')
+    parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLES,
+                        help=f'构建后抽样评估的颜色数（默认 {DEFAULT_SAMPLES}，0 表示跳过）')
+    parser.add_argument('--check', action='store_true', help='只检查查找表是否过期，不重建')
+    parser.add_argument('--force', action='store_true', help='无论是否过期都重建')
+    args = parser.parse_args(argv)
+
+    if args.check:
+        if is_up_to_date(args.csv, args.output, args.levels):
+            print(f"✅ 查找表是最新的: {args.output}")
+            return
+        print(f"❌ 查找表缺失或已过期: {args.output}")
+        raise SystemExit(1)
+
+    if not args.force and is_up_to_date(args.csv, args.output, args.levels):
+        print(f"✅ 查找表是最新的，无需重建: {args.output}")
+        return
+
+    try:
+        load_palette(args.palette, args.csv)
+    except (OSError, ValueError) as e:
+        print(f"❌ 调色板不可用: {e}")
+        print("   请先运行 python3 build_palette.py")
+        raise SystemExit(1)
+
+    print(f"正在生成 {args.levels}³ 查找表...")
+    t0 = time.perf_counter()
+    lut = build_lut(args.palette, args.output, args.levels, args.jobs)
+    elapsed = time.perf_counter() - t0
+
+    print(f"✅ 已生成查找表: {args.output}")
+    print(f"   单元数量: {args.levels ** 3:,}")
+    print(f"   文件大小: {os.path.getsize(args.output) / 1024:.1f} KB")
+    print(f"   耗时: {elapsed:.1f} s")
+    print(f"   边界单元: {np.mean(lut.boundary):.1%}")
+    print(f"   最大量化色差（单元内到中心）: ΔE00 = {lut.cell_radius:.3f}")
+
+    if args.samples:
+        engine = NameEngine.from_palette(load_palette(args.palette, csv_file=None))
+        stats = evaluate(lut, engine, args.samples)
+        print()
+        print(f"📊 抽样评估（{args.samples:,} 个随机颜色）：")
+        print(f"   查表结果与精确查询不同: {stats['mismatch']:.2%}")
+        print(f"   因量化多出的最大色差: ΔE00 = {stats['max_excess']:.3f}")
+        print(f"   落在边界单元: {stats['boundary']:.2%}")
+        print(f"   边界细化后仍不同: {stats['refined_mismatch']:.2%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+把 colornames.csv 预编译为可内存映射的二进制调色板
+
+App 冷启动时 ColorNameResolver.loadPalette 需要逐行 split 约 3 万行 CSV 并逐个
+rgbToLab；构建时一次算好，运行时直接映射文件即可使用。目前只有 Python 批处理工具
+（color_naming、build_color_lut 等）读取它，因此输出到仓库根目录的 build/ 下；
+App 侧改用它之前不要放进 Project_Color/（同步文件夹中的文件都会被打包进应用）。
+
+文件布局（小端，各段 16 字节对齐）：
+    头部      魔数、版本、颜色数、各段偏移、名称表长度、源 CSV 的 SHA-256
+    lab       float32[N, 3]   CIE LAB (D65)
+    rgb       uint8[N, 3]     8 位 sRGB
+    flags     uint8[N]        bit0 = CSV 的 good name 列有标记
+    offsets   uint32[N + 1]   名称表偏移，第 i 个名称为 names[offsets[i]:offsets[i+1]]
+    names     UTF-8 名称表
+
+用法：
+    python3 build_palette.py            # 仅在 CSV 变化时重建
+    python3 build_palette.py --check    # 只检查是否过期（过期时退出码为 1）
+"""
+
+import argparse
+import csv
+import hashlib
+import os
+import re
+import struct
+from typing import List, Optional
+
+import numpy as np
+
+from color_space import hex_to_rgb, rgb8_to_lab
+
+CSV_FILE = 'Project_Color/Resources/colornames.csv'
+
+PALETTE_FILE = 'build/colornames.palette'
+
+MAGIC = b'CNPALLAB'
+
+FORMAT_VERSION = 1
+
+# 魔数, 版本, 颜色数, lab/rgb/flags/offsets/names 段偏移, 名称表长度, 源 CSV 的 SHA-256
+HEADER = struct.Struct('<8sII6Q32s')
+
+HEADER_SIZE = 128
+
+ALIGNMENT = 16
+
+# flags 位
+FLAG_GOOD_NAME = 0x01
+
+_HEX_RE = re.compile(r'#?[0-9a-fA-F]{6}')
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def file_sha256(path: str) -> bytes:
+    """文件内容的 SHA-256（原始字节）"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+class Palette:
+    """
+    内存映射的二进制调色板（只读）
+
+    lab / rgb / flags 都是直接指向映射文件的 NumPy 视图，不复制数据；
+    名称按需从 UTF-8 名称表解码。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        if len(self._buffer) < HEADER_SIZE:
+            raise ValueError(f"不是调色板文件（长度不足）: {path}")
+
+        (magic, version, count, lab_offset, rgb_offset, flags_offset,
+         offsets_offset, names_offset, names_size, source_sha256) = HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise ValueError(f"不是调色板文件: {path}")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"调色板格式版本不匹配: {version}（需要 {FORMAT_VERSION}）")
+        if names_offset + names_size > len(self._buffer):
+            raise ValueError(f"调色板文件不完整: {path}")
+
+        self.version = version
+        self.source_sha256 = source_sha256
+        self.lab = self._section(lab_offset, np.float32, count * 3).reshape(count, 3)
+        self.rgb = self._section(rgb_offset, np.uint8, count * 3).reshape(count, 3)
+        self.flags = self._section(flags_offset, np.uint8, count)
+        self._offsets = self._section(offsets_offset, np.uint32, count + 1)
+        self._names = self._section(names_offset, np.uint8, names_size)
+
+    def _section(self, offset: int, dtype, count: int) -> np.ndarray:
+        size = np.dtype(dtype).itemsize * count
+        return self._buffer[offset:offset + size].view(dtype)
+
+    def __len__(self) -> int:
+        return len(self.flags)
+
+    @property
+    def good(self) -> np.ndarray:
+        """good name 标记（布尔数组）"""
+        return (self.flags & FLAG_GOOD_NAME).astype(bool)
+
+    def name(self, index: int) -> str:
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return self._names[start:end].tobytes().decode('utf-8')
+
+    def names(self) -> List[str]:
+        return [self.name(i) for i in range(len(self))]
+
+    def hex(self, index: int) -> str:
+        r, g, b = self.rgb[index]
+        return f"#{r:02x}{g:02x}{b:02x}"
+
+    def is_fresh(self, csv_file: str) -> bool:
+        """是否由 csv_file 的当前内容生成"""
+        return file_sha256(csv_file) == self.source_sha256
+
+def build_palette(csv_file: str = CSV_FILE, palette_file: str = PALETTE_FILE) -> int:
+    """
+    从 CSV 生成二进制调色板（原子写入），返回颜色数
+
+    与 ColorNameResolver 的加载规则一致：名称两端去空白，跳过空名称和无效色值。
+    """
+    source_sha256 = file_sha256(csv_file)
+
+    names = []
+    hexes = []
+    flags = []
+    with open(csv_file, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError(f"空文件: {csv_file}")
+        good_index = header.index('good name') if 'good name' in header else None
+        for row in reader:
+            if len(row) < 2:
+                continue
+            name = row[0].strip()
+            hex_color = row[1].strip()
+            if not name or not _HEX_RE.fullmatch(hex_color):
+                continue
+            names.append(name.encode('utf-8'))
+            hexes.append(hex_color)
+            good = good_index is not None and len(row) > good_index and row[good_index].strip()
+            flags.append(FLAG_GOOD_NAME if good else 0)
+
+    count = len(names)
+    rgb = hex_to_rgb(hexes)
+    lab = rgb8_to_lab(rgb).astype('<f4')
+    flags = np.array(flags, dtype=np.uint8)
+    offsets = np.zeros(count + 1, dtype='<u4')
+    np.cumsum([len(name) for name in names], out=offsets[1:])
+    names_blob = b''.join(names)
+
+    lab_offset = HEADER_SIZE
+    rgb_offset = _align(lab_offset + lab.nbytes)
+    flags_offset = _align(rgb_offset + rgb.nbytes)
+    offsets_offset = _align(flags_offset + flags.nbytes)
+    names_offset = _align(offsets_offset + offsets.nbytes)
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, count, lab_offset, rgb_offset, flags_offset,
+                         offsets_offset, names_offset, len(names_blob), source_sha256)
+
+    os.makedirs(os.path.dirname(palette_file) or os.curdir, exist_ok=True)
+    tmp_path = f"{palette_file}.tmp"
+    with open(tmp_path, 'wb') as f:
+        for offset, payload in [(0, header), (lab_offset, lab.tobytes()), (rgb_offset, rgb.tobytes()),
+                                (flags_offset, flags.tobytes()), (offsets_offset, offsets.tobytes()),
+                                (names_offset, names_blob)]:
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(payload)
+    os.replace(tmp_path, palette_file)
+    return count
+
+def is_up_to_date(csv_file: str = CSV_FILE, palette_file: str = PALETTE_FILE) -> bool:
+    """调色板是否存在、格式版本一致且与 CSV 内容一致"""
+    try:
+        return Palette(palette_file).is_fresh(csv_file)
+    except (OSError, ValueError):
+        return False
+
+def load_palette(palette_file: str = PALETTE_FILE, csv_file: Optional[str] = CSV_FILE) -> Palette:
+    """
+    映射二进制调色板
+
+    指定 csv_file 时校验哈希，调色板过期则抛出 ValueError；传 None 跳过校验。
+    """
+    palette = Palette(palette_file)
+    if csv_file is not None and not palette.is_fresh(csv_file):
+        raise ValueError(f"调色板已过期（{csv_file} 已变化），请重新运行 build_palette.py")
+    return palette
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='把 colornames.csv 预编译为二进制 LAB 调色板')
+    parser.add_argument('csv_file', nargs='?', default=CSV_FILE, help='颜色名称 CSV 文件')
+    parser.add_argument('-o', '--output', default=PALETTE_FILE, help='调色板输出路径')
+    parser.add_argument('--check', action='store_true', help='只检查调色板是否过期，不重建')
+    parser.add_argument('--force', action='store_true', help='无论是否过期都重建')
+    args = parser.parse_args(argv)
+
+    if args.check:
+        if is_up_to_date(args.csv_file, args.output):
+            print(f"✅ 调色板是最新的: {args.output}")
+            return
+        print(f"❌ 调色板缺失或已过期: {args.output}")
+        raise SystemExit(1)
+
+    if not args.force and is_up_to_date(args.csv_file, args.output):
+        print(f"✅ 调色板是最新的，无需重建: {args.output}")
+        return
+
+    count = build_palette(args.csv_file, args.output)
+    size = os.path.getsize(args.output)
+    print(f"✅ 已生成调色板: {args.output}")
+    print(f"   颜色数量: {count:,}")
+    print(f"   文件大小: {size / 1024:.1f} KB")
+
+if __name__ == '__main__':
+    main()
@@ -2,210 +2,293 @@
 # -*- coding: utf-8 -*-
 """
 清理颜色名称数据库，删除不当词汇
+
+删除哪些名称不再依赖手工抄录的黑名单，而是在同一次流式读取中调用
+accurate_sensitive_check 的分级扫描，按所选方案的等级策略决定去留，
+同时写出清理结果、发现流与审阅报告。
 """
 
-import csv
-import shutil
-from datetime import datetime
-
-# 方案一：严格方案（官方/教育类应用）
-STRICT_BLACKLIST = [
-    # 严重敏感词
-    'Bastard-amber',
-    # 高度敏感词
-    'Blood God', 'Blood of My Enemies', 'Blood Pact',
-    'Blue Murder', 'Murder Mustard',
-    'Che Guevara Red', 'Trump Tan',
-    'Opium', 'Opium Mauve', 'Ecstasy', 'Orchid Ecstasy',
-    # 中度敏感词（全部）
-    'Ake Blood', 'Animal Blood', "Bat's Blood Soup", 'Bestial Blood',
-    'Bite the Bullet', 'Blood', 'Blood Brother', 'Blood Burst', 'Blood Donor',
-    'Blood Kiss', 'Blood Mahogany', 'Blood Omen', 'Blood Organ',
-    'Blood Rose', 'Blood Rush', 'Blood Thorn', 'Choco Death', 'Dead 99',
-    'Dead Blue Eyes', 'Dead Forest', 'Dead Grass', 'Dead Lake', 'Dead Pixel',
-    'Death Guard', 'Death of a Star', 'Demon', 'Demon Princess',
-    'Detailed Devil', 'Devil Blue', "Devil's Advocate", "Devil's Butterfly",
-    "Devil's Flower Mantis", "Devil's Grass", "Devil's Lip", "Devil's Plum",
-    "Dragon's Blood", 'Dried Blood', 'Electric Blood', 'Evil Centipede',
-    'Evil Cigar', 'Evil Eye', 'Evil Forces', 'Evil Sunz Scarlet', 'Evil-Lyn',
-    'Flare Gun', 'Go to Hell Black', 'Golden Blood', 'Golden Gun', 'Gun Barrel',
-    'Gun Corps Brown', 'Gun Powder', 'Hell Rider', 'Highway to Hell',
-    'Hotter Than Hell', 'Machine Gun Metal', 'Matt Demon', 'Mauvey Nude',
-    'Naked Noodle', 'Naked Rose', 'Nipple', 'Nude Flamingo', 'Nude Lips',
-    'Pink as Hell', 'Red Blood', 'Red Dead Redemption', 'Red Death', 'Red Devil',
-    'Rondo of Blood', 'Satan', "Shojo's Blood", 'Silver Bullet', 'Sneaky Devil',
-    'Speaking of the Devil', 'To Hell and Black', 'Venous Blood Red',
-    'Walking Dead', 'Weapon Bronze', 'White Bullet',
-]
-
-# 方案二：适中方案（一般消费类应用）[推荐]
-MODERATE_BLACKLIST = [
-    # 严重敏感词
-    'Bastard-amber',
-    # 高度敏感词
-    'Blood God', 'Blood of My Enemies', 'Blood Pact',
-    'Blue Murder', 'Murder Mustard',
-    'Che Guevara Red', 'Trump Tan',
-    'Opium', 'Opium Mauve', 'Ecstasy', 'Orchid Ecstasy',
-    # 中度敏感词（明显不当的）
-    'Nipple',
-    'Go to Hell Black', 'Highway to Hell', 'Hotter Than Hell',
-    'Pink as Hell', 'To Hell and Black',
-]
-
-# 方案三：宽松方案（创意/设计类应用）
-MINIMAL_BLACKLIST = [
-    'Bastard-amber',
-]
-
-def clean_csv(input_file, output_file, blacklist, backup=True):
+import argparse
+import os
+import tempfile
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from accurate_sensitive_check import (
+    CACHE_DIR,
+    TIER_CRITICAL,
+    TIER_HIGH,
+    TIER_MODERATE,
+    FindingWriter,
+    ScanCache,
+    row_findings,
+    ruleset_fingerprint,
+    scan_name,
+    write_report,
+)
+from color_cleaner import CleanResult, clean_stream
+
+# 等级策略：等级 → 要删除的关键词（None 表示该等级的全部命中）
+Policy = Dict[str, Optional[FrozenSet[str]]]
+
+# 方案一：严格方案（官方/教育类应用）——删除所有严重、高度和中度敏感词汇
+STRICT_POLICY: Policy = {
+    TIER_CRITICAL: None,
+    TIER_HIGH: None,
+    TIER_MODERATE: None,
+}
+
+# 方案二：适中方案（一般消费类应用）[推荐]——严重和高度敏感词汇，以及明显不当的中度敏感词
+MODERATE_POLICY: Policy = {
+    TIER_CRITICAL: None,
+    TIER_HIGH: None,
+    TIER_MODERATE: frozenset({'nipple', 'hell'}),
+}
+
+# 方案三：宽松方案（创意/设计类应用）——只删除严重侮辱性词汇
+MINIMAL_POLICY: Policy = {
+    TIER_CRITICAL: None,
+}
+
+INPUT_FILE = 'Project_Color/Resources/colornames.csv'
+
+REPORT_FILE = 'accurate_sensitive_report.txt'
+
+# 方案 → (方案名称, 等级策略, 输出文件)
+SCHEMES = {
+    'strict': ("严格方案", STRICT_POLICY,
+               'Project_Color/Resources/colornames_clean_strict.csv'),
+    'moderate': ("适中方案", MODERATE_POLICY,
+                 'Project_Color/Resources/colornames_clean_moderate.csv'),
+    'minimal': ("宽松方案", MINIMAL_POLICY,
+                'Project_Color/Resources/colornames_clean_minimal.csv'),
+}
+
+# 菜单选项 → 方案
+CHOICES = {'1': 'strict', '2': 'moderate', '3': 'minimal'}
+
+# 终端与菜单中的等级名称
+TIER_LABELS = {TIER_CRITICAL: "严重", TIER_HIGH: "高度", TIER_MODERATE: "中度"}
+
+def policy_removes(policy: Policy, found: Dict[str, List[str]]) -> bool:
+    """判断扫描结论是否落入等级策略"""
+    for tier, keywords in policy.items():
+        hits = found[tier]
+        if hits and (keywords is None or not keywords.isdisjoint(hits)):
+            return True
+    return False
+
+def describe_policy(policy: Policy) -> str:
+    """等级策略的一行说明"""
+    parts = []
+    for tier, keywords in policy.items():
+        if keywords is None:
+            parts.append(f"{TIER_LABELS[tier]}（全部）")
+        else:
+            parts.append(f"{TIER_LABELS[tier]}（{', '.join(sorted(keywords))}）")
+    return "删除 " + "、".join(parts) + " 敏感词"
+
+def scan_and_clean(input_file: str, schemes: Dict[str, Tuple[str, Policy]],
+                   findings_path: str, fmt: str = 'jsonl', backup: bool = True,
+                   cache: Optional[ScanCache] = None) -> Tuple[Dict[str, CleanResult], Dict[str, int]]:
     """
-    清理CSV文件，删除黑名单中的颜色名称
-    
+    一次读取源文件：逐行分级扫描，写出发现流，并按各方案的等级策略分发到输出
+
     Args:
         input_file: 输入CSV文件路径
-        output_file: 输出CSV文件路径
-        blacklist: 要删除的颜色名称列表
-        backup: 是否备份原文件
+        schemes: {方案: (输出文件路径, 等级策略)}
+        findings_path: 发现流写出路径
+        fmt: 发现流格式（jsonl / csv）
+        backup: 是否为每个输出记录差异补丁
+        cache: 增量扫描缓存（可选）
+
+    Returns:
+        ({方案: CleanResult}, 扫描统计)
     """
-    # 备份原文件
-    if backup:
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_file = f"{input_file}.backup_{timestamp}"
-        shutil.copy2(input_file, backup_file)
-        print(f"✅ 已备份原文件到: {backup_file}")
-    
-    # 读取并过滤数据
-    kept_rows = []
-    removed_rows = []
-    total_count = 0
-    
-    with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        fieldnames = reader.fieldnames
-        
-        for row in reader:
-            total_count += 1
-            if row['name'] in blacklist:
-                removed_rows.append(row)
-            else:
-                kept_rows.append(row)
-    
-    # 写入清理后的数据
-    with open(output_file, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(kept_rows)
-    
-    return total_count, len(kept_rows), len(removed_rows), removed_rows
-
-def main():
+    stats = {'total': 0, TIER_CRITICAL: 0, TIER_HIGH: 0, TIER_MODERATE: 0}
+    scan = cache.scan if cache is not None else scan_name
+    policies = [(key, policy) for key, (_, policy) in schemes.items()]
+
+    with FindingWriter(findings_path, fmt) as writer:
+        def classify(row_number: int, record: Dict[str, str]):
+            found = scan(record['name'])
+            for finding in row_findings(row_number, record['name'], record['hex'], found, stats):
+                writer.write(finding)
+            return [key for key, policy in policies if policy_removes(policy, found)]
+
+        outputs = {key: output_file for key, (output_file, _) in schemes.items()}
+        results = clean_stream(input_file, outputs, classify, backup=backup)
+
+    stats['total'] = next(iter(results.values())).total
+    return results, stats
+
+def print_result(scheme_name, output_file, result):
+    """输出单个方案的清理统计"""
     print("=" * 80)
-    print("颜色名称数据库清理工具")
+    print(f"清理完成（{scheme_name}）")
     print("=" * 80)
     print()
-    
-    input_file = 'Project_Color/Resources/colornames.csv'
-    
-    print("请选择清理方案：")
+    print(f"📊 统计信息：")
+    print(f"   原始颜色数量: {result.total:,}")
+    print(f"   保留颜色数量: {result.kept:,}")
+    print(f"   删除颜色数量: {result.removed:,} ({result.removed/result.total*100:.3f}%)")
+    print()
+    print(f"📄 输出文件: {output_file}")
+    if result.delta_file:
+        print(f"💾 差异备份: {result.delta_file}")
+    print()
+
+    if result.removed_rows:
+        print("🗑️  已删除的颜色：")
+        for i, row in enumerate(result.removed_rows, 1):
+            print(f"   {i}. {row['name']} ({row['hex']})")
+        print()
+
+def run(input_file, outputs, backup=True, report_file=None,
+        findings_path=None, fmt='jsonl', use_cache=True):
+    """
+    执行一个或多个方案：一次扫描、一次读取，同时写出清理结果与审阅报告
+
+    Args:
+        input_file: 输入CSV文件路径
+        outputs: {方案: 输出文件路径}（输出为源文件本身即原地清理，可用差异补丁还原）
+        report_file: 审阅报告路径（None 表示不写报告；命令行默认写到 REPORT_FILE）
+    """
+    keys = list(outputs)
+    schemes = {key: (output_file, SCHEMES[key][1]) for key, output_file in outputs.items()}
+
+    cache = None
+    if use_cache:
+        cache = ScanCache(os.path.join(CACHE_DIR, os.path.basename(input_file) + '.json'),
+                          ruleset_fingerprint())
+
+    # 未指定发现流路径时写到临时文件，报告由它渲染后删除
+    keep_findings = findings_path is not None
+    if not keep_findings:
+        fd, findings_path = tempfile.mkstemp(suffix=f'.findings.{fmt}')
+        os.close(fd)
+
+    names = "、".join(SCHEMES[key][0] for key in keys)
+    print(f"正在扫描并清理（{names}）...")
+    print()
+
+    try:
+        results, stats = scan_and_clean(input_file, schemes, findings_path, fmt,
+                                        backup=backup, cache=cache)
+        if cache is not None:
+            cache.save()
+        if report_file is not None:
+            write_report(report_file, findings_path, fmt, stats)
+    finally:
+        if not keep_findings:
+            os.remove(findings_path)
     print()
-    print("1. 严格方案（官方/教育类应用）")
-    print(f"   删除 {len(STRICT_BLACKLIST)} 个颜色名称 (0.307%)")
-    print("   删除所有严重、高度和中度敏感词汇")
+
+    for key in keys:
+        print_result(SCHEMES[key][0], schemes[key][0], results[key])
+
+    if report_file is not None:
+        print(f"📄 审阅报告: {report_file}")
+    if keep_findings:
+        print(f"📄 发现流: {findings_path}")
     print()
-    print("2. 适中方案（一般消费类应用）[推荐] ⭐")
-    print(f"   删除 {len(MODERATE_BLACKLIST)} 个颜色名称 (0.060%)")
-    print("   删除严重和高度敏感词汇，以及明显不当的中度敏感词")
+    return results, stats
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='清理颜色名称数据库，删除不当词汇')
+    parser.add_argument('--all', action='store_true',
+                        help='批量模式：一次读取，同时生成严格/适中/宽松三个方案的输出（不进入交互菜单）')
+    parser.add_argument('--scheme', choices=sorted(SCHEMES),
+                        help='直接执行指定方案（不进入交互菜单）')
+    parser.add_argument('--in-place', action='store_true',
+                        help='与 --scheme 连用：原子替换源文件，而不是写入单独的输出文件')
+    parser.add_argument('--no-backup', action='store_true', help='不记录差异补丁')
+    parser.add_argument('--no-cache', action='store_true', help='不使用增量扫描缓存')
+    parser.add_argument('--report', default=REPORT_FILE, help='审阅报告路径')
+    parser.add_argument('-o', '--output', metavar='PATH',
+                        help='同时保留发现流（每条含行号、等级、名称、色值、关键词）')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl',
+                        help='发现流格式（默认 jsonl）')
+    args = parser.parse_args(argv)
+    if args.in_place and not args.scheme:
+        parser.error('--in-place 需要与 --scheme 一起使用')
+
+    options = dict(backup=not args.no_backup, report_file=args.report,
+                   findings_path=args.output, fmt=args.format, use_cache=not args.no_cache)
+
+    print("=" * 80)
+    print("颜色名称数据库清理工具")
+    print("=" * 80)
     print()
-    print("3. 宽松方案（创意/设计类应用）")
-    print(f"   删除 {len(MINIMAL_BLACKLIST)} 个颜色名称 (0.003%)")
-    print("   只删除严重侮辱性词汇")
+
+    input_file = INPUT_FILE
+
+    if args.all:
+        run(input_file, {key: output_file for key, (_, _, output_file) in SCHEMES.items()},
+            **options)
+        print("✅ 全部方案清理完成！")
+        return
+
+    if args.scheme:
+        output_file = input_file if args.in_place else SCHEMES[args.scheme][2]
+        run(input_file, {args.scheme: output_file}, **options)
+        print("✅ 清理完成！")
+        return
+
+    print("请选择清理方案：")
     print()
+    for choice, key in CHOICES.items():
+        scheme_name, policy, _ = SCHEMES[key]
+        print(f"{choice}. {scheme_name}" + (" [推荐] ⭐" if key == 'moderate' else ""))
+        print(f"   {describe_policy(policy)}")
+        print()
     print("4. 查看详细信息（不执行清理）")
     print()
+    print("5. 批量生成全部方案（只读取一次源文件）")
+    print()
     print("0. 退出")
     print()
-    
-    choice = input("请输入选项 (0-4): ").strip()
-    
+
+    choice = input("请输入选项 (0-5): ").strip()
+
     if choice == '0':
         print("已退出")
         return
-    
+
     if choice == '4':
-        print("\n" + "=" * 80)
-        print("方案一：严格方案 - 删除列表")
-        print("=" * 80)
-        for i, name in enumerate(STRICT_BLACKLIST, 1):
-            print(f"{i}. {name}")
-        
-        print("\n" + "=" * 80)
-        print("方案二：适中方案 - 删除列表 [推荐]")
-        print("=" * 80)
-        for i, name in enumerate(MODERATE_BLACKLIST, 1):
-            print(f"{i}. {name}")
-        
-        print("\n" + "=" * 80)
-        print("方案三：宽松方案 - 删除列表")
-        print("=" * 80)
-        for i, name in enumerate(MINIMAL_BLACKLIST, 1):
-            print(f"{i}. {name}")
-        
+        for key, (scheme_name, policy, output_file) in SCHEMES.items():
+            print("\n" + "=" * 80)
+            print(f"{scheme_name} - 等级策略")
+            print("=" * 80)
+            print(describe_policy(policy))
+            print(f"输出文件: {output_file}")
+        print()
+        print("具体会删除哪些名称，请查看扫描报告: python3 accurate_sensitive_check.py")
+        return
+
+    if choice == '5':
+        print()
+        run(input_file, {key: output_file for key, (_, _, output_file) in SCHEMES.items()},
+            **options)
+        print("✅ 全部方案清理完成！")
         return
-    
-    # 选择黑名单
-    if choice == '1':
-        blacklist = STRICT_BLACKLIST
-        scheme_name = "严格方案"
-        output_file = 'Project_Color/Resources/colornames_clean_strict.csv'
-    elif choice == '2':
-        blacklist = MODERATE_BLACKLIST
-        scheme_name = "适中方案"
-        output_file = 'Project_Color/Resources/colornames_clean_moderate.csv'
-    elif choice == '3':
-        blacklist = MINIMAL_BLACKLIST
-        scheme_name = "宽松方案"
-        output_file = 'Project_Color/Resources/colornames_clean_minimal.csv'
-    else:
+
+    # 选择方案
+    if choice not in CHOICES:
         print("❌ 无效的选项")
         return
-    
-    print()
-    print(f"正在执行清理（{scheme_name}）...")
-    print()
-    
-    # 执行清理
-    total, kept, removed, removed_rows = clean_csv(
-        input_file, output_file, blacklist, backup=True
-    )
-    
-    # 输出结果
-    print("=" * 80)
-    print("清理完成")
-    print("=" * 80)
-    print()
-    print(f"📊 统计信息：")
-    print(f"   原始颜色数量: {total:,}")
-    print(f"   保留颜色数量: {kept:,}")
-    print(f"   删除颜色数量: {removed:,} ({removed/total*100:.3f}%)")
-    print()
-    print(f"📄 输出文件: {output_file}")
+
     print()
-    
-    if removed_rows:
-        print("🗑️  已删除的颜色：")
-        for i, row in enumerate(removed_rows, 1):
-            print(f"   {i}. {row['name']} ({row['hex']})")
-        print()
-    
+    key = CHOICES[choice]
+    output_file = SCHEMES[key][2]
+    run(input_file, {key: output_file}, **options)
+
     print("✅ 清理完成！")
     print()
     print("📝 下一步：")
     print(f"   1. 检查输出文件: {output_file}")
-    print(f"   2. 如果满意，可以替换原文件:")
-    print(f"      mv {output_file} {input_file}")
+    print(f"   2. 如果满意，原子替换原文件（保留差异补丁，可随时还原）:")
+    print(f"      python3 clean_color_names.py --scheme {key} --in-place")
     print()
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+颜色词典清理引擎（clean_color_names / auto_clean_moderate / execute_clean 共用）
+
+逐行流式读取 CSV，保留的行原样写入输出文件，只在内存中保留被删除的行；
+黑名单统一转为 frozenset，成员判断为 O(1)，内存与耗时不随词典和黑名单增长而膨胀；
+也可传入逐行判定函数（clean_stream），例如按扫描器的等级策略在同一次读取中决定去留。
+
+备份不再整份复制源文件，而是为每个输出记录一份差异补丁（被删除的原始行、
+它们在源文件中的位置、源文件与输出文件的哈希），统一存放在仓库根目录的 backups/ 下，
+用 restore 命令即可逐字节还原：
+
+    python3 color_cleaner.py restore backups/colornames.csv.<路径哈希>.delta_<时间戳>.json
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+from contextlib import ExitStack
+from datetime import datetime
+from typing import (Callable, Collection, Dict, Iterable, Iterator, List, NamedTuple,
+                    Optional, TextIO, Tuple)
+
+# 颜色名称所在列
+NAME_FIELD = 'name'
+
+# 差异补丁目录（不能放在 Project_Color/ 下，否则会被打包进应用）
+BACKUP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backups')
+
+# 差异补丁格式版本
+DELTA_VERSION = 1
+
+class CleanResult(NamedTuple):
+    """单个输出的清理结果"""
+    total: int
+    kept: int
+    removed: int
+    removed_rows: List[Dict[str, str]]
+    delta_file: Optional[str]
+
+def _iter_records(f: TextIO) -> Iterator[Tuple[List[str], str]]:
+    """
+    逐条读取 CSV 记录，同时返回该记录对应的原始文本（含换行符）
+
+    文件须以 newline='' 打开；引号内换行的记录会跨越多行，原始文本一并保留。
+    """
+    consumed = []
+
+    def lines():
+        for line in f:
+            consumed.append(line)
+            yield line
+
+    for row in csv.reader(lines()):
+        raw = ''.join(consumed)
+        consumed.clear()
+        yield row, raw
+
+class _AtomicOutput:
+    """写入临时文件，全部成功后再用 os.replace 原子替换目标文件"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tmp_path = f"{path}.tmp"
+        self.sha256 = hashlib.sha256()
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.tmp_path, 'w', encoding='utf-8', newline='')
+        return self
+
+    def write(self, raw: str):
+        self._file.write(raw)
+        self.sha256.update(raw.encode('utf-8'))
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        if exc_type is None:
+            os.replace(self.tmp_path, self.path)
+        else:
+            os.remove(self.tmp_path)
+        return False
+
+def write_delta(delta_file: str, source: str, source_sha256: str, output: str,
+                output_sha256: str, removed: List[Tuple[int, str]]):
+    """原子写入差异补丁（补丁与源文件不在同一目录，路径记录为绝对路径）"""
+    delta = {
+        'version': DELTA_VERSION,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'source': os.path.abspath(source),
+        'source_sha256': source_sha256,
+        'output': os.path.abspath(output),
+        'output_sha256': output_sha256,
+        'removed': removed,
+    }
+    os.makedirs(os.path.dirname(delta_file) or os.curdir, exist_ok=True)
+    tmp_path = f"{delta_file}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(delta, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, delta_file)
+
+def delta_path(backup_dir: str, output_file: str, timestamp: str) -> str:
+    """
+    差异补丁的文件名：输出文件名 + 其绝对路径的短哈希 + 时间戳
+
+    不同目录下的同名输出由路径哈希区分；同一秒内重复运行时追加序号，
+    从不覆盖已有的补丁（补丁是还原源文件的唯一依据）。
+    """
+    path_hash = hashlib.sha256(os.path.abspath(output_file).encode('utf-8')).hexdigest()[:8]
+    stem = os.path.join(backup_dir, f"{os.path.basename(output_file)}.{path_hash}.delta_{timestamp}")
+    delta_file = f"{stem}.json"
+    counter = 1
+    while os.path.exists(delta_file):
+        delta_file = f"{stem}_{counter}.json"
+        counter += 1
+    return delta_file
+
+def clean_csv(input_file: str, output_file: str, blacklist: Iterable[str],
+              backup: bool = True, backup_dir: str = BACKUP_DIR) -> CleanResult:
+    """
+    清理CSV文件，删除黑名单中的颜色名称
+
+    Args:
+        input_file: 输入CSV文件路径
+        output_file: 输出CSV文件路径（可与输入文件相同，即原地清理）
+        blacklist: 要删除的颜色名称（任意可迭代对象）
+        backup: 是否记录差异补丁（可用 restore 还原）
+        backup_dir: 差异补丁的存放目录
+
+    Returns:
+        CleanResult(原始数量, 保留数量, 删除数量, 被删除的行, 差异补丁路径)
+    """
+    results = clean_csv_multi(input_file, {None: (output_file, blacklist)}, backup=backup,
+                              backup_dir=backup_dir)
+    return results[None]
+
+def clean_csv_multi(input_file: str,
+                    schemes: Dict[Optional[str], Tuple[str, Iterable[str]]],
+                    backup: bool = True,
+                    backup_dir: str = BACKUP_DIR) -> Dict[Optional[str], CleanResult]:
+    """
+    一次读取源文件，同时生成多个方案的清理结果
+
+    Args:
+        input_file: 输入CSV文件路径
+        schemes: {方案: (输出文件路径, 黑名单)}
+        backup: 是否为每个输出记录差异补丁
+        backup_dir: 差异补丁的存放目录
+
+    Returns:
+        {方案: CleanResult}
+    """
+    # 名称 → 需要删除它的方案；不在表中的行写入全部输出
+    removed_in: Dict[str, List[Optional[str]]] = {}
+    for key, (_, blacklist) in schemes.items():
+        for name in frozenset(blacklist):
+            removed_in.setdefault(name, []).append(key)
+
+    def classify(row_number: int, record: Dict[str, str]):
+        return removed_in.get(record[NAME_FIELD])
+
+    outputs = {key: output_file for key, (output_file, _) in schemes.items()}
+    return clean_stream(input_file, outputs, classify, backup=backup, backup_dir=backup_dir)
+
+def clean_stream(input_file: str, outputs: Dict[Optional[str], str],
+                 classify: Callable[[int, Dict[str, str]], Optional[Collection]],
+                 backup: bool = True,
+                 backup_dir: str = BACKUP_DIR) -> Dict[Optional[str], CleanResult]:
+    """
+    清理引擎：一次读取源文件，按 classify 的判定把每行分发到各输出
+
+    classify(行号, 记录) 返回应删除该行的方案集合，None 或空表示全部保留；
+    行号从 1 开始、不含表头与空行，与扫描器发现流中的 row 一致。
+
+    保留的行按原始文本写出（换行符、引号与源文件一致）；每个输出先写入临时文件，
+    全部完成后才原子替换，中途失败不会留下半个文件。
+
+    Args:
+        input_file: 输入CSV文件路径
+        outputs: {方案: 输出文件路径}（可与输入文件相同，即原地清理）
+        classify: 逐行判定函数
+        backup: 是否为每个输出记录差异补丁
+        backup_dir: 差异补丁的存放目录
+
+    Returns:
+        {方案: CleanResult}
+    """
+    # 每个方案删除的 (源文件中的记录序号, 原始文本)
+    removed: Dict[Optional[str], List[Tuple[int, str]]] = {key: [] for key in outputs}
+    removed_rows: Dict[Optional[str], List[Dict[str, str]]] = {key: [] for key in outputs}
+    source_sha256 = hashlib.sha256()
+    total_count = 0
+
+    with ExitStack() as stack:
+        src = stack.enter_context(open(input_file, 'r', encoding='utf-8', newline=''))
+        records = _iter_records(src)
+        header = next(records, None)
+        if header is None:
+            raise ValueError(f"空文件: {input_file}")
+        fieldnames, raw = header
+        if NAME_FIELD not in fieldnames:
+            raise ValueError(f"缺少 {NAME_FIELD} 列: {input_file}")
+        source_sha256.update(raw.encode('utf-8'))
+
+        writers = {}
+        for key, output_file in outputs.items():
+            writers[key] = stack.enter_context(_AtomicOutput(output_file))
+            writers[key].write(raw)
+        all_writers = list(writers.values())
+
+        for position, (row, raw) in enumerate(records, 1):
+            source_sha256.update(raw.encode('utf-8'))
+            if not row:
+                for writer in all_writers:
+                    writer.write(raw)
+                continue
+            total_count += 1
+            record = dict(zip(fieldnames, row))
+            keys = classify(total_count, record)
+            if not keys:
+                for writer in all_writers:
+                    writer.write(raw)
+                continue
+            for key, writer in writers.items():
+                if key in keys:
+                    removed[key].append((position, raw))
+                    removed_rows[key].append(record)
+                else:
+                    writer.write(raw)
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    results = {}
+    for key, rows in removed_rows.items():
+        delta_file = None
+        if backup:
+            writer = writers[key]
+            delta_file = delta_path(backup_dir, writer.path, timestamp)
+            write_delta(delta_file, input_file, source_sha256.hexdigest(),
+                        writer.path, writer.sha256.hexdigest(), removed[key])
+            print(f"✅ 已记录差异备份（{len(rows)} 行）: {delta_file}")
+        results[key] = CleanResult(total_count, total_count - len(rows), len(rows),
+                                   rows, delta_file)
+    return results
+
+def restore(delta_file: str, target: Optional[str] = None) -> str:
+    """
+    根据差异补丁把清理后的文件逐字节还原为源文件
+
+    Args:
+        delta_file: 差异补丁路径
+        target: 还原结果的写入路径，默认写回补丁记录的源文件路径
+
+    Returns:
+        还原结果的路径
+    """
+    with open(delta_file, 'r', encoding='utf-8') as f:
+        delta = json.load(f)
+    if delta.get('version') != DELTA_VERSION:
+        raise ValueError(f"不支持的差异补丁版本: {delta.get('version')}")
+
+    output_file = delta['output']
+    target = target or delta['source']
+    pending = iter(delta['removed'])
+    next_removed = next(pending, None)
+    output_sha256 = hashlib.sha256()
+
+    with open(output_file, 'r', encoding='utf-8', newline='') as src, \
+            _AtomicOutput(target) as dst:
+        position = 0
+        for _, raw in _iter_records(src):
+            output_sha256.update(raw.encode('utf-8'))
+            while next_removed is not None and next_removed[0] == position:
+                dst.write(next_removed[1])
+                position += 1
+                next_removed = next(pending, None)
+            dst.write(raw)
+            position += 1
+        while next_removed is not None:
+            dst.write(next_removed[1])
+            next_removed = next(pending, None)
+
+        if output_sha256.hexdigest() != delta['output_sha256']:
+            raise ValueError(f"{output_file} 在清理后已被修改，无法按补丁还原")
+        if dst.sha256.hexdigest() != delta['source_sha256']:
+            raise ValueError("还原结果与源文件哈希不一致")
+
+    return target
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='颜色词典清理引擎')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    restore_parser = subparsers.add_parser('restore', help='根据差异补丁还原源文件')
+    restore_parser.add_argument('delta_file', help='差异补丁（*.delta_<时间戳>.json）')
+    restore_parser.add_argument('--to', dest='target', default=None,
+                                help='还原结果的写入路径（默认写回原路径）')
+    args = parser.parse_args(argv)
+
+    if args.command == 'restore':
+        try:
+            target = restore(args.delta_file, args.target)
+        except (OSError, ValueError) as e:
+            print(f"❌ 还原失败: {e}")
+            raise SystemExit(1)
+        print(f"✅ 已还原: {target}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+批量颜色命名引擎（ColorNameResolver 的向量化版本）
+
+ColorNameResolver 对每个查询都在整个调色板上线性计算 CIEDE2000。这里把调色板
+放进均匀 LAB 网格，先用 ΔE76（欧氏距离）给出的下界筛掉不可能更近的颜色，
+只对剩余候选精确计算 CIEDE2000。结果（含并列时取下标最小者）与暴力扫描完全一致。
+
+下界推导（kL/kC/kH 为权重）：
+    ΔE00² ≥ ΔL²/(kL·SL)² + (1 - |RT|/2)·(ΔC'² + ΔH'²)/max(kC·SC, kH·SH)²
+    · |RT| ≤ RC·sin 60°（RC 只取决于 C̄'）
+    · ΔC'² + ΔH'² = (1+G)²Δa² + Δb² ≥ Δa² + Δb²
+    · T ≤ 1.93，故 SH ≤ 1 + 0.015·1.93·C̄'
+    · SL 随 |L̄ - 50| 递增；C' ≤ 1.5·C，候选色度不超过 min(Cq + d, 调色板最大色度)
+两项分别给出 |ΔL| 与 |Δab|（a-b 平面上的 ΔE76）的下界斜率，当前最优值 best
+即对应一个扁的 LAB 盒子：盒子外的颜色不可能更近。盒子内的候选再用逐对下界
+（精确的 SL、SC、G、RC，不含三角函数）过滤一次，最后才计算完整的 CIEDE2000。
+
+用法：
+    python3 color_naming.py '#ff6600' '#3366cc'      # 命名若干颜色
+    python3 color_naming.py --check 2000             # 与暴力扫描对照并测吞吐量
+"""
+
+import argparse
+import re
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from build_palette import load_palette
+from color_space import ciede2000, hex_to_rgb, rgb8_to_lab
+
+# 网格单元边长（ΔE76）
+CELL_SIZE = 6.0
+
+# 每组同时计算的查询数上限（控制 查询 × 候选 矩阵的大小）
+MAX_GROUP = 256
+
+# 最近色差超过该值时改用描述性名称（与 ColorNameResolver 一致）
+DESCRIPTIVE_THRESHOLD = 20.0
+
+# 下界中的常数：|RT|/2 ≤ RC·sin 60°/2，T ≤ 1.93
+_RT_SIN = np.sqrt(3.0) / 4.0
+_T_MAX = 1.0 + 0.17 + 0.24 + 0.32 + 0.20
+
+# 求搜索半径时使用的 ΔE76 距离网格（相邻点相差约 4%，上限覆盖整个 LAB 空间）
+_DISTANCE_GRID = np.concatenate([[0.0], np.geomspace(0.01, 1000.0, 300)])
+
+_LETTERS_RE = re.compile(r'[^\W\d_]+')
+
+def _sl(deviation: np.ndarray) -> np.ndarray:
+    """|L̄ - 50| 对应的 SL"""
+    squared = deviation * deviation
+    return 1.0 + 0.015 * squared / np.sqrt(20.0 + squared)
+
+class NameEngine:
+    """
+    调色板上的批量最近色查询
+
+    Args:
+        lab: 调色板 LAB，(N, 3)
+        names: 调色板名称（只在需要返回名称时使用）
+        cell_size: 网格单元边长（ΔE76）
+        kL, kC, kH: CIEDE2000 权重
+    """
+
+    def __init__(self, lab: np.ndarray, names: Optional[Sequence[str]] = None,
+                 cell_size: float = CELL_SIZE, kL: float = 1.0, kC: float = 1.0, kH: float = 1.0):
+        self.lab = np.asarray(lab, dtype=np.float64)
+        self.names = names
+        self.cell_size = cell_size
+        self.kL, self.kC, self.kH = kL, kC, kH
+
+        self._l_deviation = np.abs(self.lab[:, 0] - 50.0).max()
+        self._max_chroma = np.hypot(self.lab[:, 1], self.lab[:, 2]).max()
+
+        # 均匀网格：按单元编号排序的下标 + 每个单元在其中的起止位置
+        self._origin = self.lab.min(axis=0)
+        cells = np.floor((self.lab - self._origin) / cell_size).astype(np.int64)
+        self._dims = cells.max(axis=0) + 1
+        flat = self._flatten(cells)
+        self._order = np.argsort(flat, kind='stable')
+        self._cell_start = np.searchsorted(flat[self._order], np.arange(self._dims.prod() + 1))
+
+    @classmethod
+    def from_palette(cls, palette, **kwargs) -> 'NameEngine':
+        """由 build_palette 生成的二进制调色板构建"""
+        return cls(palette.lab, palette, **kwargs)
+
+    def _flatten(self, cells: np.ndarray) -> np.ndarray:
+        _, nj, nk = self._dims
+        return (cells[..., 0] * nj + cells[..., 1]) * nk + cells[..., 2]
+
+    def _cell_of(self, lab: np.ndarray) -> np.ndarray:
+        cells = np.floor((lab - self._origin) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, self._dims - 1)
+
+    def _gather(self, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+        """与 LAB 立方体 [lo, hi] 相交的所有网格单元中的调色板下标"""
+        c0 = self._cell_of(lo)
+        c1 = self._cell_of(hi)
+        i, j = np.meshgrid(np.arange(c0[0], c1[0] + 1), np.arange(c0[1], c1[1] + 1), indexing='ij')
+        base = (i.ravel() * self._dims[1] + j.ravel()) * self._dims[2]
+        starts = self._cell_start[base + c0[2]]
+        ends = self._cell_start[base + c1[2] + 1]
+        slices = [self._order[s:e] for s, e in zip(starts, ends) if e > s]
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(slices)
+
+    def _slopes(self, queries: np.ndarray, distance: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        分量下界斜率：|ΔL| = d 时 ΔE00 ≥ d·mL(d)，|Δab| = d 时 ΔE00 ≥ d·mab(d)
+
+        mL、mab 都随 d 单调不增。
+
+        Returns:
+            两个 (查询数, len(distance)) 数组
+        """
+        l_query = np.abs(queries[:, 0] - 50.0)[:, None]
+        chroma = np.hypot(queries[:, 1], queries[:, 2])[:, None]
+
+        # |L̄ - 50| ≤ (|Lq - 50| + |Lp - 50|) / 2
+        l_deviation = 0.5 * (l_query + np.minimum(l_query + distance, self._l_deviation))
+        slope_l = 1.0 / (self.kL * _sl(l_deviation))
+
+        # C̄' ≤ 1.5·(Cq + Cp) / 2，Cp ≤ min(Cq + d, 调色板最大色度)
+        cbar = 0.75 * (chroma + np.minimum(chroma + distance, self._max_chroma))
+        cbar7 = cbar ** 7
+        rc = 2.0 * np.sqrt(cbar7 / (cbar7 + 25.0 ** 7))
+        weight = np.maximum(self.kC * (1.0 + 0.045 * cbar),
+                            self.kH * (1.0 + 0.015 * _T_MAX * cbar))
+        slope_ab = np.sqrt(1.0 - rc * _RT_SIN) / weight
+        return slope_l, slope_ab
+
+    @staticmethod
+    def _grid_radius(best: np.ndarray, slope: np.ndarray) -> np.ndarray:
+        """
+        满足 d·m(d) ≤ best 的最大距离的上界
+
+        在距离网格的每个区间 [d_i, d_i+1] 上，d·m(d) ≥ d_i·m(d_i+1)；
+        取最后一个下界不超过 best 的区间右端点。
+        """
+        lower = _DISTANCE_GRID[:-1] * slope[:, 1:]
+        reachable = lower <= best[:, None]
+        last = reachable.shape[1] - 1 - np.argmax(reachable[:, ::-1], axis=1)
+        radius = np.where(reachable.any(axis=1), _DISTANCE_GRID[last + 1], 0.0)
+        # 留出浮点余量，保证不会漏掉并列或临界的候选
+        return radius * (1.0 + 1e-9) + 1e-9
+
+    def _radius(self, best: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """
+        ΔE00 ≤ best 的候选必然落在以查询为中心、半边长为返回值的 LAB 盒子内
+
+        ΔE00 ≥ |ΔL|/(kL·SL) 与 ΔE00 ≥ √(1 - |RT|/2)·|Δab|/max(kC·SC, kH·SH) 分别成立，
+        因此亮度与色度方向各有一个半径；ΔE00 对色度差更宽容，盒子通常是扁的。
+
+        Returns:
+            (查询数, 3) 数组：ΔL、Δa、Δb 方向的半边长
+        """
+        slope_l, slope_ab = self._slopes(queries, _DISTANCE_GRID)
+        radius_l = self._grid_radius(best, slope_l)
+        radius_ab = self._grid_radius(best, slope_ab)
+        return np.stack([radius_l, radius_ab, radius_ab], axis=1)
+
+    def _pair_bound(self, q: np.ndarray, p: np.ndarray) -> np.ndarray:
+        """
+        逐对的 ΔE00 下界（按 NumPy 规则广播；不含三角函数，比完整 CIEDE2000 便宜得多）
+
+        用精确的 SL、SC、G、RC，只把 T 与 RT 的色相项换成上界。
+        """
+        C1 = np.hypot(q[..., 1], q[..., 2])
+        C2 = np.hypot(p[..., 1], p[..., 2])
+        Cbar7 = ((C1 + C2) / 2.0) ** 7
+        scale = 1.5 - 0.5 * np.sqrt(Cbar7 / (Cbar7 + 25.0 ** 7))    # 1 + G
+        C1_prime = np.hypot(scale * q[..., 1], q[..., 2])
+        C2_prime = np.hypot(scale * p[..., 1], p[..., 2])
+        Cbar_prime = (C1_prime + C2_prime) / 2.0
+        Cbar_prime7 = Cbar_prime ** 7
+        rc = 2.0 * np.sqrt(Cbar_prime7 / (Cbar_prime7 + 25.0 ** 7))
+
+        Lbar_sq = ((q[..., 0] + p[..., 0]) / 2.0 - 50.0) ** 2
+        SL = 1.0 + (0.015 * Lbar_sq) / np.sqrt(20.0 + Lbar_sq)
+        weight = np.maximum(self.kC * (1.0 + 0.045 * Cbar_prime),
+                            self.kH * (1.0 + 0.015 * _T_MAX * Cbar_prime))
+
+        term_l = (p[..., 0] - q[..., 0]) / (self.kL * SL)
+        chroma_sq = (scale * (p[..., 1] - q[..., 1])) ** 2 + (p[..., 2] - q[..., 2]) ** 2
+        return np.sqrt(term_l * term_l + (1.0 - rc * _RT_SIN) * chroma_sq / (weight * weight))
+
+    def _deltas(self, queries: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        return ciede2000(queries[:, None, :], self.lab[candidates][None, :, :],
+                         self.kL, self.kC, self.kH)
+
+    @staticmethod
+    def _select(deltas: np.ndarray, candidates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """每个查询的最小色差；并列时取调色板下标最小者（与线性扫描一致）"""
+        best = deltas.min(axis=1)
+        index = np.where(deltas == best[:, None], candidates[None, :], np.iinfo(np.int64).max)
+        return index.min(axis=1), best
+
+    def _survivors(self, queries: np.ndarray, candidates: np.ndarray, radius: np.ndarray,
+                   limit: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        可能满足 ΔE00 ≤ limit 的 (查询, 候选) 对
+
+        先用每个查询自己的搜索盒子做廉价的坐标比较，再对盒内的对计算逐对下界。
+        """
+        offset = np.abs(self.lab[candidates][None, :, :] - queries[:, None, :])
+        rows, cols = np.nonzero((offset <= radius[:, None, :]).all(axis=2))
+        bound = self._pair_bound(queries[rows], self.lab[candidates[cols]])
+        keep = bound <= limit[rows] * (1.0 + 1e-9) + 1e-9
+        return rows[keep], cols[keep]
+
+    def _refine(self, queries: np.ndarray, candidates: np.ndarray, radius: np.ndarray,
+                upper: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """只对可能不超过当前最优值的 (查询, 候选) 计算精确 CIEDE2000"""
+        rows, cols = self._survivors(queries, candidates, radius, upper)
+        deltas = ciede2000(queries[rows], self.lab[candidates[cols]], self.kL, self.kC, self.kH)
+
+        best = np.full(len(queries), np.inf)
+        np.minimum.at(best, rows, deltas)
+        tied = deltas == best[rows]
+        index = np.full(len(queries), np.iinfo(np.int64).max)
+        np.minimum.at(index, rows[tied], candidates[cols[tied]])
+        return index, best
+
+    def _search_group(self, queries: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        lo = queries.min(axis=0)
+        hi = queries.max(axis=0)
+
+        # 先取邻近单元得到当前最优值（为空时逐步扩大）
+        margin = self.cell_size
+        candidates = self._gather(lo - margin, hi + margin)
+        while len(candidates) == 0:
+            margin *= 2
+            candidates = self._gather(lo - margin, hi + margin)
+        _, upper = self._select(self._deltas(queries, candidates), candidates)
+
+        # 由当前最优值得到搜索半径，取半径内的全部候选，再按逐对下界筛选后精确计算
+        radius = self._radius(upper, queries)
+        search_lo = (queries - radius).min(axis=0)
+        search_hi = (queries + radius).max(axis=0)
+        candidates = self._gather(search_lo, search_hi)
+        return self._refine(queries, candidates, radius, upper)
+
+    def nearest(self, lab: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        批量查询最近的调色板颜色
+
+        Args:
+            lab: 查询颜色 LAB，(N, 3)
+
+        Returns:
+            (调色板下标 (N,), CIEDE2000 色差 (N,))
+        """
+        lab = np.asarray(lab, dtype=np.float64).reshape(-1, 3)
+        unique, inverse = np.unique(lab, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        index = np.empty(len(unique), dtype=np.int64)
+        delta = np.empty(len(unique))
+        for members in self._groups(unique):
+            index[members], delta[members] = self._search_group(unique[members])
+        return index[inverse], delta[inverse]
+
+    def neighbors(self, lab: np.ndarray, threshold: float,
+                  chunk: int = 4096) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        批量范围查询：与每个查询的 CIEDE2000 色差不超过 threshold 的全部调色板颜色
+
+        阈值固定，每个查询的搜索盒子事先可知，因此不按单元分组，而是对整批查询同时
+        展开候选：网格中 (i, j) 相同、k 连续的单元在排序下标中是连续的一段。
+
+        Returns:
+            (查询下标, 调色板下标, 色差)，三个等长数组，按查询下标、调色板下标排序
+        """
+        lab = np.asarray(lab, dtype=np.float64).reshape(-1, 3)
+        _, nj, nk = self._dims
+        rows, cols, deltas = [], [], []
+        for start in range(0, len(lab), chunk):
+            queries = lab[start:start + chunk]
+            limit = np.full(len(queries), float(threshold))
+            radius = self._radius(limit, queries)
+            c0 = self._cell_of(queries - radius)
+            c1 = self._cell_of(queries + radius)
+            span = c1 - c0
+
+            for di in range(span[:, 0].max() + 1):
+                for dj in range(span[:, 1].max() + 1):
+                    active = np.flatnonzero((span[:, 0] >= di) & (span[:, 1] >= dj))
+                    base = ((c0[active, 0] + di) * nj + c0[active, 1] + dj) * nk
+                    first = self._cell_start[base + c0[active, 2]]
+                    counts = self._cell_start[base + c1[active, 2] + 1] - first
+                    r = np.repeat(active, counts)
+                    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+                    c = self._order[np.repeat(first, counts) + offsets]
+
+                    # 盒子 → 逐对下界 → 精确 CIEDE2000
+                    q, p = queries[r], self.lab[c]
+                    inside = (np.abs(p - q) <= radius[r]).all(axis=1)
+                    r, c, q, p = r[inside], c[inside], q[inside], p[inside]
+                    possible = self._pair_bound(q, p) <= threshold * (1.0 + 1e-9) + 1e-9
+                    r, c = r[possible], c[possible]
+                    d = ciede2000(q[possible], p[possible], self.kL, self.kC, self.kH)
+                    keep = d <= threshold
+                    rows.append(r[keep] + start)
+                    cols.append(c[keep])
+                    deltas.append(d[keep])
+
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+        rows, cols, deltas = np.concatenate(rows), np.concatenate(cols), np.concatenate(deltas)
+        order = np.lexsort((cols, rows))
+        return rows[order], cols[order], deltas[order]
+
+    def _groups(self, lab: np.ndarray):
+        """按网格单元分组（同一单元内的查询共享候选集），每组不超过 MAX_GROUP 个"""
+        cell_ids = self._flatten(self._cell_of(lab))
+        order = np.argsort(cell_ids, kind='stable')
+        boundaries = np.flatnonzero(np.diff(cell_ids[order])) + 1
+        for group in np.split(order, boundaries):
+            for start in range(0, len(group), MAX_GROUP):
+                yield group[start:start + MAX_GROUP]
+
+    def brute_force(self, lab: np.ndarray, chunk: int = 64) -> Tuple[np.ndarray, np.ndarray]:
+        """逐个比较整个调色板（对照用，等价于 ColorNameResolver 的线性扫描）"""
+        lab = np.asarray(lab, dtype=np.float64).reshape(-1, 3)
+        everything = np.arange(len(self.lab))
+        index = np.empty(len(lab), dtype=np.int64)
+        delta = np.empty(len(lab))
+        for start in range(0, len(lab), chunk):
+            queries = lab[start:start + chunk]
+            index[start:start + chunk], delta[start:start + chunk] = self._select(
+                self._deltas(queries, everything), everything)
+        return index, delta
+
+    def color_names(self, lab: np.ndarray) -> List[str]:
+        """批量版 getColorName：色差超过阈值时生成描述性名称"""
+        lab = np.asarray(lab, dtype=np.float64).reshape(-1, 3)
+        index, delta = self.nearest(lab)
+        results = []
+        for color, i, d in zip(lab, index, delta):
+            name = self._name(i)
+            if d > DESCRIPTIVE_THRESHOLD:
+                name = descriptive_name(color, name)
+            results.append(name)
+        return results
+
+    def _name(self, index: int) -> str:
+        if hasattr(self.names, 'name'):
+            return self.names.name(int(index))
+        return self.names[int(index)]
+
+def _sanitized_words(text: str) -> str:
+    return ' '.join(_LETTERS_RE.findall(text))
+
+def descriptive_name(lab: Sequence[float], base_name: str) -> str:
+    """与 ColorNameResolver.generateDescriptiveName 相同的描述性名称"""
+    L, a, b = (float(v) for v in lab)
+
+    hue_modifier = ""
+    if abs(a) > 10 or abs(b) > 10:
+        if b > 15 and abs(a) < 10:
+            hue_modifier = "yellowish"
+        elif b < -15 and abs(a) < 10:
+            hue_modifier = "bluish"
+        elif a > 15 and abs(b) < 10:
+            hue_modifier = "reddish"
+        elif a < -15 and abs(b) < 10:
+            hue_modifier = "greenish"
+        elif a > 10 and b > 10:
+            hue_modifier = "orangish"
+        elif a < -10 and b > 10:
+            hue_modifier = "lime"
+        elif a < -10 and b < -10:
+            hue_modifier = "teal"
+        elif a > 10 and b < -10:
+            hue_modifier = "purplish"
+
+    if L < 20:
+        lightness_modifier = "very dark"
+    elif L < 40:
+        lightness_modifier = "dark"
+    elif L > 80:
+        lightness_modifier = "very light"
+    elif L > 60:
+        lightness_modifier = "light"
+    else:
+        lightness_modifier = ""
+
+    components = [lightness_modifier, hue_modifier, _sanitized_words(base_name)]
+    sanitized = _sanitized_words(' '.join(c for c in components if c))
+    return sanitized or "color"
+
+def self_check(engine: NameEngine, count: int, seed: int = 42):
+    """随机查询（一半取自调色板本身）与暴力扫描对照，并输出吞吐量"""
+    rng = np.random.default_rng(seed)
+    random_rgb = rng.integers(0, 256, size=(count - count // 2, 3))
+    palette_rgb = np.asarray(engine.names.rgb)[rng.integers(0, len(engine.lab), size=count // 2)]
+    queries = rgb8_to_lab(np.vstack([random_rgb, palette_rgb]))
+
+    t0 = time.perf_counter()
+    index, delta = engine.nearest(queries)
+    indexed = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    expected_index, expected_delta = engine.brute_force(queries)
+    brute = time.perf_counter() - t0
+
+    mismatches = int(np.count_nonzero((index != expected_index) | (delta != expected_delta)))
+    print(f"📊 {count:,} 个查询，调色板 {len(engine.lab):,} 色")
+    print(f"   网格索引: {indexed:.3f} s（{count / indexed:,.0f} 查询/秒）")
+    print(f"   暴力扫描: {brute:.3f} s（{count / brute:,.0f} 查询/秒）")
+    print(f"   加速比: {brute / indexed:.1f}x")
+    if mismatches:
+        print(f"❌ 与暴力扫描不一致: {mismatches} 个")
+        raise SystemExit(1)
+    print("✅ 结果与暴力扫描完全一致")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='批量颜色命名（LAB 网格索引 + CIEDE2000）')
+    parser.add_argument('colors', nargs='*', help="要命名的颜色（#rrggbb）")
+    parser.add_argument('--check', type=int, metavar='N',
+                        help='用 N 个随机查询与暴力扫描对照，并输出吞吐量')
+    args = parser.parse_args(argv)
+
+    engine = NameEngine.from_palette(load_palette())
+
+    if args.check:
+        self_check(engine, args.check)
+        return
+
+    if not args.colors:
+        parser.error('请提供要命名的颜色，或使用 --check')
+
+    lab = rgb8_to_lab(hex_to_rgb(args.colors))
+    index, delta = engine.nearest(lab)
+    for hex_color, name, i, d in zip(args.colors, engine.color_names(lab), index, delta):
+        print(f"{hex_color} → {name}  (最近: {engine.names.name(int(i))} {engine.names.hex(int(i))}, ΔE00 = {d:.2f})")
+
+if __name__ == '__main__':
+    main()
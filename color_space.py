@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+颜色空间转换（NumPy 向量化版）
+
+与 Project_Color/Services/ColorConversion/ColorSpaceConverter.swift 使用相同的
+sRGB 伽马、D65 转换矩阵与白点，输入输出均为 (..., 3) 数组（CMYK 为 (..., 4)），
+可一次处理整批颜色或整幅图像。
+
+    sRGB ↔ XYZ ↔ Lab ↔ LCh
+    sRGB ↔ HSL / HSV / CMYK
+    ciede2000：可广播的成对 CIEDE2000 色差
+
+RGB 一律为 0-1 浮点数，色相为角度（0-360）；内部按 float64 计算。
+与 App 结果的一致性由 benchmark_color_space.py --check 核对。
+"""
+
+from typing import Iterable, Tuple
+
+import numpy as np
+
+# 线性 sRGB → XYZ（D65 白点）
+SRGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+
+# 线性 sRGB ← XYZ（ColorSpaceConverter.xyzToRGB 使用的系数）
+XYZ_TO_SRGB = np.array([
+    [3.2404542, -1.5371385, -0.4985314],
+    [-0.9692660, 1.8760108, 0.0415560],
+    [0.0556434, -0.2040259, 1.0572252],
+])
+
+# D65 白点参考值
+WHITE_D65 = np.array([0.95047, 1.00000, 1.08883])
+
+# LAB f(t) 函数的分段点
+_DELTA = 6.0 / 29.0
+
+def hex_to_rgb(hex_colors: Iterable[str]) -> np.ndarray:
+    """'#rrggbb' 字符串 → (N, 3) uint8 数组"""
+    values = np.array([int(h.strip().lstrip('#'), 16) for h in hex_colors], dtype=np.uint32)
+    rgb = np.empty((len(values), 3), dtype=np.uint8)
+    rgb[:, 0] = values >> 16
+    rgb[:, 1] = (values >> 8) & 0xFF
+    rgb[:, 2] = values & 0xFF
+    return rgb
+
+def srgb_to_linear(rgb: np.ndarray) -> np.ndarray:
+    """sRGB (0-1) → 线性 RGB（伽马解码）"""
+    rgb = np.asarray(rgb, dtype=np.float64)
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+def linear_to_srgb(linear: np.ndarray) -> np.ndarray:
+    """线性 RGB → sRGB (0-1)（伽马编码，不裁剪）"""
+    linear = np.asarray(linear, dtype=np.float64)
+    encoded = 1.055 * np.power(np.maximum(linear, 0.0031308), 1.0 / 2.4) - 0.055
+    return np.where(linear <= 0.0031308, 12.92 * linear, encoded)
+
+def rgb_to_xyz(rgb: np.ndarray) -> np.ndarray:
+    """sRGB (0-1) → XYZ (D65)"""
+    return srgb_to_linear(rgb) @ SRGB_TO_XYZ.T
+
+def xyz_to_rgb(xyz: np.ndarray) -> np.ndarray:
+    """XYZ (D65) → sRGB（不裁剪，色域外的分量可能超出 0-1）"""
+    return linear_to_srgb(np.asarray(xyz, dtype=np.float64) @ XYZ_TO_SRGB.T)
+
+def _lab_f(t: np.ndarray) -> np.ndarray:
+    return np.where(t > _DELTA ** 3, np.cbrt(t), t / (3.0 * _DELTA * _DELTA) + 4.0 / 29.0)
+
+def xyz_to_lab(xyz: np.ndarray) -> np.ndarray:
+    """XYZ → CIE LAB (D65)"""
+    f = _lab_f(np.asarray(xyz, dtype=np.float64) / WHITE_D65)
+    lab = np.empty_like(f)
+    lab[..., 0] = 116.0 * f[..., 1] - 16.0
+    lab[..., 1] = 500.0 * (f[..., 0] - f[..., 1])
+    lab[..., 2] = 200.0 * (f[..., 1] - f[..., 2])
+    return lab
+
+def _lab_f_inverse(t: np.ndarray) -> np.ndarray:
+    return np.where(t > _DELTA, t * t * t, 3.0 * _DELTA * _DELTA * (t - 4.0 / 29.0))
+
+def lab_to_xyz(lab: np.ndarray) -> np.ndarray:
+    """CIE LAB (D65) → XYZ"""
+    lab = np.asarray(lab, dtype=np.float64)
+    f = np.empty_like(lab)
+    f[..., 1] = (lab[..., 0] + 16.0) / 116.0
+    f[..., 0] = lab[..., 1] / 500.0 + f[..., 1]
+    f[..., 2] = f[..., 1] - lab[..., 2] / 200.0
+    return _lab_f_inverse(f) * WHITE_D65
+
+def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """sRGB (0-1) → CIE LAB (D65)"""
+    return xyz_to_lab(rgb_to_xyz(rgb))
+
+# 8 位通道值 → 线性 RGB
+_LINEAR_LUT = srgb_to_linear(np.arange(256) / 255.0)
+
+def rgb8_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """8 位 sRGB (0-255) → CIE LAB (D65)"""
+    rgb = np.asarray(rgb)
+    if rgb.dtype == np.uint8:
+        # 只有 256 种取值，伽马解码直接查表
+        return xyz_to_lab(_LINEAR_LUT[rgb] @ SRGB_TO_XYZ.T)
+    return rgb_to_lab(rgb.astype(np.float64) / 255.0)
+
+def lab_to_rgb(lab: np.ndarray) -> np.ndarray:
+    """CIE LAB (D65) → sRGB (0-1)，与 labToRgb 一样裁剪到 [0, 1]"""
+    return np.clip(xyz_to_rgb(lab_to_xyz(lab)), 0.0, 1.0)
+
+def lab_to_lch(lab: np.ndarray) -> np.ndarray:
+    """CIE LAB → LCh（h 为角度 0-360；a = b = 0 时为 0）"""
+    lab = np.asarray(lab, dtype=np.float64)
+    lch = np.empty_like(lab)
+    lch[..., 0] = lab[..., 0]
+    lch[..., 1] = np.hypot(lab[..., 1], lab[..., 2])
+    lch[..., 2] = _hue_prime(lab[..., 1], lab[..., 2])
+    return lch
+
+def lch_to_lab(lch: np.ndarray) -> np.ndarray:
+    """LCh → CIE LAB"""
+    lch = np.asarray(lch, dtype=np.float64)
+    hue = np.radians(lch[..., 2])
+    lab = np.empty_like(lch)
+    lab[..., 0] = lch[..., 0]
+    lab[..., 1] = lch[..., 1] * np.cos(hue)
+    lab[..., 2] = lch[..., 1] * np.sin(hue)
+    return lab
+
+def _rgb_hue(rgb: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """rgbToHSL / rgbToHSV 共用的色相计算，返回 (色相, 最大分量, 最小分量, 差值)"""
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    max_c = rgb.max(axis=-1)
+    min_c = rgb.min(axis=-1)
+    delta = max_c - min_c
+    safe = np.where(delta != 0.0, delta, 1.0)
+
+    # 与 Swift 的判断顺序一致：先比较 r，再比较 g
+    hue = np.where(max_c == r, 60.0 * np.fmod((g - b) / safe, 6.0),
+                   np.where(max_c == g, 60.0 * ((b - r) / safe + 2.0),
+                            60.0 * ((r - g) / safe + 4.0)))
+    hue = np.where(delta != 0.0, hue, 0.0)
+    return np.where(hue < 0.0, hue + 360.0, hue), max_c, min_c, delta
+
+# 六个色相扇区中 (r, g, b) 分别取 (c, x, 0) 中的哪一个；其余角度（含负数）归入最后一个扇区
+_SECTOR_COMPONENTS = np.array([
+    [0, 1, 2],
+    [1, 0, 2],
+    [2, 0, 1],
+    [2, 1, 0],
+    [1, 2, 0],
+    [0, 2, 1],
+])
+
+def _hue_to_rgb(hue: np.ndarray, c: np.ndarray, m: np.ndarray) -> np.ndarray:
+    """hslToRgb / hsvToRgb 共用的按色相扇区组合分量"""
+    x = c * (1.0 - np.abs(np.fmod(hue / 60.0, 2.0) - 1.0))
+    in_range = (hue >= 0.0) & (hue < 360.0)
+    sector = np.where(in_range, np.floor(np.where(in_range, hue, 0.0) / 60.0), 5).astype(np.intp)
+    components = np.stack([c, x, np.zeros_like(c)], axis=-1)
+    rgb = np.take_along_axis(components, _SECTOR_COMPONENTS[sector], axis=-1)
+    return rgb + m[..., None]
+
+def rgb_to_hsl(rgb: np.ndarray) -> np.ndarray:
+    """sRGB (0-1) → HSL，(..., 3) 依次为 h（角度）、s、l"""
+    rgb = np.asarray(rgb, dtype=np.float64)
+    hue, max_c, min_c, delta = _rgb_hue(rgb)
+    lightness = (max_c + min_c) / 2.0
+    denominator = 1.0 - np.abs(2.0 * lightness - 1.0)
+    saturation = np.where(delta != 0.0, delta / np.where(delta != 0.0, denominator, 1.0), 0.0)
+    return np.stack([hue, saturation, lightness], axis=-1)
+
+def hsl_to_rgb(hsl: np.ndarray) -> np.ndarray:
+    """HSL → sRGB (0-1)"""
+    hsl = np.asarray(hsl, dtype=np.float64)
+    h, s, l = hsl[..., 0], hsl[..., 1], hsl[..., 2]
+    c = (1.0 - np.abs(2.0 * l - 1.0)) * s
+    return _hue_to_rgb(h, c, l - c / 2.0)
+
+def rgb_to_hsv(rgb: np.ndarray) -> np.ndarray:
+    """sRGB (0-1) → HSV，(..., 3) 依次为 h（角度）、s、v"""
+    rgb = np.asarray(rgb, dtype=np.float64)
+    hue, max_c, _, delta = _rgb_hue(rgb)
+    saturation = np.where(max_c == 0.0, 0.0, delta / np.where(max_c == 0.0, 1.0, max_c))
+    return np.stack([hue, saturation, max_c], axis=-1)
+
+def hsv_to_rgb(hsv: np.ndarray) -> np.ndarray:
+    """HSV → sRGB (0-1)"""
+    hsv = np.asarray(hsv, dtype=np.float64)
+    h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    c = v * s
+    return _hue_to_rgb(h, c, v - c)
+
+def rgb_to_cmyk(rgb: np.ndarray) -> np.ndarray:
+    """sRGB (0-1) → CMYK，(..., 4)；近乎纯黑（k ≥ 0.99999）时为 (0, 0, 0, 1)"""
+    rgb = np.asarray(rgb, dtype=np.float64)
+    k = 1.0 - rgb.max(axis=-1)
+    black = k >= 0.99999
+    scale = np.where(black, 1.0, 1.0 - k)
+    cmy = (1.0 - rgb - k[..., None]) / scale[..., None]
+    cmy = np.where(black[..., None], 0.0, cmy)
+    return np.concatenate([cmy, np.where(black, 1.0, k)[..., None]], axis=-1)
+
+def cmyk_to_rgb(cmyk: np.ndarray) -> np.ndarray:
+    """CMYK → sRGB (0-1)"""
+    cmyk = np.asarray(cmyk, dtype=np.float64)
+    return (1.0 - cmyk[..., :3]) * (1.0 - cmyk[..., 3:4])
+
+def _hue_prime(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """色相角 h'（度，0-360）；a = b = 0 时为 0"""
+    hue = np.degrees(np.arctan2(b, a))
+    return np.where(hue < 0.0, hue + 360.0, hue)
+
+def ciede2000(lab1: np.ndarray, lab2: np.ndarray,
+              kL: float = 1.0, kC: float = 1.0, kH: float = 1.0) -> np.ndarray:
+    """
+    CIEDE2000 色差 ΔE00（按 NumPy 规则广播）
+
+    逐步对应 ColorSpaceConverter.deltaE；与 App 一致，C1'·C2' = 0 时 Δh' 与 H̄' 取 0。
+    """
+    lab1 = np.asarray(lab1, dtype=np.float64)
+    lab2 = np.asarray(lab2, dtype=np.float64)
+    L1, a1, b1 = lab1[..., 0], lab1[..., 1], lab1[..., 2]
+    L2, a2, b2 = lab2[..., 0], lab2[..., 1], lab2[..., 2]
+
+    C1 = np.hypot(a1, b1)
+    C2 = np.hypot(a2, b2)
+    Cbar7 = ((C1 + C2) / 2.0) ** 7
+    G = 0.5 * (1.0 - np.sqrt(Cbar7 / (Cbar7 + 25.0 ** 7)))
+
+    a1_prime = (1.0 + G) * a1
+    a2_prime = (1.0 + G) * a2
+    C1_prime = np.hypot(a1_prime, b1)
+    C2_prime = np.hypot(a2_prime, b2)
+    h1_prime = _hue_prime(a1_prime, b1)
+    h2_prime = _hue_prime(a2_prime, b2)
+
+    deltaL_prime = L2 - L1
+    deltaC_prime = C2_prime - C1_prime
+
+    chroma_product = C1_prime * C2_prime
+    nonzero = chroma_product != 0.0
+    diff = h2_prime - h1_prime
+    deltah_prime = np.where(diff > 180.0, diff - 360.0, np.where(diff < -180.0, diff + 360.0, diff))
+    deltah_prime = np.where(nonzero, deltah_prime, 0.0)
+    deltaH_prime = 2.0 * np.sqrt(chroma_product) * np.sin(np.radians(deltah_prime / 2.0))
+
+    Lbar_prime = (L1 + L2) / 2.0
+    Cbar_prime = (C1_prime + C2_prime) / 2.0
+
+    hue_sum = h1_prime + h2_prime
+    Hbar_prime = np.where(np.abs(diff) <= 180.0, hue_sum / 2.0,
+                          np.where(hue_sum < 360.0, (hue_sum + 360.0) / 2.0, (hue_sum - 360.0) / 2.0))
+    Hbar_prime = np.where(nonzero, Hbar_prime, 0.0)
+
+    T = (1.0 - 0.17 * np.cos(np.radians(Hbar_prime - 30.0))
+         + 0.24 * np.cos(np.radians(2.0 * Hbar_prime))
+         + 0.32 * np.cos(np.radians(3.0 * Hbar_prime + 6.0))
+         - 0.20 * np.cos(np.radians(4.0 * Hbar_prime - 63.0)))
+
+    Lbar_sq = (Lbar_prime - 50.0) ** 2
+    SL = 1.0 + (0.015 * Lbar_sq) / np.sqrt(20.0 + Lbar_sq)
+    SC = 1.0 + 0.045 * Cbar_prime
+    SH = 1.0 + 0.015 * Cbar_prime * T
+
+    deltaTheta = 30.0 * np.exp(-((Hbar_prime - 275.0) / 25.0) ** 2)
+    Cbar_prime7 = Cbar_prime ** 7
+    RC = 2.0 * np.sqrt(Cbar_prime7 / (Cbar_prime7 + 25.0 ** 7))
+    RT = -RC * np.sin(np.radians(2.0 * deltaTheta))
+
+    term1 = deltaL_prime / (kL * SL)
+    term2 = deltaC_prime / (kC * SC)
+    term3 = deltaH_prime / (kH * SH)
+    return np.sqrt(term1 * term1 + term2 * term2 + term3 * term3 + RT * term2 * term3)
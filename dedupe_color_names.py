@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+颜色名称词典去重：合并感知上无法区分的近似重复颜色
+
+用 color_naming 的 LAB 网格做范围查询，找出 CIEDE2000 色差不超过阈值的全部颜色对
+（约 3 万色的全量自连接只需数秒，不做 4.5 亿次两两比较）。
+
+去重按优先级贪心进行：good name 列有标记的行优先，其次按原始行序。每个仍未归属的
+颜色成为保留者，并吸收阈值内所有尚未归属的颜色。因此每个被删除的名称到其保留者的
+色差都不超过阈值，保留下来的颜色两两之间也都超过阈值。
+
+输出去重后的 CSV（保留行原样写出，并记录差异补丁）和“被删除 → 保留”的映射表。
+
+用法:
+    python3 dedupe_color_names.py                    # 默认阈值 ΔE00 ≤ 1.0
+    python3 dedupe_color_names.py --threshold 2.0
+    python3 dedupe_color_names.py --dry-run          # 只统计，不写文件
+"""
+
+import argparse
+import csv
+import os
+import re
+import time
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from color_cleaner import CleanResult, clean_stream
+from color_naming import NameEngine
+from color_space import hex_to_rgb, rgb8_to_lab
+
+INPUT_FILE = 'Project_Color/Resources/colornames.csv'
+
+# 去重结果放在仓库根目录的 build/ 下（Project_Color/ 是同步文件夹，放在里面会被打包进应用）；
+# 确认后再手动替换 colornames.csv
+OUTPUT_FILE = 'build/colornames_dedup.csv'
+
+MAPPING_FILE = 'build/colornames_dedup_map.csv'
+
+# 默认阈值：ΔE00 ≈ 1 大致是人眼可察觉差异的下限
+DEFAULT_THRESHOLD = 1.0
+
+# 范围查询的网格单元边长（阈值较小，单元取小一些候选更少）
+CELL_SIZE = 3.0
+
+_HEX_RE = re.compile(r'#?[0-9a-fA-F]{6}')
+
+class Entries(NamedTuple):
+    """词典中可参与去重的颜色（跳过空名称和无效色值）"""
+    rows: np.ndarray        # 行号（从 1 开始，不含表头与空行，与 clean_stream 一致）
+    names: List[str]
+    hexes: List[str]
+    good: np.ndarray        # good name 列是否有标记
+
+class Dedupe(NamedTuple):
+    """去重结论（下标均指 Entries 中的位置）"""
+    survivor: np.ndarray    # 每个颜色归属的保留者（保留者指向自己）
+    delta: np.ndarray       # 到保留者的 CIEDE2000 色差
+    pairs: int              # 阈值内的颜色对数
+
+def load_entries(input_file: str) -> Entries:
+    """读取词典中的名称、色值与 good name 标记"""
+    rows, names, hexes, good = [], [], [], []
+    with open(input_file, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError(f"空文件: {input_file}")
+        good_index = header.index('good name') if 'good name' in header else None
+        row_number = 0
+        for row in reader:
+            if not row:
+                continue
+            row_number += 1
+            if len(row) < 2:
+                continue
+            name = row[0].strip()
+            hex_color = row[1].strip()
+            if not name or not _HEX_RE.fullmatch(hex_color):
+                continue
+            rows.append(row_number)
+            names.append(name)
+            hexes.append(hex_color)
+            good.append(bool(good_index is not None and len(row) > good_index
+                             and row[good_index].strip()))
+    return Entries(np.array(rows, dtype=np.int64), names, hexes, np.array(good, dtype=bool))
+
+def find_duplicates(lab: np.ndarray, good: np.ndarray, threshold: float) -> Dedupe:
+    """
+    按 good name 优先、行序其次贪心合并阈值内的颜色
+
+    Args:
+        lab: 颜色 LAB，(N, 3)
+        good: good name 标记，(N,)
+        threshold: CIEDE2000 阈值
+
+    Returns:
+        Dedupe(保留者, 到保留者的色差, 阈值内的颜色对数)
+    """
+    count = len(lab)
+    engine = NameEngine(lab, cell_size=CELL_SIZE)
+    rows, cols, deltas = engine.neighbors(lab, threshold)
+    distinct = rows != cols
+    rows, cols, deltas = rows[distinct], cols[distinct], deltas[distinct]
+    starts = np.searchsorted(rows, np.arange(count + 1))
+
+    survivor = np.full(count, -1, dtype=np.int64)
+    delta = np.zeros(count)
+    for leader in np.lexsort((np.arange(count), ~good)):
+        if survivor[leader] >= 0:
+            continue
+        survivor[leader] = leader
+        members = cols[starts[leader]:starts[leader + 1]]
+        free = survivor[members] < 0
+        survivor[members[free]] = leader
+        delta[members[free]] = deltas[starts[leader]:starts[leader + 1]][free]
+    return Dedupe(survivor, delta, int(len(rows) // 2))
+
+def write_mapping(mapping_file: str, entries: Entries, result: Dedupe):
+    """原子写入“被删除 → 保留”映射表（按被删除颜色的行序）"""
+    tmp_path = f"{mapping_file}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['removed name', 'removed hex', 'kept name', 'kept hex', 'delta e'])
+        for i in np.flatnonzero(result.survivor != np.arange(len(result.survivor))):
+            kept = result.survivor[i]
+            writer.writerow([entries.names[i], entries.hexes[i], entries.names[kept],
+                             entries.hexes[kept], f"{result.delta[i]:.4f}"])
+    os.replace(tmp_path, mapping_file)
+
+def dedupe(input_file: str, output_file: Optional[str], mapping_file: Optional[str],
+           threshold: float = DEFAULT_THRESHOLD,
+           backup: bool = True) -> Tuple[Entries, Dedupe, Optional[CleanResult]]:
+    """
+    去重并写出结果
+
+    Args:
+        input_file: 输入CSV文件路径
+        output_file: 去重后的CSV路径（None 表示只统计不写文件）
+        mapping_file: 映射表路径（None 表示不写）
+        threshold: CIEDE2000 阈值
+        backup: 是否为输出记录差异补丁
+
+    Returns:
+        (词典颜色, 去重结论, CleanResult 或 None)
+    """
+    entries = load_entries(input_file)
+    lab = rgb8_to_lab(hex_to_rgb(entries.hexes))
+    result = find_duplicates(lab, entries.good, threshold)
+
+    if output_file is None:
+        return entries, result, None
+
+    removed = set(entries.rows[result.survivor != np.arange(len(entries.rows))].tolist())
+
+    def classify(row_number: int, record):
+        return (None,) if row_number in removed else None
+
+    for path in (output_file, mapping_file):
+        if path:
+            os.makedirs(os.path.dirname(path) or os.curdir, exist_ok=True)
+    clean_result = clean_stream(input_file, {None: output_file}, classify, backup=backup)[None]
+    if mapping_file:
+        write_mapping(mapping_file, entries, result)
+    return entries, result, clean_result
+
+def print_summary(entries: Entries, result: Dedupe, threshold: float, elapsed: float,
+                  top: int = 10):
+    """输出去重统计与最大的几个簇"""
+    count = len(entries.rows)
+    kept = result.survivor == np.arange(count)
+    removed = count - int(kept.sum())
+    sizes = np.bincount(result.survivor, minlength=count)
+    clusters = int(np.count_nonzero(sizes > 1))
+
+    print("=" * 80)
+    print(f"近似重复检测结果（ΔE00 ≤ {threshold:g}）")
+    print("=" * 80)
+    print()
+    print(f"📊 统计信息：")
+    print(f"   参与去重的颜色: {count:,}")
+    print(f"   阈值内的颜色对: {result.pairs:,}")
+    print(f"   含重复的簇: {clusters:,}")
+    print(f"   保留颜色数量: {count - removed:,}")
+    print(f"   删除颜色数量: {removed:,} ({removed / count * 100:.2f}%)")
+    print(f"   其中带 good name 标记: {int(np.count_nonzero(entries.good & ~kept)):,}")
+    print(f"   耗时: {elapsed:.2f} s")
+    print()
+
+    if clusters:
+        print(f"🔗 最大的 {min(top, clusters)} 个簇：")
+        for leader in np.argsort(-sizes, kind='stable')[:min(top, clusters)]:
+            members = np.flatnonzero((result.survivor == leader) & (np.arange(count) != leader))
+            mark = " ⭐" if entries.good[leader] else ""
+            print(f"   {entries.names[leader]} ({entries.hexes[leader]}){mark} ← {len(members)} 个")
+            for i in members[:5]:
+                print(f"      {entries.names[i]} ({entries.hexes[i]})  ΔE00 = {result.delta[i]:.2f}")
+            if len(members) > 5:
+                print("      …")
+        print()
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='颜色名称词典近似重复检测与去重')
+    parser.add_argument('input_file', nargs='?', default=INPUT_FILE, help='颜色名称 CSV 文件')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'CIEDE2000 阈值（默认 {DEFAULT_THRESHOLD:g}）')
+    parser.add_argument('-o', '--output', default=OUTPUT_FILE, help='去重后的 CSV 路径')
+    parser.add_argument('--mapping', default=MAPPING_FILE, help='“被删除 → 保留”映射表路径')
+    parser.add_argument('--no-backup', action='store_true', help='不记录差异补丁')
+    parser.add_argument('--dry-run', action='store_true', help='只统计，不写文件')
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print("颜色名称词典去重工具")
+    print("=" * 80)
+    print()
+
+    t0 = time.perf_counter()
+    entries, result, clean_result = dedupe(
+        args.input_file, None if args.dry_run else args.output,
+        None if args.dry_run else args.mapping, args.threshold, backup=not args.no_backup)
+    elapsed = time.perf_counter() - t0
+    print()
+    print_summary(entries, result, args.threshold, elapsed)
+
+    if clean_result is None:
+        print("ℹ️  --dry-run：未写出文件")
+        return
+
+    print(f"📄 去重后的词典: {args.output}（{clean_result.kept:,} 色）")
+    print(f"📄 映射表: {args.mapping}")
+    if clean_result.delta_file:
+        print(f"💾 差异备份: {clean_result.delta_file}")
+    print()
+    print("✅ 去重完成！")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ISCC-NBS 颜色类别：流式解析 iscc-nbs.xml，区间索引查询与批量分类
+
+iscc-nbs.xml 用 Munsell 坐标描述 267 个三级颜色类别：每个色相区间内，类别由若干个
+(彩度, 明度) 矩形拼成。解析时用 iterparse 逐个元素读取并随即释放，最后得到一个紧凑的
+结构：
+
+    色相区间起点（排序后的数组）      searchsorted 定位色相区间
+    明度、彩度分界（排序后的数组）    searchsorted 定位矩形网格中的格子
+    类别表 int16[色相区间, 明度格, 彩度格]
+
+查询只需三次二分查找与一次取表，不必逐个比较矩形，整批数组一次完成。
+
+Lab 输入需要先换算为 Munsell 坐标。明度按 ASTM D1535 由亮度 Y 精确反解；色相与彩度
+没有随仓库附带的 Munsell 再标定数据，这里用 CIELAB 色相角锚点分段插值、固定彩度比例
+近似，边界附近的颜色可能落入相邻类别。已有 Munsell 坐标时请直接用 classify_munsell。
+
+用法：
+    python3 iscc_nbs.py '5R 4/12' '10YR 7/2' 'N 5/'      # 按 Munsell 记号查询
+    python3 iscc_nbs.py '#ff6600' '#3366cc'              # 按颜色查询（近似换算）
+    python3 iscc_nbs.py --check                          # 校验数据并测批量分类吞吐量
+"""
+
+import argparse
+import re
+import time
+import xml.etree.ElementTree as ET
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from color_space import hex_to_rgb, lab_to_lch, lab_to_xyz, rgb8_to_lab
+
+ISCC_FILE = 'Project_Color/Resources/iscc-nbs.xml'
+
+# Munsell 色相族（与 xml 中的顺序一致：5R 为 0.00，每族 0.10）
+HUE_FAMILIES = ['R', 'YR', 'Y', 'GY', 'G', 'BG', 'B', 'PB', 'P', 'RP']
+
+# 未落入任何矩形
+NO_CATEGORY = 0
+
+# 近似换算：各主色相（5R、5YR …… 5RP）在 CIELAB 中的大致色相角（度）
+HUE_ANCHORS = [24.0, 60.0, 90.0, 117.0, 162.0, 196.0, 229.0, 276.0, 316.0, 351.0]
+
+# 近似换算：每级 Munsell 彩度约合的 CIELAB 色度（中明度附近的经验值）
+CHROMA_SCALE = 5.0
+
+_MUNSELL_RE = re.compile(r'^\s*(?:(?P<step>\d+(?:\.\d+)?)\s*(?P<family>[A-Z]{1,2})|N)\s*'
+                         r'(?P<value>\d+(?:\.\d+)?)\s*/\s*(?P<chroma>\d+(?:\.\d+)?)?\s*$')
+
+class Category(NamedTuple):
+    """一个三级颜色类别及其所属的一、二级类别"""
+    color: int
+    name: str
+    abbr: str
+    level2: Tuple[int, str]
+    level1: Tuple[int, str]
+
+class IsccNbs:
+    """
+    解析后的 ISCC-NBS 体系（只读）
+
+    Attributes:
+        categories: {三级类别编号: Category}
+        hue_starts: 色相区间起点（0-1，升序）
+        value_edges / chroma_edges: 明度、彩度分界（升序，末项为 inf）
+        table: int16[色相区间, 明度格, 彩度格] → 三级类别编号（0 表示未覆盖）
+    """
+
+    def __init__(self, categories: Dict[int, Category], hue_starts: np.ndarray,
+                 value_edges: np.ndarray, chroma_edges: np.ndarray, table: np.ndarray,
+                 overlaps: int = 0):
+        self.categories = categories
+        self.hue_starts = hue_starts
+        self.value_edges = value_edges
+        self.chroma_edges = chroma_edges
+        self.table = table
+        self.overlaps = overlaps
+
+    def classify_munsell(self, hue: np.ndarray, value: np.ndarray, chroma: np.ndarray) -> np.ndarray:
+        """
+        批量分类 Munsell 坐标
+
+        Args:
+            hue: 色相（0-1，5R 为 0，见 munsell_hue）
+            value: 明度（0-10）
+            chroma: 彩度（≥ 0）
+
+        Returns:
+            三级类别编号数组（0 表示未覆盖）
+        """
+        hue = np.mod(np.asarray(hue, dtype=np.float64), 1.0)
+        value = np.asarray(value, dtype=np.float64)
+        chroma = np.asarray(chroma, dtype=np.float64)
+        # 区间为左闭右开；小于第一个起点的色相属于跨越 0 的最后一个区间
+        h = np.searchsorted(self.hue_starts, hue, side='right') - 1
+        h = np.where(h < 0, len(self.hue_starts) - 1, h)
+        v = np.clip(np.searchsorted(self.value_edges, value, side='right') - 1,
+                    0, len(self.value_edges) - 2)
+        c = np.clip(np.searchsorted(self.chroma_edges, chroma, side='right') - 1,
+                    0, len(self.chroma_edges) - 2)
+        return self.table[h, v, c]
+
+    def classify_lab(self, lab: np.ndarray) -> np.ndarray:
+        """批量分类 CIE LAB 颜色（经 lab_to_munsell 近似换算）"""
+        munsell = lab_to_munsell(lab)
+        return self.classify_munsell(munsell[..., 0], munsell[..., 1], munsell[..., 2])
+
+    def name(self, color: int) -> str:
+        category = self.categories.get(int(color))
+        return category.name if category else ''
+
+def munsell_hue(step: float, family: str) -> float:
+    """Munsell 色相（如 2.5 与 'YR'）→ 0-1 的色相位置（5R 为 0）"""
+    return ((HUE_FAMILIES.index(family) * 10 + step - 5.0) / 100.0) % 1.0
+
+def parse_munsell(notation: str) -> Tuple[float, float, float]:
+    """'5R 4/12'、'2.5YR 7/2'、'N 5/' → (色相, 明度, 彩度)"""
+    match = _MUNSELL_RE.match(notation.upper())
+    if not match:
+        raise ValueError(f"无法解析的 Munsell 记号: {notation}")
+    value = float(match.group('value'))
+    if match.group('family') is None:
+        return 0.0, value, 0.0
+    hue = munsell_hue(float(match.group('step')), match.group('family'))
+    return hue, value, float(match.group('chroma') or 0.0)
+
+def _value_table() -> Tuple[np.ndarray, np.ndarray]:
+    """ASTM D1535：明度 V → 亮度 Y（%）"""
+    value = np.linspace(0.0, 10.0, 10001)
+    y = value * (1.1914 + value * (-0.22533 + value * (0.23352 + value * (-0.020484 + value * 0.00081939))))
+    return y, value
+
+_Y_TO_VALUE = _value_table()
+
+def lab_to_munsell(lab: np.ndarray) -> np.ndarray:
+    """
+    CIE LAB → 近似 Munsell 坐标 (..., 3)：色相（0-1）、明度、彩度
+
+    明度由 Y 按 ASTM D1535 反解；色相按 HUE_ANCHORS 在 CIELAB 色相角上分段线性插值，
+    彩度取 C*/CHROMA_SCALE。
+    """
+    lab = np.asarray(lab, dtype=np.float64)
+    y = lab_to_xyz(lab)[..., 1] * 100.0
+    value = np.interp(y, *_Y_TO_VALUE)
+
+    lch = lab_to_lch(lab)
+    anchors = np.array(HUE_ANCHORS)
+    positions = np.arange(len(anchors)) / len(anchors)
+    # 首尾各补一个锚点，使插值在 0°/360° 处连续
+    angles = np.concatenate([[anchors[-1] - 360.0], anchors, [anchors[0] + 360.0]])
+    positions = np.concatenate([[positions[-1] - 1.0], positions, [positions[0] + 1.0]])
+    hue = np.mod(np.interp(lch[..., 2], angles, positions), 1.0)
+
+    return np.stack([hue, value, lch[..., 1] / CHROMA_SCALE], axis=-1)
+
+def _amount(text: str) -> float:
+    return np.inf if text.strip() == 'INF' else float(text)
+
+def parse(path: str = ISCC_FILE) -> IsccNbs:
+    """
+    流式解析 iscc-nbs.xml
+
+    Raises:
+        ValueError: 色相区间首尾不相接，或矩形引用了未定义的分界/类别
+    """
+    categories: Dict[int, Category] = {}
+    hue_ids: Dict[str, float] = {}
+    value_edges: List[float] = []
+    chroma_edges: List[float] = []
+    hue_ranges: List[Tuple[str, str, List[Tuple[int, float, float, float, float]]]] = []
+
+    section = None
+    name_stack: List[Tuple[int, str, str]] = []
+    current_range = None
+
+    for event, element in ET.iterparse(path, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            if tag in ('names', 'hues', 'chromas', 'values', 'ranges'):
+                section = tag
+            elif tag == 'name':
+                name_stack.append((int(element.get('color')), element.get('name'), element.get('abbr')))
+            elif tag == 'hue-range':
+                current_range = (element.get('begin'), element.get('end'), [])
+                hue_ranges.append(current_range)
+            continue
+
+        if tag == 'name':
+            color, name, abbr = name_stack.pop()
+            if len(name_stack) == 2:
+                level1, level2 = name_stack[0], name_stack[1]
+                categories[color] = Category(color, name, abbr, level2[:2], level1[:2])
+        elif tag == 'amount':
+            if section == 'hues':
+                hue_ids[element.get('id')] = float(element.text)
+            elif section == 'chromas':
+                chroma_edges.append(_amount(element.text))
+            elif section == 'values':
+                value_edges.append(_amount(element.text))
+        elif tag == 'range':
+            current_range[2].append((
+                int(element.get('color')),
+                _amount(element.get('value-begin')), _amount(element.get('value-end')),
+                _amount(element.get('chroma-begin')), _amount(element.get('chroma-end')),
+            ))
+        elif tag in ('names', 'hues', 'chromas', 'values', 'ranges'):
+            section = None
+        # 已处理的元素立即释放（names 的子元素要等父元素结束）
+        if tag != 'name' or not name_stack:
+            element.clear()
+
+    value_edges = np.array(sorted(value_edges))
+    chroma_edges = np.array(sorted(chroma_edges))
+    hue_ranges.sort(key=lambda item: hue_ids[item[0]])
+    for (_, end, _), (begin, _, _) in zip(hue_ranges, hue_ranges[1:] + hue_ranges[:1]):
+        if end != begin:
+            raise ValueError(f"色相区间不连续: {end} → {begin}")
+
+    table = np.zeros((len(hue_ranges), len(value_edges) - 1, len(chroma_edges) - 1), dtype=np.int16)
+    overlaps = 0
+    for h, (_, _, blocks) in enumerate(hue_ranges):
+        for color, v0, v1, c0, c1 in blocks:
+            if color not in categories:
+                raise ValueError(f"未定义的类别编号: {color}")
+            rows = slice(_edge_index(value_edges, v0), _edge_index(value_edges, v1))
+            cols = slice(_edge_index(chroma_edges, c0), _edge_index(chroma_edges, c1))
+            cells = table[h, rows, cols]
+            overlaps += int(np.count_nonzero((cells != NO_CATEGORY) & (cells != color)))
+            cells[...] = color
+
+    hue_starts = np.array([hue_ids[begin] for begin, _, _ in hue_ranges])
+    return IsccNbs(categories, hue_starts, value_edges, chroma_edges, table, overlaps)
+
+def _edge_index(edges: np.ndarray, amount: float) -> int:
+    index = int(np.searchsorted(edges, amount))
+    if index >= len(edges) or edges[index] != amount:
+        raise ValueError(f"未在分界列表中的值: {amount}")
+    return index
+
+def check(system: IsccNbs, count: int = 1_000_000, seed: int = 42):
+    """输出数据完整性统计与批量分类吞吐量"""
+    covered = system.table != NO_CATEGORY
+    used = set(np.unique(system.table[covered]).tolist())
+    print(f"📊 ISCC-NBS 数据：")
+    print(f"   三级类别: {len(system.categories)}（矩形中出现 {len(used)} 个）")
+    print(f"   色相区间: {len(system.hue_starts)}")
+    print(f"   明度 × 彩度网格: {len(system.value_edges) - 1} × {len(system.chroma_edges) - 1}")
+    print(f"   未覆盖的格子: {int(np.count_nonzero(~covered))}")
+    print(f"   重叠的格子: {system.overlaps}")
+    print()
+
+    rng = np.random.default_rng(seed)
+    hue, value, chroma = rng.random(count), rng.uniform(0, 10, count), rng.uniform(0, 20, count)
+    t0 = time.perf_counter()
+    system.classify_munsell(hue, value, chroma)
+    munsell_time = time.perf_counter() - t0
+
+    lab = rgb8_to_lab(rng.integers(0, 256, size=(count, 3)).astype(np.uint8))
+    t0 = time.perf_counter()
+    system.classify_lab(lab)
+    lab_time = time.perf_counter() - t0
+
+    print(f"⏱️  批量分类 {count:,} 个颜色：")
+    print(f"   Munsell 坐标: {munsell_time * 1000:.1f} ms（{count / munsell_time / 1e6:.1f} M/s）")
+    print(f"   Lab（含近似换算）: {lab_time * 1000:.1f} ms（{count / lab_time / 1e6:.1f} M/s）")
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='ISCC-NBS 颜色类别查询')
+    parser.add_argument('colors', nargs='*', help="Munsell 记号（如 '5R 4/12'）或 #rrggbb")
+    parser.add_argument('--file', default=ISCC_FILE, help='iscc-nbs.xml 路径')
+    parser.add_argument('--check', action='store_true', help='校验数据并测批量分类吞吐量')
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    system = parse(args.file)
+    elapsed = time.perf_counter() - t0
+
+    if args.check:
+        print(f"✅ 解析完成: {args.file}（{elapsed * 1000:.1f} ms）")
+        print()
+        check(system)
+        return
+
+    if not args.colors:
+        parser.error('请提供要查询的颜色，或使用 --check')
+
+    for text in args.colors:
+        if text.startswith('#'):
+            lab = rgb8_to_lab(hex_to_rgb([text]))
+            hue, value, chroma = lab_to_munsell(lab)[0]
+            color = int(system.classify_lab(lab)[0])
+        else:
+            hue, value, chroma = parse_munsell(text)
+            color = int(system.classify_munsell(hue, value, chroma))
+        category = system.categories.get(color)
+        if category is None:
+            print(f"{text} → （未覆盖）")
+            continue
+        print(f"{text} → {category.color}. {category.name} ({category.abbr})  "
+              f"[{category.level2[1]} / {category.level1[1]}]  "
+              f"Munsell≈ 色相 {hue:.3f}, 明度 {value:.2f}, 彩度 {chroma:.1f}")
+
+if __name__ == '__main__':
+    main()
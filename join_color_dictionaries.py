@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+颜色词典交叉关联：colornames × XKCD × CSS × ISCC-NBS
+
+应用内有四套彼此独立的命名来源：colornames.csv、XKCDColors.swift、CSSColors.swift
+与 iscc-nbs.xml。这里从 Swift 源码中提取 XKCD 与 CSS 颜色表，各建一个 LAB 网格索引
+（color_naming.NameEngine），对 colornames.csv 的全部颜色一次批量求出：
+
+    最近的 XKCD 名称及 CIEDE2000 色差
+    最近的 CSS 名称及 CIEDE2000 色差
+    ISCC-NBS 类别（iscc_nbs 区间索引，Lab → Munsell 为近似换算）
+
+结果按列写入 .npz：每列一个数组，XKCD / CSS / ISCC-NBS 名称以字典编码存放
+（下标列 + 名称表），同时记录四个来源文件的 SHA-256，来源未变时跳过重建。
+全量词典约数秒即可完成，可在每次数据变更后重新生成。
+
+用法:
+    python3 join_color_dictionaries.py                       # 生成 build/colornames_join.npz
+    python3 join_color_dictionaries.py --csv join.csv        # 同时导出平铺的 CSV
+    python3 join_color_dictionaries.py --check               # 只检查是否过期
+"""
+
+import argparse
+import csv
+import os
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from build_palette import file_sha256
+from color_naming import NameEngine
+from color_space import hex_to_rgb, rgb8_to_lab, rgb_to_lab
+from dedupe_color_names import load_entries
+from iscc_nbs import ISCC_FILE, NO_CATEGORY, parse
+
+CSV_FILE = 'Project_Color/Resources/colornames.csv'
+
+XKCD_FILE = 'Project_Color/Resources/XKCDColors.swift'
+
+CSS_FILE = 'Project_Color/Resources/CSSColors.swift'
+
+# 关联结果只供批处理使用，放在仓库根目录的 build/ 下（Project_Color/ 是同步文件夹，放在里面会被打包进应用）
+OUTPUT_FILE = 'build/colornames_join.npz'
+
+# 关联结果的格式版本（列有增减时递增）
+VERSION = 1
+
+# XKCD / CSS 只有几百种颜色，网格单元取大一些，每个单元的查询才有足够的候选
+SOURCE_CELL_SIZE = 16.0
+
+# Swift 颜色表中的一项：("name", (r, g, b))，通道为 0-1 浮点数
+_SWIFT_COLOR_RE = re.compile(
+    r'\(\s*"((?:[^"\\]|\\.)*)"\s*,\s*\(\s*([\d.]+)\s*,\s*([\d.]+)\s*,\s*([\d.]+)\s*\)\s*\)')
+
+def load_swift_colors(swift_file: str) -> Tuple[List[str], np.ndarray]:
+    """
+    提取 Swift 源码中的颜色表
+
+    Returns:
+        (名称列表, sRGB (N, 3)，0-1)；保持源码中的顺序，重复名称原样保留
+    """
+    with open(swift_file, 'r', encoding='utf-8') as f:
+        matches = _SWIFT_COLOR_RE.findall(f.read())
+    if not matches:
+        raise ValueError(f"未找到颜色表: {swift_file}")
+    names = [name for name, *_ in matches]
+    rgb = np.array([[float(r), float(g), float(b)] for _, r, g, b in matches])
+    return names, rgb
+
+def source_hashes(csv_file: str, xkcd_file: str, css_file: str,
+                  iscc_file: str) -> np.ndarray:
+    """四个来源文件的 SHA-256（十六进制，按固定顺序）"""
+    return np.array([file_sha256(path).hex() for path in (csv_file, xkcd_file, css_file, iscc_file)])
+
+def join(csv_file: str = CSV_FILE, xkcd_file: str = XKCD_FILE, css_file: str = CSS_FILE,
+         iscc_file: str = ISCC_FILE) -> Dict[str, np.ndarray]:
+    """
+    对词典全部颜色求最近的 XKCD / CSS 名称与 ISCC-NBS 类别
+
+    Returns:
+        列名 → 数组；*_index 列是对应名称表（xkcd_names、css_names、iscc_names）的下标
+    """
+    entries = load_entries(csv_file)
+    lab = rgb8_to_lab(hex_to_rgb(entries.hexes))
+
+    columns = {
+        'version': np.array(VERSION),
+        'sources': source_hashes(csv_file, xkcd_file, css_file, iscc_file),
+        'row': entries.rows,
+        'name': np.array(entries.names),
+        'hex': np.array(entries.hexes),
+        'good': entries.good,
+    }
+
+    for key, swift_file in (('xkcd', xkcd_file), ('css', css_file)):
+        names, rgb = load_swift_colors(swift_file)
+        engine = NameEngine(rgb_to_lab(rgb), cell_size=SOURCE_CELL_SIZE)
+        index, delta = engine.nearest(lab)
+        columns[f'{key}_names'] = np.array(names)
+        columns[f'{key}_index'] = index.astype(np.int16)
+        columns[f'{key}_delta_e'] = delta.astype(np.float32)
+
+    # 类别编号本身就是名称表下标（0 为未覆盖）
+    system = parse(iscc_file)
+    iscc_names = [''] * (max(system.categories) + 1)
+    for color, category in system.categories.items():
+        iscc_names[color] = category.name
+    columns['iscc_names'] = np.array(iscc_names)
+    columns['iscc_index'] = system.classify_lab(lab).astype(np.int16)
+    return columns
+
+def write_join(output_file: str, columns: Dict[str, np.ndarray]):
+    """原子写入列式 .npz"""
+    os.makedirs(os.path.dirname(output_file) or os.curdir, exist_ok=True)
+    tmp_path = f"{output_file}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **columns)
+    os.replace(tmp_path, output_file)
+
+def write_csv(csv_output: str, columns: Dict[str, np.ndarray]):
+    """导出平铺的 CSV（每个词典颜色一行）"""
+    xkcd_names, css_names, iscc_names = (columns['xkcd_names'], columns['css_names'],
+                                         columns['iscc_names'])
+    tmp_path = f"{csv_output}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['name', 'hex', 'xkcd name', 'xkcd delta e', 'css name', 'css delta e',
+                         'iscc-nbs number', 'iscc-nbs name'])
+        for i in range(len(columns['name'])):
+            iscc = int(columns['iscc_index'][i])
+            writer.writerow([
+                columns['name'][i], columns['hex'][i],
+                xkcd_names[columns['xkcd_index'][i]], f"{columns['xkcd_delta_e'][i]:.4f}",
+                css_names[columns['css_index'][i]], f"{columns['css_delta_e'][i]:.4f}",
+                iscc if iscc != NO_CATEGORY else '', iscc_names[iscc],
+            ])
+    os.replace(tmp_path, csv_output)
+
+def load_join(output_file: str = OUTPUT_FILE) -> Dict[str, np.ndarray]:
+    """读取关联结果（全部列）"""
+    with np.load(output_file) as data:
+        return {key: data[key] for key in data.files}
+
+def is_up_to_date(output_file: str = OUTPUT_FILE, csv_file: str = CSV_FILE,
+                  xkcd_file: str = XKCD_FILE, css_file: str = CSS_FILE,
+                  iscc_file: str = ISCC_FILE) -> bool:
+    """关联结果是否存在、格式版本一致且四个来源文件均未变化"""
+    try:
+        with np.load(output_file) as data:
+            version = int(data['version'])
+            sources = data['sources']
+    except (OSError, KeyError, ValueError):
+        return False
+    return (version == VERSION
+            and np.array_equal(sources, source_hashes(csv_file, xkcd_file, css_file, iscc_file)))
+
+def print_summary(columns: Dict[str, np.ndarray], elapsed: float):
+    """输出色差分布与类别覆盖情况"""
+    count = len(columns['name'])
+    print("=" * 80)
+    print("交叉关联结果")
+    print("=" * 80)
+    print()
+    print(f"📊 统计信息：")
+    print(f"   词典颜色: {count:,}")
+    for key, label in (('xkcd', 'XKCD'), ('css', 'CSS')):
+        delta = columns[f'{key}_delta_e']
+        used = len(np.unique(columns[f'{key}_index']))
+        print(f"   {label}（{len(columns[f'{key}_names']):,} 色，用到 {used:,} 个）: "
+              f"ΔE00 平均 {delta.mean():.2f}，中位 {np.median(delta):.2f}，最大 {delta.max():.2f}")
+    iscc = columns['iscc_index']
+    covered = iscc != NO_CATEGORY
+    print(f"   ISCC-NBS: 落入 {len(np.unique(iscc[covered])):,} 个类别，"
+          f"未覆盖 {int(np.count_nonzero(~covered)):,} 色")
+    print(f"   耗时: {elapsed:.2f} s")
+    print()
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='colornames / XKCD / CSS / ISCC-NBS 交叉关联')
+    parser.add_argument('--csv-input', default=CSV_FILE, help='颜色名称 CSV 文件')
+    parser.add_argument('--xkcd', default=XKCD_FILE, help='XKCDColors.swift 路径')
+    parser.add_argument('--css', default=CSS_FILE, help='CSSColors.swift 路径')
+    parser.add_argument('--iscc', default=ISCC_FILE, help='iscc-nbs.xml 路径')
+    parser.add_argument('-o', '--output', default=OUTPUT_FILE, help='列式输出（.npz）路径')
+    parser.add_argument('--csv', dest='csv_output', help='同时导出平铺的 CSV')
+    parser.add_argument('--check', action='store_true', help='只检查关联结果是否过期，不重建')
+    parser.add_argument('--force', action='store_true', help='无论是否过期都重建')
+    args = parser.parse_args(argv)
+
+    sources = (args.csv_input, args.xkcd, args.css, args.iscc)
+    if args.check:
+        if is_up_to_date(args.output, *sources):
+            print(f"✅ 关联结果是最新的: {args.output}")
+            return
+        print(f"❌ 关联结果缺失或已过期: {args.output}")
+        raise SystemExit(1)
+
+    if not args.force and not args.csv_output and is_up_to_date(args.output, *sources):
+        print(f"✅ 关联结果是最新的，无需重建: {args.output}")
+        return
+
+    print("=" * 80)
+    print("颜色词典交叉关联工具")
+    print("=" * 80)
+    print()
+
+    t0 = time.perf_counter()
+    columns = join(*sources)
+    elapsed = time.perf_counter() - t0
+    print_summary(columns, elapsed)
+
+    write_join(args.output, columns)
+    print(f"📄 列式结果: {args.output}")
+    if args.csv_output:
+        write_csv(args.csv_output, columns)
+        print(f"📄 CSV: {args.csv_output}")
+    print()
+    print("✅ 关联完成！")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+project.pbxproj 解析与批量修改引擎（add_files_to_xcode / add_vision_file / add_infoplist_strings 共用）
+
+旧脚本每添加一个文件都要在整份文本上跑好几次 re.sub / re.search / content.replace，
+耗时是 O(文件数 × 文件大小)，而且对 children 片段做 content.replace 可能改到别的组。
+
+这里把 OpenStep 格式的 plist 一次解析为对象图：objects 本身就是 UUID → 对象的索引，
+添加文件、创建组、插入构建阶段都只是内存中的字典/列表操作，最后统一序列化写回一次。
+序列化遵循 Xcode 的格式（按 isa 分节、节内按 UUID 排序、PBXBuildFile 与
+PBXFileReference 单行、引用后附注释），未修改的工程原样往返，不产生多余的 diff。
+
+新对象的 UUID 由类型、父对象与路径的哈希确定，重复运行得到同样的 ID、不会重复添加；
+序列化结果与读入时的指纹相同则不写文件。
+
+用法:
+    python3 pbxproj.py                                   # 解析并校验往返一致
+    python3 pbxproj.py path/to/project.pbxproj
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import time
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+PROJECT_FILE = 'Project_Color.xcodeproj/project.pbxproj'
+
+# plist 值：字符串、字典或数组
+Value = Union[str, Dict[str, 'Value'], List['Value']]
+
+# Xcode 写成单行的对象类型
+_INLINE_ISA = {'PBXBuildFile', 'PBXFileReference'}
+
+# 值是 UUID 但 Xcode 不附注释的键
+_UNANNOTATED_KEYS = {'remoteGlobalIDString', 'TestTargetID'}
+
+# 构建阶段在注释中的名称
+_PHASE_NAMES = {
+    'PBXSourcesBuildPhase': 'Sources',
+    'PBXFrameworksBuildPhase': 'Frameworks',
+    'PBXResourcesBuildPhase': 'Resources',
+    'PBXHeadersBuildPhase': 'Headers',
+    'PBXCopyFilesBuildPhase': 'CopyFiles',
+    'PBXShellScriptBuildPhase': 'ShellScript',
+}
+
+# 扩展名 → lastKnownFileType
+FILE_TYPES = {
+    '.swift': 'sourcecode.swift',
+    '.h': 'sourcecode.c.h',
+    '.m': 'sourcecode.c.objc',
+    '.metal': 'sourcecode.metal',
+    '.strings': 'text.plist.strings',
+    '.stringsdict': 'text.plist.stringsdict',
+    '.xcstrings': 'text.json.xcstrings',
+    '.plist': 'text.plist.xml',
+    '.json': 'text.json',
+    '.xml': 'text.xml',
+    '.md': 'net.daringfireball.markdown',
+    '.csv': 'text',
+    '.txt': 'text',
+    '.png': 'image.png',
+    '.jpg': 'image.jpeg',
+    '.xcassets': 'folder.assetcatalog',
+    '.storekit': 'text',
+    '.entitlements': 'text.plist.entitlements',
+}
+
+_TOKEN_RE = re.compile(r'''
+    \s*(?:
+          /\*(?P<comment>.*?)\*/
+        | //[^\n]*
+        | "(?P<quoted>(?:[^"\\]|\\.)*)"
+        | (?P<bare>(?:[^\s{}()=;,"/]|/(?![*/]))+)
+        | (?P<punct>[{}()=;,])
+    )
+''', re.S | re.X)
+
+_UUID_RE = re.compile(r'[0-9A-F]{24}')
+
+_BARE_RE = re.compile(r'[A-Za-z0-9_$/:.]+')
+
+_UNESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '"': '"', '\\': '\\'}
+
+def stable_uuid(*parts: str) -> str:
+    """
+    由内容确定的 Xcode 风格 24 字符 UUID
+
+    取各部分（对象类型、父对象 UUID、路径等）的 SHA-1 前 96 位：同一目标重复添加得到
+    同一个 ID，重复运行脚本不会产生新的随机 ID 和无意义的 diff。
+    """
+    return hashlib.sha1('\0'.join(parts).encode('utf-8')).hexdigest()[:24].upper()
+
+def _fingerprint(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def _unescape(text: str) -> str:
+    return re.sub(r'\\(.)', lambda m: _UNESCAPES.get(m.group(1), m.group(1)), text, flags=re.S)
+
+def _quote(text: str) -> str:
+    if _BARE_RE.fullmatch(text):
+        return text
+    escaped = (text.replace('\\', '\\\\').replace('"', '\\"')
+               .replace('\n', '\\n').replace('\t', '\\t'))
+    return f'"{escaped}"'
+
+class _Parser:
+    """递归下降解析；顺带记录每个 UUID 后面的注释"""
+
+    def __init__(self, text: str):
+        self.tokens: List[Tuple[str, str]] = []
+        self.comments: Dict[str, str] = {}
+        last_string = None
+        end = 0
+        for match in _TOKEN_RE.finditer(text):
+            if match.start() != end:
+                break
+            end = match.end()
+            kind = match.lastgroup
+            if kind is None:
+                last_string = None
+                continue
+            value = match.group(kind)
+            if kind == 'comment':
+                if last_string is not None and _UUID_RE.fullmatch(last_string):
+                    self.comments.setdefault(last_string, value.strip())
+                last_string = None
+                continue
+            if kind == 'punct':
+                self.tokens.append((kind, value))
+                last_string = None
+                continue
+            if kind == 'quoted' and '\\' in value:
+                value = _unescape(value)
+            self.tokens.append(('string', value))
+            last_string = value
+        if text[end:].strip():
+            raise ValueError(f"无法识别的 pbxproj 内容（第 {text.count(chr(10), 0, end) + 1} 行）")
+        self.position = 0
+
+    def _next(self) -> Tuple[str, str]:
+        if self.position >= len(self.tokens):
+            raise ValueError("pbxproj 意外结束")
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def _expect(self, punct: str):
+        kind, value = self._next()
+        if kind != 'punct' or value != punct:
+            raise ValueError(f"pbxproj 语法错误：期望 '{punct}'，得到 '{value}'")
+
+    def value(self) -> Value:
+        kind, value = self._next()
+        if kind == 'string':
+            return value
+        if value == '{':
+            result = {}
+            while True:
+                kind, key = self._next()
+                if kind == 'punct' and key == '}':
+                    return result
+                if kind != 'string':
+                    raise ValueError(f"pbxproj 语法错误：期望键，得到 '{key}'")
+                self._expect('=')
+                result[key] = self.value()
+                self._expect(';')
+        if value == '(':
+            result = []
+            while True:
+                if self.tokens[self.position] == ('punct', ')'):
+                    self.position += 1
+                    return result
+                result.append(self.value())
+                kind, value = self._next()
+                if (kind, value) == ('punct', ')'):
+                    return result
+                if (kind, value) != ('punct', ','):
+                    raise ValueError(f"pbxproj 语法错误：期望 ','，得到 '{value}'")
+        raise ValueError(f"pbxproj 语法错误：意外的 '{value}'")
+
+class XcodeProject:
+    """
+    内存中的 project.pbxproj 对象图
+
+    Args:
+        data: 顶层字典（含 objects 与 rootObject）
+        comments: UUID → 注释（序列化时附在引用后面）
+        path: 来源文件路径
+        fingerprint: 来源文件内容的 SHA-256（save 时据此跳过没有变化的写入）
+    """
+
+    def __init__(self, data: Dict[str, Value], comments: Dict[str, str],
+                 path: Optional[str] = None, fingerprint: Optional[str] = None):
+        self.data = data
+        self.objects: Dict[str, Dict[str, Value]] = data['objects']
+        self.comments = comments
+        self.path = path
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def parse(cls, text: str, path: Optional[str] = None) -> 'XcodeProject':
+        parser = _Parser(text)
+        data = parser.value()
+        if not isinstance(data, dict) or 'objects' not in data:
+            raise ValueError("不是有效的 project.pbxproj")
+        return cls(data, parser.comments, path, _fingerprint(text))
+
+    @classmethod
+    def load(cls, path: str = PROJECT_FILE) -> 'XcodeProject':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.parse(f.read(), path)
+
+    # ---- 查询 ----
+
+    @property
+    def root(self) -> Dict[str, Value]:
+        return self.objects[self.data['rootObject']]
+
+    @property
+    def main_group(self) -> str:
+        return self.root['mainGroup']
+
+    def objects_of(self, isa: str) -> Iterator[Tuple[str, Dict[str, Value]]]:
+        """指定类型的全部对象 (UUID, 对象)"""
+        for key, obj in self.objects.items():
+            if obj.get('isa') == isa:
+                yield key, obj
+
+    def display_name(self, key: str) -> str:
+        """对象在 Xcode 中显示的名称（name，其次 path 的最后一段）"""
+        obj = self.objects[key]
+        if 'name' in obj:
+            return obj['name']
+        if 'path' in obj:
+            return os.path.basename(obj['path'])
+        return self.comments.get(key, '')
+
+    def find_groups(self, name: str) -> List[str]:
+        """名称为 name 的全部 PBXGroup"""
+        return [key for key, _ in self.objects_of('PBXGroup') if self.display_name(key) == name]
+
+    @property
+    def project_dir(self) -> str:
+        """工程根目录（.xcodeproj 所在目录，再加上 projectDirPath）"""
+        base = os.path.dirname(os.path.dirname(os.path.abspath(self.path or PROJECT_FILE)))
+        return os.path.normpath(os.path.join(base, self.root.get('projectDirPath', '')))
+
+    def walk(self) -> Iterator[Tuple[str, Optional[str], Optional[str]]]:
+        """
+        从主组出发遍历组树
+
+        Yields:
+            (UUID, 相对工程根目录的路径, 父组 UUID)；路径无法确定（如 BUILT_PRODUCTS_DIR）时为 None
+        """
+        stack = [(self.main_group, '', None)]
+        while stack:
+            key, parent_path, parent = stack.pop()
+            obj = self.objects.get(key)
+            if obj is None:
+                continue
+            tree = obj.get('sourceTree', '<group>')
+            path = obj.get('path')
+            if tree == '<group>':
+                full = parent_path if path is None else (
+                    os.path.normpath(os.path.join(parent_path, path)) if parent_path is not None else None)
+            elif tree == 'SOURCE_ROOT':
+                full = os.path.normpath(path) if path else ''
+            else:
+                full = None
+            yield key, full, parent
+            for child in reversed(obj.get('children', [])):
+                stack.append((child, full, key))
+
+    def path_index(self) -> Dict[str, str]:
+        """
+        相对路径 → UUID（组、文件引用与同步文件夹，一次遍历建立）
+
+        同一目录有多个组时（例如只有 name 没有 path 的逻辑组），优先取带 path 的那个。
+        """
+        index: Dict[str, str] = {}
+        for key, path, parent in self.walk():
+            if path is None or parent is None:
+                continue
+            if path not in index or 'path' in self.objects[key]:
+                index[path] = key
+        return index
+
+    def target(self, name: Optional[str] = None) -> str:
+        """按名称查找 target；不指定时返回第一个 target（通常是应用本身）"""
+        for key in self.root['targets']:
+            if name is None or self.objects[key].get('name') == name:
+                return key
+        raise KeyError(f"未找到 target: {name}")
+
+    def build_phase(self, target: str, isa: str = 'PBXSourcesBuildPhase') -> str:
+        """target 中指定类型的构建阶段"""
+        for key in self.objects[target].get('buildPhases', []):
+            if self.objects[key]['isa'] == isa:
+                return key
+        raise KeyError(f"target {self.display_name(target)} 没有 {isa}")
+
+    # ---- 修改（都只改内存，save 时一次写回）----
+
+    def add_object(self, isa: str, fields: Dict[str, Value], comment: Optional[str] = None,
+                   seed: Tuple[str, ...] = ()) -> str:
+        """
+        添加对象（isa 在前，其余键按字母序，与 Xcode 一致）
+
+        UUID 由 isa 与 seed 确定，重复运行得到相同的 ID；同一对象已存在时直接返回它。
+        """
+        seed = (isa, *seed)
+        key = stable_uuid(*seed)
+        attempt = 0
+        while key in self.objects:
+            if self._same_object(self.objects[key], isa, fields):
+                return key
+            attempt += 1
+            key = stable_uuid(*seed, str(attempt))
+        self.objects[key] = {'isa': isa, **dict(sorted(fields.items()))}
+        if comment:
+            self.comments[key] = comment
+        return key
+
+    @staticmethod
+    def _same_object(obj: Dict[str, Value], isa: str, fields: Dict[str, Value]) -> bool:
+        """已有对象与待添加的对象是否相同（children、files 等列表会在之后追加，不参与比较）"""
+        return obj.get('isa') == isa and all(
+            obj.get(k) == v for k, v in fields.items() if not isinstance(v, list))
+
+    def _attach(self, parent: str, field: str, key: str):
+        members = self.objects[parent].setdefault(field, [])
+        if key not in members:
+            members.append(key)
+
+    def add_group(self, parent: str, path: Optional[str] = None, name: Optional[str] = None) -> str:
+        """在 parent 下创建 PBXGroup"""
+        fields = {'children': [], 'sourceTree': '<group>'}
+        if path is not None:
+            fields['path'] = path
+        if name is not None and name != path:
+            fields['name'] = name
+        key = self.add_object('PBXGroup', fields, name or path, (parent, path or '', name or ''))
+        self._attach(parent, 'children', key)
+        return key
+
+    def add_file(self, group: str, path: str, name: Optional[str] = None,
+                 file_type: Optional[str] = None, source_tree: str = '<group>') -> str:
+        """创建 PBXFileReference 并加入 group（PBXGroup 或 PBXVariantGroup）"""
+        if file_type is None:
+            file_type = FILE_TYPES.get(os.path.splitext(path)[1].lower(), 'text')
+        fields = {'lastKnownFileType': file_type, 'path': path, 'sourceTree': source_tree}
+        if name is not None and name != path:
+            fields['name'] = name
+        key = self.add_object('PBXFileReference', fields, name or os.path.basename(path),
+                              (group, path, name or ''))
+        self._attach(group, 'children', key)
+        return key
+
+    def add_variant_group(self, parent: Optional[str], name: str) -> str:
+        """创建 PBXVariantGroup（本地化文件的各语言版本，用 add_file 加入）"""
+        key = self.add_object('PBXVariantGroup', {
+            'children': [], 'name': name, 'sourceTree': '<group>'}, name, (parent or '', name))
+        if parent is not None:
+            self._attach(parent, 'children', key)
+        return key
+
+    def add_build_file(self, phase: str, file_ref: str) -> str:
+        """创建 PBXBuildFile 并加入构建阶段"""
+        comment = f"{self.comments.get(file_ref, self.display_name(file_ref))} in {self._phase_name(phase)}"
+        key = self.add_object('PBXBuildFile', {'fileRef': file_ref}, comment, (phase, file_ref))
+        self._attach(phase, 'files', key)
+        return key
+
+    def remove_objects(self, keys) -> int:
+        """删除一批对象，并在一次遍历中从所有数组里去掉对它们的引用；返回实际删除的数量"""
+        doomed = {key for key in keys if key in self.objects}
+        for key in doomed:
+            del self.objects[key]
+            self.comments.pop(key, None)
+        if doomed:
+            for obj in self.objects.values():
+                for field, value in obj.items():
+                    if isinstance(value, list) and any(v in doomed for v in value):
+                        obj[field] = [v for v in value if v not in doomed]
+        return len(doomed)
+
+    def add_known_region(self, region: str) -> bool:
+        """加入 knownRegions；已存在时返回 False"""
+        regions = self.root.setdefault('knownRegions', [])
+        if region in regions:
+            return False
+        regions.append(region)
+        return True
+
+    def _phase_name(self, phase: str) -> str:
+        obj = self.objects[phase]
+        return obj.get('name') or _PHASE_NAMES.get(obj['isa'], obj['isa'])
+
+    # ---- 序列化 ----
+
+    def _reference(self, value: str, key: Optional[str] = None) -> str:
+        text = _quote(value)
+        if key not in _UNANNOTATED_KEYS and value in self.objects:
+            comment = self.comments.get(value)
+            if comment:
+                text += f" /* {comment} */"
+        return text
+
+    def _inline(self, value: Value, key: Optional[str] = None) -> str:
+        if isinstance(value, dict):
+            return '{' + ''.join(f"{_quote(k)} = {self._inline(v, k)}; " for k, v in value.items()) + '}'
+        if isinstance(value, list):
+            return '(' + ''.join(f"{self._inline(v, key)}, " for v in value) + ')'
+        return self._reference(value, key)
+
+    def _block(self, value: Value, indent: int, key: Optional[str] = None) -> str:
+        if isinstance(value, dict):
+            pad = '\t' * (indent + 1)
+            lines = [f"{pad}{_quote(k)} = {self._block(v, indent + 1, k)};\n" for k, v in value.items()]
+            return '{\n' + ''.join(lines) + '\t' * indent + '}'
+        if isinstance(value, list):
+            pad = '\t' * (indent + 1)
+            lines = [f"{pad}{self._block(v, indent + 1, key)},\n" for v in value]
+            return '(\n' + ''.join(lines) + '\t' * indent + ')'
+        return self._reference(value, key)
+
+    def serialize(self) -> str:
+        """按 Xcode 的格式输出完整的 project.pbxproj"""
+        sections: Dict[str, List[str]] = {}
+        for key in sorted(self.objects):
+            obj = self.objects[key]
+            head = self._reference(key)
+            if obj.get('isa') in _INLINE_ISA:
+                line = f"\t\t{head} = {self._inline(obj)};\n"
+            else:
+                line = f"\t\t{head} = {self._block(obj, 2)};\n"
+            sections.setdefault(obj.get('isa', ''), []).append(line)
+        objects_text = ''.join(
+            f"\n/* Begin {isa} section */\n" + ''.join(lines) + f"/* End {isa} section */\n"
+            for isa, lines in sorted(sections.items()))
+
+        out = ['// !$*UTF8*$!\n{\n']
+        for key, value in self.data.items():
+            if key == 'objects':
+                out.append(f"\tobjects = {{\n{objects_text}\t}};\n")
+            else:
+                out.append(f"\t{_quote(key)} = {self._block(value, 1, key)};\n")
+        out.append('}\n')
+        return ''.join(out)
+
+    def save(self, path: Optional[str] = None, backup: Optional[str] = None) -> bool:
+        """
+        原子写回（一次序列化、一次写入）
+
+        写回来源文件且序列化结果与读入时逐字节相同（指纹一致）时跳过写入，
+        文件的修改时间不变，Xcode 也不会重新索引。
+
+        Args:
+            path: 输出路径（默认为来源文件）
+            backup: 写入前把原文件复制到该路径（None 表示不备份）
+
+        Returns:
+            是否实际写入
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("未指定输出路径")
+        output = self.serialize()
+        fingerprint = _fingerprint(output)
+        if path == self.path and fingerprint == self.fingerprint:
+            return False
+        if backup and os.path.exists(path):
+            shutil.copyfile(path, backup)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(output)
+        os.replace(tmp_path, path)
+        if path == self.path:
+            self.fingerprint = fingerprint
+        return True
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='解析 project.pbxproj 并校验往返一致')
+    parser.add_argument('project_file', nargs='?', default=PROJECT_FILE, help='project.pbxproj 路径')
+    args = parser.parse_args(argv)
+
+    with open(args.project_file, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    t0 = time.perf_counter()
+    project = XcodeProject.parse(text, args.project_file)
+    parse_time = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    output = project.serialize()
+    serialize_time = time.perf_counter() - t0
+
+    counts: Dict[str, int] = {}
+    for _, obj in project.objects.items():
+        counts[obj.get('isa', '?')] = counts.get(obj.get('isa', '?'), 0) + 1
+
+    print("=" * 80)
+    print(f"📦 {args.project_file}")
+    print("=" * 80)
+    print()
+    print(f"📊 对象: {len(project.objects):,} 个")
+    for isa, count in sorted(counts.items()):
+        print(f"   {isa}: {count}")
+    print()
+    print(f"⏱️  解析 {parse_time * 1000:.2f} ms，序列化 {serialize_time * 1000:.2f} ms")
+    if output == text:
+        print("✅ 往返一致：未修改的工程序列化后逐字节相同")
+    else:
+        print("⚠️  往返不一致：序列化结果与原文件不同（Xcode 下次保存时也会这样规范化）")
+
+if __name__ == '__main__':
+    main()
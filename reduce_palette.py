@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+保持覆盖率的调色板精简：用更少的颜色名称覆盖整个 sRGB 色域
+
+为聚类颜色命名并不需要 3 万种颜色的分辨率。这里按覆盖率贪心选色：用均匀的 sRGB
+采样点代表整个色域，每一步找出当前离已选颜色最远（CIEDE2000）的采样点，
+把词典中离它最近的颜色加入；若有 good name 标记的颜色与最近色只差 GOOD_NAME_SLACK，
+则优先选它。
+
+一次贪心得到完整的选色顺序，各目标规模（如 1k / 2k / 5k）取其前缀，因此小调色板
+总是大调色板的子集。每个规模都报告覆盖指标：任一采样点到最近保留颜色的最大、
+平均与 95 分位 ΔE00，便于在查询速度与命名精度之间取舍。
+
+用法:
+    python3 reduce_palette.py                          # 在 build/ 下生成 1000 / 2000 / 5000 色
+    python3 reduce_palette.py --sizes 500 3000
+    python3 reduce_palette.py --dry-run                # 只输出覆盖指标
+"""
+
+import argparse
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from build_palette import build_palette
+from color_cleaner import clean_stream
+from color_naming import NameEngine
+from color_space import ciede2000, hex_to_rgb, rgb8_to_lab
+from dedupe_color_names import load_entries
+
+INPUT_FILE = 'Project_Color/Resources/colornames.csv'
+
+# 输出路径（{size} 为颜色数）；同名 .palette 写在旁边。精简词典只供批处理使用，
+# 放在仓库根目录的 build/ 下（Project_Color/ 是同步文件夹，放在里面会被打包进应用）
+OUTPUT_PATTERN = 'build/colornames_reduced_{size}.csv'
+
+DEFAULT_SIZES = [1000, 2000, 5000]
+
+# good name 颜色与最近色的色差不超过该值时优先选 good name
+GOOD_NAME_SLACK = 1.0
+
+# 覆盖率采样：每个通道的分段数（采样点为各段中心，共 levels³ 个）
+SAMPLE_LEVELS = 32
+
+def srgb_samples(levels: int = SAMPLE_LEVELS) -> np.ndarray:
+    """均匀覆盖 8 位 sRGB 色域的采样点（LAB）"""
+    step = 256 / levels
+    values = np.arange(levels) * step + (step - 1) / 2.0
+    grid = np.stack(np.meshgrid(values, values, values, indexing='ij'), axis=-1)
+    return rgb8_to_lab(grid.reshape(-1, 3))
+
+def coverage_order(lab: np.ndarray, good: np.ndarray, samples: np.ndarray,
+                   limit: int) -> np.ndarray:
+    """
+    覆盖率贪心选色顺序
+
+    Args:
+        lab: 词典颜色 LAB，(N, 3)
+        good: good name 标记，(N,)
+        samples: 覆盖率采样点 LAB，(S, 3)
+        limit: 最多选出的颜色数
+
+    Returns:
+        选中颜色的下标（按选中先后）
+    """
+    engine = NameEngine(lab)
+    good_index = np.flatnonzero(good)
+    good_engine = NameEngine(lab[good_index]) if len(good_index) else None
+
+    covered = np.full(len(samples), np.inf)
+    open_samples = np.ones(len(samples), dtype=bool)
+    chosen = np.zeros(len(lab), dtype=bool)
+    order = []
+    while len(order) < min(limit, len(lab)) and open_samples.any():
+        worst = int(np.argmax(np.where(open_samples, covered, -1.0)))
+        target = samples[worst:worst + 1]
+        nearest, delta = engine.nearest(target)
+        candidates = [int(nearest[0])]
+        if good_engine is not None:
+            good_nearest, good_delta = good_engine.nearest(target)
+            if good_delta[0] <= delta[0] + GOOD_NAME_SLACK:
+                candidates.insert(0, int(good_index[good_nearest[0]]))
+
+        pick = next((c for c in candidates if not chosen[c]), None)
+        if pick is None:
+            # 离它最近的颜色已经选过，该采样点的覆盖无法再改善
+            open_samples[worst] = False
+            continue
+        chosen[pick] = True
+        order.append(pick)
+        np.minimum(covered, ciede2000(lab[pick], samples), out=covered)
+    return np.array(order, dtype=np.int64)
+
+def coverage(lab: np.ndarray, samples: np.ndarray) -> Dict[str, float]:
+    """采样点到最近颜色的 ΔE00：最大、平均、95 分位"""
+    _, delta = NameEngine(lab).nearest(samples)
+    return {
+        'max': float(delta.max()),
+        'mean': float(delta.mean()),
+        'p95': float(np.percentile(delta, 95)),
+    }
+
+def write_reduced(input_file: str, rows: np.ndarray, order: np.ndarray,
+                  outputs: Dict[int, str]):
+    """
+    一次读取源文件，写出各规模的精简词典（保留行按原始行序、原样写出）
+
+    Args:
+        input_file: 输入CSV文件路径
+        rows: 词典颜色对应的行号
+        order: 选色顺序（词典颜色下标）
+        outputs: {规模: 输出路径}
+    """
+    # 行号 → 选中名次；未选中的行（含无效色值的行）不进入任何输出
+    rank = {int(rows[i]): position for position, i in enumerate(order)}
+    never = len(order)
+
+    def classify(row_number: int, record):
+        position = rank.get(row_number, never)
+        return [size for size in outputs if position >= size]
+
+    for output_file in outputs.values():
+        os.makedirs(os.path.dirname(output_file) or os.curdir, exist_ok=True)
+    clean_stream(input_file, outputs, classify, backup=False)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='保持覆盖率的调色板精简')
+    parser.add_argument('input_file', nargs='?', default=INPUT_FILE, help='颜色名称 CSV 文件')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='目标颜色数（默认 1000 2000 5000）')
+    parser.add_argument('--sample-levels', type=int, default=SAMPLE_LEVELS,
+                        help=f'覆盖率采样每通道分段数（默认 {SAMPLE_LEVELS}，即 {SAMPLE_LEVELS ** 3:,} 个采样点）')
+    parser.add_argument('--no-palette', action='store_true', help='不生成对应的二进制调色板')
+    parser.add_argument('--dry-run', action='store_true', help='只输出覆盖指标，不写文件')
+    args = parser.parse_args(argv)
+
+    print("=" * 80)
+    print("调色板精简工具（保持覆盖率）")
+    print("=" * 80)
+    print()
+
+    entries = load_entries(args.input_file)
+    lab = rgb8_to_lab(hex_to_rgb(entries.hexes))
+    samples = srgb_samples(args.sample_levels)
+    sizes = sorted(set(args.sizes))
+
+    print(f"正在选色（{len(lab):,} 色 → 最多 {sizes[-1]:,} 色，{len(samples):,} 个采样点）...")
+    t0 = time.perf_counter()
+    order = coverage_order(lab, entries.good, samples, sizes[-1])
+    print(f"   耗时: {time.perf_counter() - t0:.1f} s")
+    print()
+
+    print("📊 覆盖指标（采样点到最近保留颜色的 ΔE00）：")
+    print(f"   {'颜色数':>8} {'最大':>8} {'平均':>8} {'95分位':>8} {'good name':>10}")
+    rows = [(len(lab), coverage(lab, samples), float(entries.good.mean()))]
+    for size in sizes:
+        subset = order[:size]
+        rows.append((len(subset), coverage(lab[subset], samples), float(entries.good[subset].mean())))
+    for count, metrics, good_share in rows:
+        print(f"   {count:>8,} {metrics['max']:>8.2f} {metrics['mean']:>8.2f} "
+              f"{metrics['p95']:>8.2f} {good_share:>10.1%}")
+    print()
+
+    if len(order) < sizes[-1]:
+        print(f"⚠️  采样点覆盖已无法继续改善，只选出 {len(order):,} 色")
+        print()
+
+    if args.dry_run:
+        print("ℹ️  --dry-run：未写出文件")
+        return
+
+    outputs = {size: OUTPUT_PATTERN.format(size=size) for size in sizes}
+    write_reduced(args.input_file, entries.rows, order, outputs)
+    for size, output_file in outputs.items():
+        print(f"📄 {min(size, len(order)):,} 色: {output_file}")
+        if not args.no_palette:
+            palette_file = os.path.splitext(output_file)[0] + '.palette'
+            build_palette(output_file, palette_file)
+            print(f"   二进制调色板: {palette_file}")
+    print()
+    print("✅ 精简完成！")
+
+if __name__ == '__main__':
+    main()
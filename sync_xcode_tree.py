@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+目录树同步：把整个源码目录（例如代码生成的输出）一次性加入 Xcode 项目
+
+add_vision_file.py 只会在 Services 下建 Vision 组，add_files_to_xcode.py 只往 Views 里放文件，
+都不适合批量添加。这里遍历一次目录，用 pbxproj 的路径索引（相对路径 → 组 / 文件引用）
+比对磁盘与工程：缺失的组与 PBXFileReference 全部在内存中一批创建，源码文件同时加入
+target 的 Sources 阶段，最后只写回一次；没有缺失时不写文件。
+
+目录若位于 Xcode 16 的同步文件夹（PBXFileSystemSynchronizedRootGroup）内，Xcode 会
+自动收录其中的文件，不再重复添加。
+
+用法: python3 sync_xcode_tree.py Project_Color/Services
+      python3 sync_xcode_tree.py Project_Color/Generated --dry-run
+"""
+
+import argparse
+import os
+import time
+from typing import List, NamedTuple, Optional, Set
+
+from pbxproj import PROJECT_FILE, XcodeProject
+
+# 作为源码编译、需要加入 Sources 阶段的扩展名
+SOURCE_EXTENSIONS = {'.swift', '.m', '.mm', '.c', '.cpp', '.metal'}
+
+# 在 Xcode 中作为单个文件引用（不展开）的目录
+BUNDLE_EXTENSIONS = {'.xcassets', '.xcdatamodeld', '.bundle', '.framework', '.xcframework',
+                     '.scnassets', '.playground'}
+
+# 不加入工程的文件
+IGNORED_NAMES = {'.DS_Store', 'Thumbs.db'}
+
+# 不展开、也不加入工程的目录（工程文件本身）
+PROJECT_EXTENSIONS = {'.xcodeproj', '.xcworkspace'}
+
+class SyncResult(NamedTuple):
+    """同步结果"""
+    groups: List[str]           # 新建的组（相对路径）
+    files: List[str]            # 新建的文件引用（相对路径）
+    build_files: int            # 新加入 Sources 阶段的文件数
+    scanned: int                # 扫描到的文件数
+    synchronized: Optional[str] # 目录所在的同步文件夹（此时不做任何修改）
+
+def normalize(rel_dir: str) -> str:
+    """规范化相对路径；工程根目录本身为 ''（与 path_index 的键一致）"""
+    rel_dir = os.path.normpath(rel_dir)
+    return '' if rel_dir == os.curdir else rel_dir
+
+def synchronized_roots(project: XcodeProject) -> Set[str]:
+    """全部同步文件夹的相对路径"""
+    return {path for key, path, _ in project.walk()
+            if path and project.objects[key]['isa'] == 'PBXFileSystemSynchronizedRootGroup'}
+
+def synchronized_root(project: XcodeProject, rel_dir: str,
+                      roots: Optional[Set[str]] = None) -> Optional[str]:
+    """rel_dir 所在的同步文件夹路径（不在任何同步文件夹内时为 None）"""
+    rel_dir = normalize(rel_dir)
+    for path in sorted(synchronized_roots(project) if roots is None else roots):
+        if rel_dir == path or rel_dir.startswith(path + os.sep):
+            return path
+    return None
+
+def ensure_group(project: XcodeProject, index: dict, rel_dir: str, created: List[str]) -> str:
+    """rel_dir 对应的组；不存在时连同缺失的上级组一起创建"""
+    if rel_dir in ('', '.'):
+        return project.main_group
+    group = index.get(rel_dir)
+    if group is not None:
+        return group
+    parent = ensure_group(project, index, os.path.dirname(rel_dir), created)
+    group = project.add_group(parent, path=os.path.basename(rel_dir))
+    index[rel_dir] = group
+    created.append(rel_dir)
+    return group
+
+def sync_tree(project: XcodeProject, directory: str, target: Optional[str] = None) -> SyncResult:
+    """
+    把 directory 下的全部文件同步进工程（只改内存，由调用方决定是否写回）
+
+    Args:
+        project: 已解析的工程
+        directory: 要同步的目录（相对当前目录或绝对路径）
+        target: 源码加入哪个 target 的 Sources 阶段（默认第一个 target）
+
+    Returns:
+        SyncResult
+    """
+    rel_root = normalize(os.path.relpath(os.path.abspath(directory), project.project_dir))
+    if rel_root.startswith(os.pardir):
+        raise ValueError(f"{directory} 不在工程目录 {project.project_dir} 内")
+
+    roots = synchronized_roots(project)
+    synchronized = synchronized_root(project, rel_root, roots)
+    if synchronized is not None:
+        return SyncResult([], [], 0, 0, synchronized)
+
+    index = project.path_index()
+    sources_phase = project.build_phase(project.target(target), 'PBXSourcesBuildPhase')
+    groups: List[str] = []
+    files: List[str] = []
+    build_files = 0
+    scanned = 0
+
+    for dirpath, dirnames, filenames in os.walk(os.path.join(project.project_dir, rel_root)):
+        rel_dir = normalize(os.path.relpath(dirpath, project.project_dir))
+        # 包目录作为文件处理；隐藏目录、本地化目录、工程文件与同步文件夹（由 Xcode 自动收录）不展开
+        bundles = [d for d in dirnames if os.path.splitext(d)[1] in BUNDLE_EXTENSIONS]
+        dirnames[:] = sorted(d for d in dirnames
+                             if not d.startswith('.') and d not in bundles and not d.endswith('.lproj')
+                             and os.path.splitext(d)[1] not in PROJECT_EXTENSIONS
+                             and synchronized_root(project, os.path.join(rel_dir, d), roots) is None)
+        names = sorted(bundles + [f for f in filenames
+                                  if not f.startswith('.') and f not in IGNORED_NAMES])
+        if not names:
+            continue
+        scanned += len(names)
+
+        missing = [name for name in names if os.path.join(rel_dir, name) not in index]
+        if not missing:
+            continue
+        group = ensure_group(project, index, rel_dir, groups)
+        for name in missing:
+            rel_path = os.path.join(rel_dir, name)
+            file_ref = project.add_file(group, name)
+            index[rel_path] = file_ref
+            files.append(rel_path)
+            if os.path.splitext(name)[1] in SOURCE_EXTENSIONS:
+                project.add_build_file(sources_phase, file_ref)
+                build_files += 1
+
+    return SyncResult(groups, files, build_files, scanned, None)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='把目录树同步进 Xcode 项目')
+    parser.add_argument('directories', nargs='+', help='要同步的目录')
+    parser.add_argument('--project', default=PROJECT_FILE, help='project.pbxproj 路径')
+    parser.add_argument('--target', default=None, help='源码加入的 target（默认第一个 target）')
+    parser.add_argument('--dry-run', action='store_true', help='只列出将要添加的条目，不写文件')
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    project = XcodeProject.load(args.project)
+    results = [(directory, sync_tree(project, directory, args.target))
+               for directory in args.directories]
+    elapsed = time.perf_counter() - t0
+
+    changed = False
+    for directory, result in results:
+        print(f"📁 {directory}")
+        if result.synchronized is not None:
+            print(f"   ℹ️ 位于同步文件夹 {result.synchronized} 内，Xcode 会自动收录，无需添加")
+            continue
+        print(f"   扫描文件: {result.scanned:,}")
+        print(f"   新建组: {len(result.groups):,}")
+        print(f"   新建文件引用: {len(result.files):,}（其中 {result.build_files:,} 个加入 Sources）")
+        for path in result.groups[:10]:
+            print(f"      + {path}/")
+        for path in result.files[:10]:
+            print(f"      + {path}")
+        if len(result.groups) + len(result.files) > 20:
+            print("      …")
+        changed = changed or bool(result.groups or result.files)
+    print(f"⏱️  耗时: {elapsed * 1000:.1f} ms")
+
+    if not changed:
+        print("✅ 工程已与目录一致，未修改项目文件")
+        return
+    if args.dry_run:
+        print("ℹ️ --dry-run：未写入项目文件")
+        return
+    if project.save():
+        print(f"✅ 已更新 {args.project}")
+    else:
+        print("✅ 序列化结果与原文件相同，未写入项目文件")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""pytest 公共设置：仓库根目录下的脚本以模块方式导入"""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, ROOT)
+
+@pytest.fixture
+def project_copy(tmp_path):
+    """把仓库的 project.pbxproj 复制到临时目录，返回其路径（工程根目录即 tmp_path）"""
+    xcodeproj = tmp_path / 'Project_Color.xcodeproj'
+    xcodeproj.mkdir()
+    target = xcodeproj / 'project.pbxproj'
+    shutil.copyfile(os.path.join(ROOT, 'Project_Color.xcodeproj', 'project.pbxproj'), target)
+    return str(target)
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""accurate_sensitive_check：反混淆只还原真正的混淆写法；规则在首次扫描时才编译"""
+
+import subprocess
+import sys
+
+from conftest import ROOT
+
+from accurate_sensitive_check import fold_obfuscation, normalize_name, scan_name
+
+def test_fold_restores_obfuscation():
+    assert fold_obfuscation(normalize_name('f u c k')) == 'fuck'
+    assert fold_obfuscation(normalize_name('sh.it')) == 'shit'
+    assert scan_name('f u c k')['critical'] == ['fuck']
+
+def test_hyphen_and_underscore_are_not_separators():
+    for name in ('Red-Orange-Brown', 'R-e-d', 'a_b_c'):
+        assert fold_obfuscation(normalize_name(name)) == normalize_name(name)
+    assert scan_name('Red-Orange-Brown') == {'critical': [], 'high': [], 'moderate': []}
+
+def test_rules_compiled_lazily():
+    code = ('import accurate_sensitive_check as m; assert m._RULES is None; '
+            'm.scan_name("Red"); assert m._RULES is not None; '
+            'assert "fuck" in m.CRITICAL_KEYWORDS')
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True)
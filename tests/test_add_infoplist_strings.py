@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""add_infoplist_strings：同步文件夹中的 .strings 只登记 knownRegions，不重复加入工程"""
+
+from add_infoplist_strings import add_infoplist_strings_to_xcode
+from pbxproj import XcodeProject
+
+def _count(project, isa):
+    return sum(1 for _ in project.objects_of(isa))
+
+def test_default_mode_skips_synchronized_folder(project_copy):
+    before = XcodeProject.load(project_copy)
+    before.root['knownRegions'] = ['en', 'Base']
+    before.save()
+
+    assert add_infoplist_strings_to_xcode(project_copy)
+
+    after = XcodeProject.load(project_copy)
+    assert _count(after, 'PBXVariantGroup') == _count(before, 'PBXVariantGroup')
+    assert _count(after, 'PBXBuildFile') == _count(before, 'PBXBuildFile')
+    assert after.root['knownRegions'] == ['en', 'Base', 'zh-Hans']
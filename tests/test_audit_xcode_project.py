@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""audit_xcode_project：--fix 补加源码时不进入嵌套的同步文件夹"""
+
+import os
+
+from audit_xcode_project import apply_fixes, audit
+from pbxproj import XcodeProject
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('// test\n')
+
+def test_fix_skips_nested_synchronized_root(project_copy, tmp_path):
+    project = XcodeProject.load(project_copy)
+    generated = project.add_group(project.main_group, path='Generated')
+    project.add_file(generated, 'Existing.swift')
+    synced = project.add_object('PBXFileSystemSynchronizedRootGroup',
+                                {'path': 'Synced', 'sourceTree': '<group>'}, 'Synced',
+                                (generated, 'Synced'))
+    project.objects[generated]['children'].append(synced)
+    project.save()
+
+    _touch(tmp_path / 'Generated' / 'Existing.swift')
+    _touch(tmp_path / 'Generated' / 'Models' / 'Model.swift')
+    _touch(tmp_path / 'Generated' / 'Synced' / 'Auto.swift')
+
+    project = XcodeProject.load(project_copy)
+    orphans = [issue for issue in audit(project) if issue.add]
+    assert [issue.message for issue in orphans] == ['未加入工程的源码文件: Generated/Models/Model.swift']
+
+    apply_fixes(project, orphans)
+    index = project.path_index()
+    assert 'Generated/Models/Model.swift' in index
+    assert not [path for path in index if path.startswith('Generated/Synced/')]
+    assert not [issue for issue in audit(project) if issue.add]
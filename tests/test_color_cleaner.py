@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""color_cleaner：清理结果由差异补丁逐字节还原"""
+
+import os
+
+import pytest
+
+from color_cleaner import clean_csv, clean_stream, restore
+
+SOURCE = ('name,hex,good name\r\n'
+          'Red,#ff0000,x\r\n'
+          '"Bad, Name",#00ff00,\r\n'
+          '\r\n'
+          'Blue,#0000ff,x\r\n'
+          'Worse,#123456,\r\n')
+
+def _classify(row_number, record):
+    return (None,) if record['name'] in ('Bad, Name', 'Worse') else None
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def test_restore_round_trip(tmp_path):
+    source = tmp_path / 'colors.csv'
+    source.write_bytes(SOURCE.encode('utf-8'))
+    output = tmp_path / 'out' / 'colors_clean.csv'
+    os.makedirs(output.parent)
+
+    result = clean_stream(str(source), {None: str(output)}, _classify,
+                          backup_dir=str(tmp_path / 'backups'))[None]
+    assert (result.total, result.kept, result.removed) == (4, 2, 2)
+    assert os.path.dirname(result.delta_file) == str(tmp_path / 'backups')
+    assert b'Worse' not in _read(output)
+
+    restored = restore(result.delta_file, str(tmp_path / 'restored.csv'))
+    assert _read(restored) == SOURCE.encode('utf-8')
+
+def test_restore_in_place(tmp_path):
+    source = tmp_path / 'colors.csv'
+    source.write_bytes(SOURCE.encode('utf-8'))
+
+    result = clean_stream(str(source), {None: str(source)}, _classify,
+                          backup_dir=str(tmp_path / 'backups'))[None]
+    assert _read(source) == b'name,hex,good name\r\nRed,#ff0000,x\r\n\r\nBlue,#0000ff,x\r\n'
+
+    assert restore(result.delta_file) == str(source)
+    assert _read(source) == SOURCE.encode('utf-8')
+
+def test_restore_rejects_modified_output(tmp_path):
+    source = tmp_path / 'colors.csv'
+    source.write_bytes(SOURCE.encode('utf-8'))
+    output = tmp_path / 'colors_clean.csv'
+
+    result = clean_stream(str(source), {None: str(output)}, _classify,
+                          backup_dir=str(tmp_path / 'backups'))[None]
+    with open(output, 'a', encoding='utf-8', newline='') as f:
+        f.write('Green,#00ff00,\r\n')
+    with pytest.raises(ValueError):
+        restore(result.delta_file, str(tmp_path / 'restored.csv'))
+
+def test_clean_csv_honours_backup_dir(tmp_path):
+    source = tmp_path / 'colors.csv'
+    source.write_bytes(SOURCE.encode('utf-8'))
+
+    result = clean_csv(str(source), str(tmp_path / 'out.csv'), ['Worse'],
+                       backup_dir=str(tmp_path / 'backups'))
+    assert result.removed == 1
+    assert os.path.dirname(result.delta_file) == str(tmp_path / 'backups')
+
+def test_delta_files_never_collide(tmp_path):
+    source = tmp_path / 'colors.csv'
+    source.write_bytes(SOURCE.encode('utf-8'))
+    for folder in ('a', 'b'):
+        os.makedirs(tmp_path / folder)
+    outputs = {'a': str(tmp_path / 'a' / 'clean.csv'), 'b': str(tmp_path / 'b' / 'clean.csv')}
+    backup_dir = str(tmp_path / 'backups')
+
+    # 同名输出位于不同目录，且同一秒内连续运行两次
+    first = clean_stream(str(source), outputs, lambda n, r: ('a',) if r['name'] == 'Worse' else None,
+                         backup_dir=backup_dir)
+    second = clean_stream(str(source), outputs, lambda n, r: ('a', 'b') if r['name'] == 'Red' else None,
+                          backup_dir=backup_dir)
+    deltas = [result.delta_file for result in list(first.values()) + list(second.values())]
+    assert len(set(deltas)) == 4
+    assert sorted(os.listdir(backup_dir)) == sorted(os.path.basename(d) for d in deltas)
+
+    restored = restore(second['b'].delta_file, str(tmp_path / 'restored.csv'))
+    assert _read(restored) == SOURCE.encode('utf-8')
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""color_naming：网格索引的查询结果与暴力扫描完全一致"""
+
+import numpy as np
+import pytest
+
+from color_naming import NameEngine
+from color_space import ciede2000, rgb8_to_lab
+
+def _random_lab(rng, count):
+    return rgb8_to_lab(rng.integers(0, 256, size=(count, 3)).astype(np.uint8))
+
+@pytest.mark.parametrize('cell_size, weights', [(6.0, (1.0, 1.0, 1.0)),
+                                                (2.5, (1.0, 1.0, 1.0)),
+                                                (16.0, (2.0, 1.0, 1.0))])
+def test_nearest_matches_brute_force(cell_size, weights):
+    rng = np.random.default_rng(7)
+    palette = _random_lab(rng, 400)
+    kL, kC, kH = weights
+    engine = NameEngine(palette, cell_size=cell_size, kL=kL, kC=kC, kH=kH)
+
+    # 随机颜色 + 调色板颜色本身 + 重复查询
+    queries = np.concatenate([_random_lab(rng, 1500), palette[:50], palette[:5]])
+    index, delta = engine.nearest(queries)
+    expected_index, expected_delta = engine.brute_force(queries)
+
+    assert np.array_equal(index, expected_index)
+    np.testing.assert_allclose(delta, expected_delta, rtol=0, atol=1e-9)
+    assert np.all(delta[1500:] == 0)
+
+def test_ties_resolve_to_lowest_index():
+    rng = np.random.default_rng(3)
+    palette = _random_lab(rng, 50)
+    palette = np.concatenate([palette, palette[:10]])
+    engine = NameEngine(palette)
+    index, _ = engine.nearest(palette[:10])
+    assert np.array_equal(index, np.arange(10))
+
+def test_neighbors_match_brute_force():
+    rng = np.random.default_rng(11)
+    palette = _random_lab(rng, 300)
+    engine = NameEngine(palette)
+    queries = _random_lab(rng, 200)
+    threshold = 8.0
+
+    rows, cols, deltas = engine.neighbors(queries, threshold, chunk=64)
+
+    all_pairs = ciede2000(np.repeat(queries, len(palette), axis=0), np.tile(palette, (len(queries), 1)))
+    all_pairs = all_pairs.reshape(len(queries), len(palette))
+    expected_rows, expected_cols = np.nonzero(all_pairs <= threshold)
+    assert np.array_equal(rows, expected_rows)
+    assert np.array_equal(cols, expected_cols)
+    np.testing.assert_allclose(deltas, all_pairs[expected_rows, expected_cols], rtol=0, atol=1e-9)
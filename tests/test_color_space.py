@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+color_space：与 ColorSpaceConverter.swift 的 float32 标量移植、Sharma 参考数据逐项核对
+
+Swift 公式逐行移植为 float32 标量实现（与 App 中的 Float 运算一致），在随机颜色与
+边界颜色上与 color_space 的向量化结果比较，误差须在 float32 精度内。
+"""
+
+from typing import Callable, Tuple
+
+import numpy as np
+import pytest
+
+from color_space import (
+    ciede2000,
+    cmyk_to_rgb,
+    hsl_to_rgb,
+    hsv_to_rgb,
+    lab_to_lch,
+    lab_to_rgb,
+    lch_to_lab,
+    rgb_to_cmyk,
+    rgb_to_hsl,
+    rgb_to_hsv,
+    rgb_to_lab,
+)
+
+F = np.float32
+
+# Sharma, Wu, Dalal (2005) CIEDE2000 参考数据（不含 C1'·C2' = 0 的条目，
+# 那些条目中 App 的 H̄' 取 0，与论文约定不同）
+SHARMA_PAIRS = [
+    ((50.0, 2.6772, -79.7751), (50.0, 0.0, -82.7485), 2.0425),
+    ((50.0, 3.1571, -77.2803), (50.0, 0.0, -82.7485), 2.8615),
+    ((50.0, -1.3802, -84.2814), (50.0, 0.0, -82.7485), 1.0000),
+    ((50.0, 0.0, 0.0), (50.0, -1.0, 2.0), 2.3669),
+    ((50.0, 2.49, -0.001), (50.0, -2.49, 0.0009), 7.1792),
+    ((60.2574, -34.0099, 36.2677), (60.4626, -34.1751, 39.4387), 1.2644),
+    ((22.7233, 20.0904, -46.6940), (23.0331, 14.9730, -42.5619), 2.0373),
+    ((90.8027, -2.0831, 1.4410), (91.1528, -1.6435, 0.0447), 1.4441),
+    ((2.0776, 0.0795, -1.1350), (0.9033, -0.0636, -0.5514), 0.9082),
+]
+
+# 边界颜色：黑、白、灰、原色、二次色与各色相扇区的分界
+EDGE_RGB = [
+    (0, 0, 0), (1, 1, 1), (0.5, 0.5, 0.5), (0.04045, 0.04045, 0.04045),
+    (1, 0, 0), (0, 1, 0), (0, 0, 1), (1, 1, 0), (0, 1, 1), (1, 0, 1),
+    (1, 0.5, 0), (0.5, 1, 0), (0, 1, 0.5), (0, 0.5, 1), (0.5, 0, 1), (1, 0, 0.5),
+    (0.01, 0, 0), (0.2, 0.2, 0.199),
+]
+
+# ---------------------------------------------------------------------------
+# ColorSpaceConverter.swift 的 float32 标量移植（只用于核对）
+# ---------------------------------------------------------------------------
+
+def _swift_rgb_to_lab(rgb) -> Tuple[float, float, float]:
+    def gamma(channel):
+        return channel / F(12.92) if channel <= F(0.04045) else np.power((channel + F(0.055)) / F(1.055), F(2.4))
+
+    def lab_f(t):
+        delta = F(6.0) / F(29.0)
+        if t > delta * delta * delta:
+            return np.power(t, F(1.0) / F(3.0))
+        return t / (F(3.0) * delta * delta) + F(4.0) / F(29.0)
+
+    r, g, b = (gamma(F(c)) for c in rgb)
+    x = r * F(0.4124564) + g * F(0.3575761) + b * F(0.1804375)
+    y = r * F(0.2126729) + g * F(0.7151522) + b * F(0.0721750)
+    z = r * F(0.0193339) + g * F(0.1191920) + b * F(0.9503041)
+    fx, fy, fz = lab_f(x / F(0.95047)), lab_f(y / F(1.0)), lab_f(z / F(1.08883))
+    return F(116.0) * fy - F(16.0), F(500.0) * (fx - fy), F(200.0) * (fy - fz)
+
+def _swift_lab_to_rgb(lab) -> Tuple[float, float, float]:
+    def lab_f_inverse(t):
+        delta = F(6.0) / F(29.0)
+        return t * t * t if t > delta else F(3.0) * delta * delta * (t - F(4.0) / F(29.0))
+
+    def gamma(channel):
+        if channel <= F(0.0031308):
+            return F(12.92) * channel
+        return F(1.055) * np.power(channel, F(1.0) / F(2.4)) - F(0.055)
+
+    L, a, b = (F(c) for c in lab)
+    fy = (L + F(16.0)) / F(116.0)
+    fx = a / F(500.0) + fy
+    fz = fy - b / F(200.0)
+    x = lab_f_inverse(fx) * F(0.95047)
+    y = lab_f_inverse(fy) * F(1.0)
+    z = lab_f_inverse(fz) * F(1.08883)
+    r = x * F(3.2404542) + y * F(-1.5371385) + z * F(-0.4985314)
+    g = x * F(-0.9692660) + y * F(1.8760108) + z * F(0.0415560)
+    bl = x * F(0.0556434) + y * F(-0.2040259) + z * F(1.0572252)
+    return tuple(min(max(gamma(c), F(0.0)), F(1.0)) for c in (r, g, bl))
+
+def _swift_hue(r, g, b) -> Tuple[float, float, float, float]:
+    max_c, min_c = max(r, g, b), min(r, g, b)
+    delta = max_c - min_c
+    h = F(0.0)
+    if delta != 0:
+        if max_c == r:
+            h = F(60.0) * np.fmod((g - b) / delta, F(6.0))
+        elif max_c == g:
+            h = F(60.0) * ((b - r) / delta + F(2.0))
+        else:
+            h = F(60.0) * ((r - g) / delta + F(4.0))
+    if h < 0:
+        h += F(360.0)
+    return h, max_c, min_c, delta
+
+def _swift_rgb_to_hsl(rgb) -> Tuple[float, float, float]:
+    h, max_c, min_c, delta = _swift_hue(*(F(c) for c in rgb))
+    l = (max_c + min_c) / F(2.0)
+    s = delta / (F(1.0) - abs(F(2.0) * l - F(1.0))) if delta != 0 else F(0.0)
+    return h, s, l
+
+def _swift_rgb_to_hsv(rgb) -> Tuple[float, float, float]:
+    h, max_c, _, delta = _swift_hue(*(F(c) for c in rgb))
+    s = F(0.0) if max_c == 0 else delta / max_c
+    return h, s, max_c
+
+def _swift_sector(h, c, x, m) -> Tuple[float, float, float]:
+    if F(0) <= h < F(60):
+        r, g, b = c, x, F(0)
+    elif F(60) <= h < F(120):
+        r, g, b = x, c, F(0)
+    elif F(120) <= h < F(180):
+        r, g, b = F(0), c, x
+    elif F(180) <= h < F(240):
+        r, g, b = F(0), x, c
+    elif F(240) <= h < F(300):
+        r, g, b = x, F(0), c
+    else:
+        r, g, b = c, F(0), x
+    return r + m, g + m, b + m
+
+def _swift_hsl_to_rgb(hsl) -> Tuple[float, float, float]:
+    h, s, l = (F(c) for c in hsl)
+    c = (F(1) - abs(F(2) * l - F(1))) * s
+    x = c * (F(1) - abs(np.fmod(h / F(60), F(2)) - F(1)))
+    return _swift_sector(h, c, x, l - c / F(2))
+
+def _swift_hsv_to_rgb(hsv) -> Tuple[float, float, float]:
+    h, s, v = (F(c) for c in hsv)
+    c = v * s
+    x = c * (F(1) - abs(np.fmod(h / F(60), F(2)) - F(1)))
+    return _swift_sector(h, c, x, v - c)
+
+def _swift_rgb_to_cmyk(rgb) -> Tuple[float, float, float, float]:
+    r, g, b = (F(c) for c in rgb)
+    k = F(1) - max(r, g, b)
+    if k >= F(0.99999):
+        return F(0), F(0), F(0), F(1)
+    return (F(1) - r - k) / (F(1) - k), (F(1) - g - k) / (F(1) - k), (F(1) - b - k) / (F(1) - k), k
+
+def _swift_delta_e(lab1, lab2) -> float:
+    L1, a1, b1 = (F(c) for c in lab1)
+    L2, a2, b2 = (F(c) for c in lab2)
+    radians = np.float32(np.pi) / F(180.0)
+
+    def hue_prime(a, b):
+        if a == 0 and b == 0:
+            return F(0.0)
+        hue = np.arctan2(b, a) * F(180.0) / np.float32(np.pi)
+        return hue + F(360.0) if hue < 0 else hue
+
+    C1 = np.sqrt(a1 * a1 + b1 * b1)
+    C2 = np.sqrt(a2 * a2 + b2 * b2)
+    Cbar7 = np.power((C1 + C2) / F(2.0), F(7))
+    G = F(0.5) * (F(1.0) - np.sqrt(Cbar7 / (Cbar7 + np.power(F(25.0), F(7)))))
+    a1p, a2p = (F(1.0) + G) * a1, (F(1.0) + G) * a2
+    C1p = np.sqrt(a1p * a1p + b1 * b1)
+    C2p = np.sqrt(a2p * a2p + b2 * b2)
+    h1p, h2p = hue_prime(a1p, b1), hue_prime(a2p, b2)
+
+    dLp = L2 - L1
+    dCp = C2p - C1p
+    dhp = F(0.0)
+    if C1p * C2p != 0:
+        diff = h2p - h1p
+        dhp = diff if abs(diff) <= 180 else (diff - F(360) if diff > 180 else diff + F(360))
+    dHp = F(2.0) * np.sqrt(C1p * C2p) * np.sin(dhp / F(2.0) * radians)
+
+    Lbarp = (L1 + L2) / F(2.0)
+    Cbarp = (C1p + C2p) / F(2.0)
+    Hbarp = F(0.0)
+    if C1p * C2p != 0:
+        total = h1p + h2p
+        if abs(h1p - h2p) <= 180:
+            Hbarp = total / F(2.0)
+        elif total < 360:
+            Hbarp = (total + F(360)) / F(2.0)
+        else:
+            Hbarp = (total - F(360)) / F(2.0)
+
+    T = (F(1.0) - F(0.17) * np.cos((Hbarp - F(30.0)) * radians)
+         + F(0.24) * np.cos(F(2.0) * Hbarp * radians)
+         + F(0.32) * np.cos((F(3.0) * Hbarp + F(6.0)) * radians)
+         - F(0.20) * np.cos((F(4.0) * Hbarp - F(63.0)) * radians))
+    Lsq = (Lbarp - F(50.0)) * (Lbarp - F(50.0))
+    SL = F(1.0) + F(0.015) * Lsq / np.sqrt(F(20.0) + Lsq)
+    SC = F(1.0) + F(0.045) * Cbarp
+    SH = F(1.0) + F(0.015) * Cbarp * T
+    dTheta = F(30.0) * np.exp(-np.power((Hbarp - F(275.0)) / F(25.0), F(2)))
+    Cbarp7 = np.power(Cbarp, F(7))
+    RC = F(2.0) * np.sqrt(Cbarp7 / (Cbarp7 + np.power(F(25.0), F(7))))
+    RT = -RC * np.sin(F(2.0) * dTheta * radians)
+    t1, t2, t3 = dLp / SL, dCp / SC, dHp / SH
+    return np.sqrt(t1 * t1 + t2 * t2 + t3 * t3 + RT * t2 * t3)
+
+def _hue_error(expected: np.ndarray, actual: np.ndarray) -> np.ndarray:
+    """色相列按圆周距离比较（359.9999° 与 0° 视为一致）"""
+    diff = np.abs(expected - actual)
+    return np.minimum(diff, 360.0 - diff)
+
+def _assert_close(expected, actual, tolerance: float, hue_column: int = None):
+    error = np.abs(np.asarray(expected, dtype=np.float64) - actual)
+    if hue_column is not None:
+        error[..., hue_column] = _hue_error(expected[..., hue_column], actual[..., hue_column])
+    assert float(error.max()) <= tolerance
+
+def _swift(fn: Callable, rows: np.ndarray) -> np.ndarray:
+    return np.array([fn(row) for row in rows], dtype=np.float64)
+
+@pytest.fixture(scope='module')
+def samples():
+    """边界颜色 + 随机 sRGB；Lab 样本覆盖色域外的值（labToRgb 需要裁剪）"""
+    count = 2000
+    rng = np.random.default_rng(42)
+    rgb = np.vstack([np.array(EDGE_RGB, dtype=np.float64),
+                     rng.integers(0, 256, size=(count, 3)) / 255.0])
+    lab = rgb_to_lab(rgb)
+    lab_samples = np.column_stack([rng.uniform(0, 100, count), rng.uniform(-128, 128, count),
+                                   rng.uniform(-128, 128, count)])
+    pairs = np.stack([lab, np.roll(lab, 1, axis=0) + rng.normal(0, 3, lab.shape)], axis=1)
+    return {'rgb': rgb, 'lab': lab, 'lab_samples': lab_samples, 'pairs': pairs,
+            'hsl': rgb_to_hsl(rgb), 'hsv': rgb_to_hsv(rgb)}
+
+def test_rgb_to_lab(samples):
+    _assert_close(_swift(_swift_rgb_to_lab, samples['rgb']), samples['lab'], 2e-3)
+
+def test_lab_to_rgb(samples):
+    lab = samples['lab_samples']
+    _assert_close(_swift(_swift_lab_to_rgb, lab), lab_to_rgb(lab), 1e-5)
+
+def test_rgb_to_hsl(samples):
+    _assert_close(_swift(_swift_rgb_to_hsl, samples['rgb']), samples['hsl'], 1e-4, hue_column=0)
+
+def test_hsl_to_rgb(samples):
+    _assert_close(_swift(_swift_hsl_to_rgb, samples['hsl']), hsl_to_rgb(samples['hsl']), 1e-5)
+
+def test_rgb_to_hsv(samples):
+    _assert_close(_swift(_swift_rgb_to_hsv, samples['rgb']), samples['hsv'], 1e-4, hue_column=0)
+
+def test_hsv_to_rgb(samples):
+    _assert_close(_swift(_swift_hsv_to_rgb, samples['hsv']), hsv_to_rgb(samples['hsv']), 1e-5)
+
+def test_rgb_to_cmyk(samples):
+    _assert_close(_swift(_swift_rgb_to_cmyk, samples['rgb']), rgb_to_cmyk(samples['rgb']), 1e-5)
+
+def test_delta_e_matches_swift(samples):
+    pairs = samples['pairs']
+    expected = np.array([_swift_delta_e(a, b) for a, b in pairs], dtype=np.float64)
+    _assert_close(expected, ciede2000(pairs[:, 0], pairs[:, 1]), 1e-3)
+
+def test_round_trips(samples):
+    rgb, lab, hsl, hsv = samples['rgb'], samples['lab'], samples['hsl'], samples['hsv']
+    _assert_close(rgb, lab_to_rgb(lab), 1e-5)
+    _assert_close(lab, lch_to_lab(lab_to_lch(lab)), 1e-9)
+    _assert_close(rgb, hsl_to_rgb(hsl), 1e-9)
+    _assert_close(rgb, hsv_to_rgb(hsv), 1e-9)
+    _assert_close(rgb, cmyk_to_rgb(rgb_to_cmyk(rgb)), 1e-9)
+
+@pytest.mark.parametrize('lab1, lab2, expected', SHARMA_PAIRS)
+def test_ciede2000_sharma(lab1, lab2, expected):
+    assert round(float(ciede2000(np.array([lab1]), np.array([lab2]))[0]), 4) == expected
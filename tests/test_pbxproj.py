@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""pbxproj：解析后原样序列化，与 Xcode 写出的文件逐字节一致；重复运行不产生新对象、不写文件"""
+
+import glob
+import os
+
+import pytest
+
+from conftest import ROOT
+
+from add_infoplist_strings import add_infoplist_strings_to_xcode
+from pbxproj import XcodeProject
+
+# 由 Xcode 写出的工程文件（.backup_qwen 被旧的正则脚本改过格式，只做语义往返检查）
+CANONICAL = ['project.pbxproj', 'project.pbxproj.backup', 'project.pbxproj.backup2',
+             'project.pbxproj.backup3', 'project.pbxproj.bak']
+
+def _read(name):
+    with open(os.path.join(ROOT, 'Project_Color.xcodeproj', name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+@pytest.mark.parametrize('name', CANONICAL)
+def test_round_trip_is_byte_exact(name):
+    text = _read(name)
+    assert XcodeProject.parse(text).serialize() == text
+
+@pytest.mark.parametrize('path', sorted(glob.glob(os.path.join(ROOT, 'Project_Color.xcodeproj',
+                                                               'project.pbxproj*'))))
+def test_round_trip_preserves_objects(path):
+    project = XcodeProject.load(path)
+    again = XcodeProject.parse(project.serialize())
+    assert again.data == project.data
+    assert again.serialize() == project.serialize()
+
+def test_quoted_values_survive_round_trip(project_copy):
+    project = XcodeProject.load(project_copy)
+    group = project.add_group(project.main_group, path='Odd Dir', name='Odd "Name"')
+    project.add_file(group, 'a-b+c.swift')
+    project.add_file(group, 'tab\there.md')
+    again = XcodeProject.parse(project.serialize())
+    assert again.data == project.data
+    assert again.objects[group]['name'] == 'Odd "Name"'
+
+def test_unchanged_project_is_not_written(project_copy):
+    before = os.stat(project_copy).st_mtime_ns
+    assert XcodeProject.load(project_copy).save() is False
+    assert os.stat(project_copy).st_mtime_ns == before
+
+def test_uuids_are_stable_across_runs(project_copy):
+    first = XcodeProject.load(project_copy)
+    group = first.add_group(first.main_group, path='Generated')
+    file_ref = first.add_file(group, 'Model.swift')
+    assert first.save() is True
+
+    second = XcodeProject.load(project_copy)
+    assert second.add_group(second.main_group, path='Generated') == group
+    assert second.add_file(group, 'Model.swift') == file_ref
+    assert second.save() is False
+
+def test_add_infoplist_strings_is_idempotent(project_copy, capsys):
+    assert add_infoplist_strings_to_xcode(project_copy)
+    with open(project_copy, 'r', encoding='utf-8') as f:
+        once = f.read()
+    assert add_infoplist_strings_to_xcode(project_copy)
+    assert '没有变化，未写入' in capsys.readouterr().out
+    with open(project_copy, 'r', encoding='utf-8') as f:
+        assert f.read() == once
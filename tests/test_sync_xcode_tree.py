@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""sync_xcode_tree：同步文件夹与工程文件不展开，重复运行不再新增条目"""
+
+import os
+
+from pbxproj import XcodeProject
+from sync_xcode_tree import sync_tree
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('// test\n')
+
+def test_sync_root_skips_synchronized_folders(project_copy, tmp_path, monkeypatch):
+    _touch(tmp_path / 'Project_Color' / 'Views' / 'New.swift')
+    _touch(tmp_path / 'Generated' / 'Models' / 'Model.swift')
+    _touch(tmp_path / 'Generated' / 'README.md')
+    monkeypatch.chdir(tmp_path)
+
+    project = XcodeProject.load(project_copy)
+    result = sync_tree(project, '.')
+
+    assert result.synchronized is None
+    assert 'Generated/Models/Model.swift' in result.files
+    assert 'Generated/README.md' in result.files
+    assert result.build_files == 1
+    assert not [path for path in result.files + result.groups
+                if path.startswith(('.', 'Project_Color'))]
+
+    project.save()
+    again = sync_tree(XcodeProject.load(project_copy), '.')
+    assert again.groups == [] and again.files == [] and again.build_files == 0
+
+def test_sync_inside_synchronized_folder_is_noop(project_copy, tmp_path, monkeypatch):
+    _touch(tmp_path / 'Project_Color' / 'Views' / 'New.swift')
+    monkeypatch.chdir(tmp_path)
+
+    project = XcodeProject.load(project_copy)
+    result = sync_tree(project, 'Project_Color/Views')
+    assert result.synchronized == 'Project_Color'
+    assert result.files == []